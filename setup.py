@@ -36,6 +36,15 @@ setup(
         ],
         docs=[
             'jupyter_sphinx',
+        ],
+        sparse=[
+            'scipy',
+        ],
+        parquet=[
+            'pyarrow',
+        ],
+        zarr=[
+            'zarr',
         ]
     ),
 
@@ -0,0 +1,269 @@
+"""Definition of the :class:`DurationIndex` class.
+
+Define the :class:`DurationIndex` class, a sorted interval index over the
+columns of an events :obj:`DataFrame` that represent a duration.
+
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import typing
+
+
+class DurationIndex:
+    """Sorted interval index over the duration of the events.
+
+    This index is built once from the two columns of the events
+    :obj:`DataFrame` given by :attr:`duration_mapping` and answers stabbing and
+    range queries (e.g. which events cover some frame) with binary searches
+    instead of walking the :obj:`DataFrame` row by row.
+
+    All arrays are aligned with the rows of the events :obj:`DataFrame`, so the
+    results of the queries are row positions that can be passed to
+    :meth:`pd.DataFrame.iloc`.
+
+    Attributes:
+        :attr:`starts`: Start value of each event, in row order.
+
+        :attr:`ends`: End value of each event, in row order.
+
+        :attr:`order`: Row positions of the events sorted by their start.
+
+        :attr:`sorted_starts`: :attr:`starts` sorted.
+
+        :attr:`sorted_ends`: :attr:`ends` following :attr:`order`.
+
+        :attr:`max_ends`: Running maximum of :attr:`sorted_ends`, used to
+        discard in a single binary search every event that ends too early.
+
+    """
+
+    def __init__(
+        self,
+        starts: typing.Union[np.ndarray, typing.Sequence[typing.Any]],
+        ends: typing.Union[np.ndarray, typing.Sequence[typing.Any]],
+        source: typing.Optional[pd.DataFrame] = None,
+        columns: typing.Optional[
+            typing.Tuple[typing.Hashable, typing.Hashable]
+        ] = None
+    ) -> None:
+        """Init for :class:`DurationIndex` given the endpoints of the events."""
+        self.starts = np.asarray(starts)
+        self.ends = np.asarray(ends)
+
+        # Keep track of what the index was built from so that the accessor can
+        # tell whether it's still valid.
+        self.source = source
+        self.columns = columns
+
+        self.order = np.argsort(self.starts, kind='stable')
+        self.sorted_starts = self.starts[self.order]
+        self.sorted_ends = self.ends[self.order]
+
+        self.max_ends = (
+            np.maximum.accumulate(self.sorted_ends)
+            if len(self) else self.sorted_ends
+        )
+
+        # The ends sorted on their own are needed to count events.
+        self._ends_ascending = np.sort(self.ends, kind='stable')
+
+    @classmethod
+    def from_df(
+        cls, df: pd.DataFrame, start: typing.Hashable, end: typing.Hashable
+    ) -> DurationIndex:
+        """Build the index from the duration columns of a :obj:`DataFrame`."""
+        return cls(
+            df[start].to_numpy(), df[end].to_numpy(), df, (start, end)
+        )
+
+    def insert(
+        self,
+        positions: typing.Union[np.ndarray, typing.Sequence[int]],
+        starts: typing.Union[np.ndarray, typing.Sequence[typing.Any]],
+        ends: typing.Union[np.ndarray, typing.Sequence[typing.Any]],
+        source: typing.Optional[pd.DataFrame] = None
+    ) -> DurationIndex:
+        """Get the index of the events after inserting some new ones.
+
+        The new events are merged into the sorted arrays with binary searches
+        instead of sorting all events again, and only the stretch of
+        :attr:`max_ends` after the first insertion is accumulated again.
+
+        Every new event must come after the indexed events that start at the
+        same value, so that :attr:`order` stays the one a stable sort would
+        give.
+
+        Args:
+            :attr:`positions`: Sorted row positions before which the new events
+                are inserted, as in :meth:`np.insert`.
+            :attr:`starts`: Start value of each new event.
+            :attr:`ends`: End value of each new event.
+            :attr:`source`: The :obj:`DataFrame` with all events.
+
+        Returns:
+            A new :class:`DurationIndex`, equal to the one that would be built
+            from scratch.
+
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        starts = np.asarray(starts)
+        starts = starts.astype(
+            np.result_type(self.starts, starts), copy=False
+        )
+        ends = np.asarray(ends)
+        ends = ends.astype(np.result_type(self.ends, ends), copy=False)
+
+        # Rows where the new and the already indexed events end up.
+        rows = positions + np.arange(len(positions))
+        old_rows = np.arange(len(self)) + np.searchsorted(
+            positions, np.arange(len(self)), side='right'
+        )
+
+        index = DurationIndex.__new__(DurationIndex)
+        index.source = source
+        index.columns = self.columns
+
+        index.starts = np.insert(
+            self.starts.astype(starts.dtype), positions, starts
+        )
+        index.ends = np.insert(self.ends.astype(ends.dtype), positions, ends)
+
+        by_start = np.argsort(starts, kind='stable')
+        ranks = np.searchsorted(
+            self.sorted_starts, starts[by_start], side='right'
+        )
+
+        index.order = np.insert(old_rows[self.order], ranks, rows[by_start])
+        index.sorted_starts = index.starts[index.order]
+        index.sorted_ends = index.ends[index.order]
+
+        first = int(ranks[0]) if len(ranks) else len(self)
+        index.max_ends = index.sorted_ends.copy()
+
+        if first:
+            index.max_ends[:first] = self.max_ends[:first]
+            index.max_ends[first] = max(
+                index.max_ends[first], index.max_ends[first - 1]
+            )
+
+        if first < len(index.max_ends):
+            np.maximum.accumulate(
+                index.max_ends[first:], out=index.max_ends[first:]
+            )
+
+        sorted_ends = np.sort(ends, kind='stable')
+        index._ends_ascending = np.insert(
+            self._ends_ascending.astype(ends.dtype),
+            np.searchsorted(self._ends_ascending, sorted_ends, side='right'),
+            sorted_ends
+        )
+
+        return index
+
+    def __len__(self) -> int:
+        """Get the number of indexed events."""
+        return len(self.starts)
+
+    def is_built_from(
+        self, df: pd.DataFrame, start: typing.Hashable, end: typing.Hashable
+    ) -> bool:
+        """Decide whether the index was built from these exact columns."""
+        return self.source is df and self.columns == (start, end)
+
+    def stab(self, value: typing.Any) -> np.ndarray:
+        """Get the row positions of the events that cover :attr:`value`."""
+        # Only the events starting at or before value may cover it...
+        stop = np.searchsorted(self.sorted_starts, value, side='right')
+
+        # ...and none of those before the running maximum of the ends reaches
+        # value does.
+        begin = np.searchsorted(self.max_ends[:stop], value, side='left')
+
+        candidates = self.order[begin:stop]
+
+        return np.sort(candidates[self.ends[candidates] >= value])
+
+    def overlapping(self, low: typing.Any, high: typing.Any) -> np.ndarray:
+        """Get the row positions of the events intersecting [low, high]."""
+        stop = np.searchsorted(self.sorted_starts, high, side='right')
+        begin = np.searchsorted(self.max_ends[:stop], low, side='left')
+
+        candidates = self.order[begin:stop]
+
+        return np.sort(candidates[self.ends[candidates] >= low])
+
+    def count(self, values: typing.Any) -> np.ndarray:
+        """Count how many events cover each one of :attr:`values`."""
+        started = np.searchsorted(self.sorted_starts, values, side='right')
+        finished = np.searchsorted(self._ends_ascending, values, side='left')
+
+        return started - finished
+
+    def contains_overlaps(self) -> bool:
+        """Decide whether any two events overlap.
+
+        Two events overlap when the start of one of them minus the end of the
+        other one is less than 1. Whenever two events overlap, two events that
+        are consecutive in :attr:`order` do as well, so comparing those is
+        enough.
+
+        """
+        return bool(np.any(self.sorted_starts[1:] - self.sorted_ends[:-1] < 1))
+
+    def overlapping_pairs(self) -> np.ndarray:
+        """Get the row positions of every pair of overlapping events.
+
+        For each event, the events starting after it (in :attr:`order`) that
+        overlap it are exactly those starting before its end plus 1, so they
+        form a contiguous run of :attr:`sorted_starts` found with a single
+        binary search. The runs are then expanded into pairs without any
+        Python-level loop.
+
+        Returns:
+            An array of shape (number of pairs, 2) where each row holds the
+            positions of two overlapping events, the smallest one first. The
+            rows are sorted.
+
+        """
+        ranks = np.arange(len(self))
+
+        stops = np.searchsorted(
+            self.sorted_starts, self.sorted_ends + 1, side='left'
+        )
+        counts = np.maximum(stops - ranks - 1, 0)
+
+        # Each event is paired with the counts[i] events that follow it.
+        firsts = np.repeat(ranks, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        seconds = firsts + 1 + offsets
+
+        pairs = np.sort(
+            np.column_stack((self.order[firsts], self.order[seconds])), axis=1
+        )
+
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    def overlap_groups(self) -> np.ndarray:
+        """Label the groups of events that overlap with each other.
+
+        Walking the events in :attr:`order`, a new group starts whenever an
+        event doesn't overlap any of the previous ones, i.e. when its start
+        minus the running maximum of the previous ends is at least 1.
+
+        Returns:
+            An array aligned with the rows of the events :obj:`DataFrame` with
+            the label of the group that each event belongs to. Labels are
+            consecutive integers following :attr:`order`.
+
+        """
+        new_group = np.ones(len(self), dtype=bool)
+        new_group[1:] = self.sorted_starts[1:] - self.max_ends[:-1] >= 1
+
+        labels = np.empty(len(self), dtype=np.intp)
+        labels[self.order] = np.cumsum(new_group) - 1
+
+        return labels
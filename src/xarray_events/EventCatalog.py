@@ -0,0 +1,327 @@
+"""Definition of the :class:`EventCatalog` class.
+
+Define the :class:`EventCatalog` class, which keeps events on disk as one
+memory-mapped array per column, so that the events to load can be found
+without reading the whole catalog into memory.
+
+"""
+from __future__ import annotations
+import json
+import operator
+import os
+import pathlib
+
+import numpy as np
+import pandas as pd
+import typing
+
+# The file describing the columns of a catalog, in its directory.
+MANIFEST = 'catalog.json'
+
+_COMPARISONS = {
+    '==': operator.eq,
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+    'in': lambda col, values: np.isin(col, list(values)),
+    'not in': lambda col, values: ~np.isin(col, list(values))
+}
+
+
+class EventCatalog:
+    """Events on disk, as one memory-mapped array per column.
+
+    A catalog is a directory with a ``.npy`` file per column and a manifest
+    describing them. Strings are kept as categorical codes along with their
+    categories, so every column is a plain array that can be memory-mapped.
+
+    Reading events through :meth:`select` and :meth:`read` only touches the
+    pages of the arrays that hold them, so many processes can share the same
+    catalog through the page cache of the operating system, no matter how big
+    it is. If the events were sorted by a column when written, the conditions
+    on that column are answered by binary search instead of by scanning it.
+
+    Attributes:
+        :attr:`path`: The directory of the catalog.
+
+        :attr:`columns`: The columns of the events, in order.
+
+        :attr:`sorted_by`: The column the events are sorted by, if any.
+
+    """
+
+    def __init__(self, path: typing.Union[str, os.PathLike]) -> None:
+        """Init for :class:`EventCatalog` given the path to its directory."""
+        self.path = pathlib.Path(path)
+
+        with open(self.path / MANIFEST) as manifest:
+            self._manifest = json.load(manifest)
+
+        self.columns = [column['name'] for column in self._manifest['columns']]
+        self.sorted_by = self._manifest['sorted_by']
+
+        self._files = {
+            column['name']: column for column in self._manifest['columns']
+        }
+        self._arrays: typing.Dict[str, np.ndarray] = dict()
+
+    def __len__(self) -> int:
+        """Get the number of events in the catalog."""
+        return int(self._manifest['length'])
+
+    def __repr__(self) -> str:
+        """Represent the catalog."""
+        return (
+            f"{type(self).__name__} of {len(self)} events at "
+            f"{str(self.path)!r}"
+        )
+
+    @staticmethod
+    def is_catalog(path: typing.Union[str, os.PathLike]) -> bool:
+        """Decide whether a path is the directory of a catalog."""
+        return (pathlib.Path(path) / MANIFEST).is_file()
+
+    @classmethod
+    def write(
+        cls,
+        df: pd.DataFrame,
+        path: typing.Union[str, os.PathLike],
+        sort_by: typing.Optional[typing.Hashable] = None
+    ) -> EventCatalog:
+        """Write the events of a :obj:`DataFrame` as a catalog.
+
+        Args:
+            :attr:`df`: The events. Columns of strings become categorical.
+            :attr:`path`: The directory to write the catalog to, created if
+                it doesn't exist.
+            :attr:`sort_by`: A column to sort the events by before writing
+                them (e.g. the start of their duration), to find them by
+                binary search on it.
+
+        Returns:
+            The catalog written.
+
+        Raises:
+            TypeError: when a column holds values that are neither numbers,
+                dates nor strings.
+
+        """
+        path = pathlib.Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        if sort_by is not None:
+            df = df.sort_values(sort_by, kind='mergesort')
+
+        def save(name: str, values: pd.Series) -> typing.Dict:
+            file = f'{name}.npy'
+            entry: typing.Dict[str, typing.Optional[str]] = {
+                'file': file, 'categories': None
+            }
+
+            if values.dtype.kind == 'O':
+                values = values.astype('category')
+
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                categories = values.cat.categories
+
+                categories = np.asarray(
+                    categories,
+                    dtype=(
+                        str if pd.api.types.infer_dtype(categories) == 'string'
+                        else None
+                    )
+                )
+
+                if categories.dtype.kind == 'O':
+                    raise TypeError(
+                        f"Can't write {values.name!r} to a catalog. Its "
+                        f"values must be numbers, dates or strings."
+                    )
+
+                categories_file = f'{name}.categories.npy'
+                entry['categories'] = categories_file
+                np.save(path / categories_file, categories)
+
+                values = values.cat.codes
+
+            np.save(path / file, values.to_numpy())
+
+            return entry
+
+        index = pd.Series(df.index, name=df.index.name)
+
+        manifest = {
+            'length': len(df),
+            'sorted_by': sort_by,
+            'index': {'name': df.index.name, **save('index', index)},
+            'columns': [
+                {'name': column, **save(f'column_{i}', df[column])}
+                for i, column in enumerate(df.columns)
+            ]
+        }
+
+        with open(path / MANIFEST, 'w') as file:
+            json.dump(manifest, file)
+
+        return cls(path)
+
+    def _array(self, file: str) -> np.ndarray:
+        """Get an array of the catalog, memory-mapping it the first time."""
+        if file not in self._arrays:
+            self._arrays[file] = np.load(
+                self.path / file, mmap_mode='r', allow_pickle=False
+            )
+
+        return self._arrays[file]
+
+    def _column(
+        self, column: typing.Hashable
+    ) -> typing.Tuple[np.ndarray, typing.Optional[np.ndarray]]:
+        """Get the values (or codes) of a column and its categories, if any."""
+        entry = self._files[column]
+
+        categories = None
+
+        if entry['categories'] is not None:
+            categories = self._array(entry['categories'])
+
+        return self._array(entry['file']), categories
+
+    def _condition(
+        self,
+        column: typing.Hashable,
+        op: str,
+        value: typing.Any,
+        low: int,
+        high: int
+    ) -> np.ndarray:
+        """Evaluate a condition over the events in [low, high)."""
+        values, categories = self._column(column)
+        values = values[low:high]
+
+        if categories is not None:
+            # Evaluate the condition once per category, with one more that's
+            # always false for missing values, whose code is -1.
+            return np.append(_COMPARISONS[op](categories, value), False)[
+                values
+            ]
+
+        if values.dtype.kind in 'mM' and op not in ('in', 'not in'):
+            value = np.asarray(value, dtype=values.dtype)
+
+        return _COMPARISONS[op](values, value)
+
+    def _narrow(
+        self, op: str, value: typing.Any, low: int, high: int
+    ) -> typing.Tuple[int, int]:
+        """Narrow [low, high) down to the events meeting a condition."""
+        values, _ = self._column(self.sorted_by)
+
+        if values.dtype.kind in 'mM':
+            value = np.asarray(value, dtype=values.dtype)
+
+        side: typing.Literal['left', 'right']
+
+        if op in ('<', '<=', '==', '='):
+            side = 'left' if op == '<' else 'right'
+            high = min(high, int(np.searchsorted(values, value, side=side)))
+
+        if op in ('>', '>=', '==', '='):
+            side = 'right' if op == '>' else 'left'
+            low = max(low, int(np.searchsorted(values, value, side=side)))
+
+        return low, max(low, high)
+
+    def select(
+        self, filters: typing.Optional[typing.List[typing.Any]] = None
+    ) -> np.ndarray:
+        """Find the events meeting some conditions.
+
+        Args:
+            :attr:`filters`: The conditions, in the disjunctive normal form of
+                :func:`pyarrow.parquet.read_table` (e.g. ``[('match_id', '==',
+                12)]``). By default, all events meet them.
+
+        Returns:
+            The positions of the events meeting the conditions, in order.
+
+        """
+        if not filters:
+            return np.arange(len(self))
+
+        # A flat list of conditions is a single conjunction.
+        if all(isinstance(condition, tuple) for condition in filters):
+            filters = [filters]
+
+        positions = list()
+
+        for conjunction in filters:
+            low, high = 0, len(self)
+            conditions = list()
+
+            for column, op, value in conjunction:
+                if (
+                    column == self.sorted_by and
+                    self._files[column]['categories'] is None and
+                    op in ('==', '=', '<', '<=', '>', '>=')
+                ):
+                    low, high = self._narrow(op, value, low, high)
+                else:
+                    conditions.append((column, op, value))
+
+            mask = np.ones(high - low, dtype=bool)
+
+            for column, op, value in conditions:
+                mask &= self._condition(column, op, value, low, high)
+
+            positions.append(low + np.flatnonzero(mask))
+
+        if len(positions) == 1:
+            return positions[0]
+
+        return np.unique(np.concatenate(positions))
+
+    def read(
+        self,
+        positions: typing.Optional[np.ndarray] = None,
+        columns: typing.Optional[typing.Iterable[typing.Hashable]] = None
+    ) -> pd.DataFrame:
+        """Read some events into a :obj:`DataFrame`.
+
+        Args:
+            :attr:`positions`: The positions of the events, e.g. as returned
+                by :meth:`select`. By default, all of them.
+            :attr:`columns`: The columns to read. By default, all of them.
+
+        Returns:
+            The events, with the columns (but not the labels) that were
+            written as strings being categorical.
+
+        """
+        if positions is None:
+            positions = np.arange(len(self))
+
+        def read_column(entry: typing.Mapping) -> typing.Any:
+            values = self._array(entry['file'])[positions]
+
+            if entry['categories'] is None:
+                return values
+
+            return pd.Categorical.from_codes(
+                values,
+                categories=self._array(entry['categories'])
+            )
+
+        index = self._manifest['index']
+
+        return pd.DataFrame(
+            {
+                column: read_column(self._files[column])
+                for column in (self.columns if columns is None else columns)
+            },
+            # Labels written as strings are read back as such.
+            index=pd.Index(np.asarray(read_column(index)), name=index['name'])
+        )
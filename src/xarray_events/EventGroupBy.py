@@ -0,0 +1,617 @@
+"""Definition of the :class:`EventGroupBy` class.
+
+Define the :class:`EventGroupBy` class, which reduces a :obj:`DataArray` over
+the duration of every event at once.
+
+"""
+from __future__ import annotations
+import collections.abc as collections
+import concurrent.futures
+
+import numpy as np
+import pandas as pd
+import typing
+import xarray as xr
+
+from xarray_events.PrefixSums import PrefixSums
+
+
+def _segment_reduce(
+    ufunc: np.ufunc, values: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> np.ndarray:
+    """Apply :attr:`ufunc` on the segment [start, end] of every event.
+
+    The segments are given to :meth:`reduceat` interleaved with the stretches
+    between them, whose results are discarded. Since :meth:`reduceat` can't
+    be given the position past the last one, the segments of the events that
+    end at the last position stop right before it and it's reduced into their
+    results afterwards.
+
+    """
+    if not len(starts):
+        return np.empty((0,) + values.shape[1:], dtype=values.dtype)
+
+    last = len(values) - 1
+
+    indices = np.empty(2 * len(starts), dtype=np.intp)
+    indices[0::2] = starts
+    indices[1::2] = np.maximum(ends + 1, starts)
+
+    result = ufunc.reduceat(
+        values, np.minimum(indices, last), axis=0
+    )[0::2]
+
+    tail = (indices[1::2] > last) & (indices[0::2] < last)
+    result[tail] = ufunc(result[tail], values[last])
+
+    return result
+
+
+def _skipping_nan(values: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """Get the values with NaN replaced by 0 along with the valid mask."""
+    if values.dtype.kind not in 'fc':
+        return values, np.ones(values.shape, dtype=bool)
+
+    valid = ~np.isnan(values)
+
+    return np.where(valid, values, 0), valid
+
+
+def _partial_reduce(
+    values: np.ndarray, starts: np.ndarray, ends: np.ndarray, how: str
+) -> typing.Tuple[np.ndarray, ...]:
+    """Reduce the pieces of some events that fall within a chunk.
+
+    The results are partial: those of the pieces of an event in different
+    chunks are put together by :func:`_combine_partials`. Means and variances
+    need the count, the sum and the sum of squared deviations from the mean of
+    each piece.
+
+    """
+    if how in ('min', 'max'):
+        ufunc = np.fmin if how == 'min' else np.fmax
+        return (_segment_reduce(ufunc, values, starts, ends),)
+
+    skipped, valid = _skipping_nan(values)
+
+    if how == 'sum':
+        return (_segment_reduce(np.add, skipped, starts, ends),)
+
+    if how == 'count':
+        return (
+            _segment_reduce(np.add, valid.astype(np.intp), starts, ends),
+        )
+
+    values = values.astype(float)
+
+    with np.errstate(invalid='ignore'):
+        shift = np.nanmean(values, axis=0)
+
+    shifted, valid = _skipping_nan(values - shift)
+
+    count = _segment_reduce(np.add, valid.astype(float), starts, ends)
+    total = _segment_reduce(np.add, shifted, starts, ends)
+    total_squares = _segment_reduce(np.add, shifted ** 2, starts, ends)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        deviations = np.where(
+            count > 0, np.maximum(total_squares - total ** 2 / count, 0), 0
+        )
+
+    return count, np.where(count > 0, total + count * shift, 0), deviations
+
+
+def _combine_partials(
+    how: str,
+    shape: typing.Tuple[int, ...],
+    dtype: np.dtype,
+    owners: typing.List[np.ndarray],
+    partials: typing.List[typing.Tuple[np.ndarray, ...]],
+    ddof: int = 0
+) -> np.ndarray:
+    """Put together the partial reductions of every chunk.
+
+    Each event appears at most once in :attr:`owners` of a chunk, so the
+    partial results can be accumulated with plain fancy indexing. Variances are
+    combined with the pairwise formula of Chan et al.
+
+    """
+    if how in ('count', 'sum'):
+        result = np.zeros(shape, dtype=dtype)
+
+        for events, (partial,) in zip(owners, partials):
+            result[events] += partial
+
+        return result
+
+    if how in ('min', 'max'):
+        ufunc = np.fmin if how == 'min' else np.fmax
+
+        result = np.full(shape, np.nan if dtype.kind in 'fc' else 0, dtype)
+        seen = np.zeros(shape[0], dtype=bool)
+
+        for events, (partial,) in zip(owners, partials):
+            before = seen[events].reshape((-1,) + (1,) * (partial.ndim - 1))
+            result[events] = np.where(
+                before, ufunc(result[events], partial), partial
+            )
+            seen[events] = True
+
+        return result
+
+    count = np.zeros(shape)
+    total = np.zeros(shape)
+    deviations = np.zeros(shape)
+
+    for events, (partial_count, partial_total, partial_deviations) in zip(
+        owners, partials
+    ):
+        previous_count = count[events]
+        previous_total = total[events]
+        merged_count = previous_count + partial_count
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = (
+                partial_total / partial_count - previous_total / previous_count
+            )
+            correction = np.where(
+                previous_count * partial_count > 0,
+                delta ** 2 * previous_count * partial_count / merged_count,
+                0
+            )
+
+        deviations[events] += partial_deviations + correction
+        total[events] = previous_total + partial_total
+        count[events] = merged_count
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if how == 'mean':
+            return total / count
+
+        return np.where(
+            count - ddof > 0, deviations / (count - ddof), np.nan
+        )
+
+
+class EventGroupBy:
+    """Grouping of a :obj:`DataArray` by the duration of the events.
+
+    Unlike the :obj:`DataArrayGroupBy` returned by
+    :meth:`EventsAccessor.groupby_events`, which reduces each group separately,
+    this object computes a reduction for all events at once with segmented
+    reductions (:meth:`np.ufunc.reduceat`) over the positions that each event
+    spans. Overlapping events are handled naturally since every event is its own
+    segment.
+
+    Missing values (NaN) are skipped, just like xarray does by default.
+
+    If :attr:`array` is backed by dask, the reductions (other than
+    :meth:`reduce`) are lazy: every chunk is reduced on its own for the pieces
+    of the events that fall within it, so the whole array is never loaded into
+    memory at once.
+
+    Attributes:
+        :attr:`array`: The :obj:`DataArray` to be reduced.
+
+        :attr:`dim`: The dimension of :attr:`array` that the events span.
+
+        :attr:`starts`: Position along :attr:`dim` where each event starts.
+
+        :attr:`ends`: Position along :attr:`dim` where each event ends, which
+        is included in the event.
+
+        :attr:`events`: The labels of the events, whose name is the name of the
+        dimension of the results.
+
+        :attr:`prefix_sums`: Optional cumulative sums of :attr:`array` along
+        :attr:`dim`. When given, counts, sums, means and variances are looked
+        up from them instead of being reduced.
+
+        :attr:`n_threads`: Number of threads that the reductions of an
+        in-memory :attr:`array` are split across. The events are sorted by
+        their start and split into as many batches, each of which is reduced
+        over the stretch of positions that it spans. NumPy releases the GIL
+        while reducing, so the batches run in parallel.
+
+    """
+
+    def __init__(
+        self,
+        array: xr.DataArray,
+        dim: typing.Hashable,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        events: pd.Index,
+        prefix_sums: typing.Optional[PrefixSums] = None,
+        n_threads: int = 1
+    ) -> None:
+        """Init for :class:`EventGroupBy` given the positions of the events."""
+        self.array = array
+        self.dim = dim
+        self.starts = np.asarray(starts, dtype=np.intp)
+        self.ends = np.asarray(ends, dtype=np.intp)
+        self.events = events
+        self.prefix_sums = prefix_sums
+        self.n_threads = n_threads
+
+        # Events that end before they start span nothing at all.
+        self._is_empty = self.ends < self.starts
+
+        self._batches: typing.Optional[
+            typing.List[typing.Tuple[np.ndarray, int, int]]
+        ] = None
+
+    def __len__(self) -> int:
+        """Get the number of events."""
+        return len(self.starts)
+
+    def __repr__(self) -> str:
+        """Represent the grouping."""
+        return (
+            f"{type(self).__name__}, grouped over {len(self)} events "
+            f"along {self.dim!r}."
+        )
+
+    @property
+    def _event_dim(self) -> typing.Hashable:
+        return self.events.name or 'event_index'
+
+    def _values(self) -> np.ndarray:
+        """Get the values of :attr:`array` with :attr:`dim` as first axis."""
+        return np.moveaxis(
+            np.asarray(self.array.values), self.array.get_axis_num(self.dim), 0
+        )
+
+    def _get_batches(self) -> typing.List[typing.Tuple[np.ndarray, int, int]]:
+        """Split the events into :attr:`n_threads` batches by their start.
+
+        Returns:
+            A list with, for each batch, its events along with the first and
+            the last positions of the stretch that they span.
+
+        """
+        if self._batches is None:
+            order = np.argsort(self.starts, kind='stable')
+
+            self._batches = [
+                (
+                    events,
+                    int(self.starts[events].min()),
+                    int(max(self.starts[events].max(), self.ends[events].max()))
+                )
+                for events in np.array_split(order, self.n_threads)
+                if len(events)
+            ]
+
+        return self._batches
+
+    def _in_batches(
+        self, reduce_batch: collections.Callable[..., np.ndarray]
+    ) -> np.ndarray:
+        """Run :attr:`reduce_batch` over every batch on a thread pool.
+
+        Args:
+            :attr:`reduce_batch`: Function taking the events of a batch along
+                with the first and the last positions that they span, and
+                returning the results of those events.
+
+        Returns:
+            The results of all events, in their original order.
+
+        """
+        batches = self._get_batches()
+
+        with concurrent.futures.ThreadPoolExecutor(self.n_threads) as executor:
+            results = list(
+                executor.map(lambda batch: reduce_batch(*batch), batches)
+            )
+
+        result = np.empty(
+            (len(self),) + results[0].shape[1:], dtype=np.result_type(*results)
+        )
+
+        for (events, _, _), batch_result in zip(batches, results):
+            result[events] = batch_result
+
+        return result
+
+    def _is_parallel(self) -> bool:
+        return self.n_threads > 1 and len(self) > 1
+
+    def _reduceat(self, ufunc: np.ufunc, values: np.ndarray) -> np.ndarray:
+        """Apply :attr:`ufunc` on the segment of every event."""
+        if not self._is_parallel():
+            return _segment_reduce(ufunc, values, self.starts, self.ends)
+
+        return self._in_batches(
+            lambda events, low, high: _segment_reduce(
+                ufunc,
+                values[low:(high + 1)],
+                self.starts[events] - low,
+                self.ends[events] - low
+            )
+        )
+
+    def _is_lazy(self) -> bool:
+        """Decide whether :attr:`array` is backed by a dask array."""
+        return self.array.chunks is not None
+
+    def _events_by_chunk(
+        self, bounds: np.ndarray
+    ) -> typing.List[typing.Tuple[int, np.ndarray]]:
+        """Assign the events to the chunks that they span.
+
+        An event that crosses chunk boundaries is assigned to every chunk it
+        touches. Events that span nothing aren't assigned to any.
+
+        Args:
+            :attr:`bounds`: Position along :attr:`dim` where each chunk starts,
+                followed by the length of :attr:`dim`.
+
+        Returns:
+            A list with, for each chunk spanned by some event, the number of the
+            chunk and the events assigned to it.
+
+        """
+        events = np.flatnonzero(~self._is_empty)
+
+        firsts = np.searchsorted(bounds, self.starts[events], side='right') - 1
+        lasts = np.searchsorted(bounds, self.ends[events], side='right') - 1
+        spans = lasts - firsts + 1
+
+        chunks = np.repeat(firsts, spans) + (
+            np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans)
+        )
+        events = np.repeat(events, spans)
+
+        order = np.argsort(chunks, kind='stable')
+        chunks, events = chunks[order], events[order]
+
+        splits = np.flatnonzero(np.diff(chunks)) + 1
+
+        return [
+            (int(chunk[0]), chunk_events)
+            for chunk, chunk_events in zip(
+                np.split(chunks, splits), np.split(events, splits)
+            )
+            if len(chunk)
+        ]
+
+    def _lazy_reduce(self, how: str, ddof: int = 0) -> xr.DataArray:
+        """Build a reduction of a dask-backed :attr:`array` as a dask graph.
+
+        Each chunk along :attr:`dim` that some event spans is reduced on its
+        own into a partial result for the pieces of the events that fall within
+        it, and a final task puts those together. Only one chunk at a time
+        needs to be in memory, and only the chunks spanned by some event are
+        ever read.
+
+        """
+        import dask
+        import dask.array as da
+
+        data = da.moveaxis(
+            self.array.data, self.array.get_axis_num(self.dim), 0
+        )
+        bounds = np.cumsum((0,) + data.chunks[0])
+
+        owners = []
+        partials = []
+
+        for chunk, events in self._events_by_chunk(bounds):
+            low, high = bounds[chunk], bounds[chunk + 1]
+
+            owners.append(events)
+            partials.append(
+                dask.delayed(_partial_reduce, pure=True)(
+                    data[low:high],
+                    np.maximum(self.starts[events], low) - low,
+                    np.minimum(self.ends[events], high - 1) - low,
+                    how
+                )
+            )
+
+        dtype: np.dtype
+
+        if how == 'count':
+            dtype = np.dtype(np.intp)
+        elif how in ('mean', 'var'):
+            dtype = np.dtype(float)
+        elif how == 'sum' or not np.any(self._is_empty):
+            dtype = data.dtype
+        else:
+            dtype = np.result_type(data.dtype, float)
+
+        shape = (len(self),) + data.shape[1:]
+
+        result = dask.delayed(_combine_partials, pure=True)(
+            how, shape, dtype, owners, partials, ddof
+        )
+
+        return self._wrap(da.from_delayed(result, shape, dtype=dtype))
+
+    def _wrap(self, result: np.ndarray) -> xr.DataArray:
+        """Wrap the result of a reduction into a :obj:`DataArray`."""
+        dims = [self._event_dim] + [d for d in self.array.dims if d != self.dim]
+
+        coords = {
+            name: coord
+            for name, coord in self.array.coords.items()
+            if self.dim not in coord.dims
+        }
+        coords[self._event_dim] = self.events.to_numpy()
+
+        return xr.DataArray(
+            result, coords=coords, dims=dims, name=self.array.name
+        )
+
+    def _with_empty(self, result: np.ndarray, fill: typing.Any) -> np.ndarray:
+        """Set the result of the events that span nothing to :attr:`fill`."""
+        if np.any(self._is_empty):
+            if isinstance(fill, float) and result.dtype.kind not in 'fc':
+                result = result.astype(float)
+
+            result[self._is_empty] = fill
+
+        return result
+
+    def _looked_up(self, reduction: str, *args: typing.Any) -> np.ndarray:
+        """Look a reduction up from :attr:`prefix_sums`."""
+        # Events that span nothing would look up the stretch between them.
+        ends = np.maximum(self.ends, self.starts - 1)
+
+        return getattr(self.prefix_sums, reduction)(self.starts, ends, *args)
+
+    def count(self) -> xr.DataArray:
+        """Count the non-missing values spanned by each event."""
+        if self.prefix_sums is not None:
+            return self._wrap(self._looked_up('count'))
+
+        if self._is_lazy():
+            return self._lazy_reduce('count')
+
+        _, valid = _skipping_nan(self._values())
+
+        return self._wrap(
+            self._with_empty(self._reduceat(np.add, valid.astype(np.intp)), 0)
+        )
+
+    def sum(self) -> xr.DataArray:
+        """Sum the values spanned by each event."""
+        if self.prefix_sums is not None:
+            return self._wrap(self._looked_up('sum'))
+
+        if self._is_lazy():
+            return self._lazy_reduce('sum')
+
+        values, _ = _skipping_nan(self._values())
+
+        return self._wrap(self._with_empty(self._reduceat(np.add, values), 0))
+
+    def mean(self) -> xr.DataArray:
+        """Average the values spanned by each event."""
+        if self.prefix_sums is not None:
+            return self._wrap(self._looked_up('mean'))
+
+        if self._is_lazy():
+            return self._lazy_reduce('mean')
+
+        values, valid = _skipping_nan(self._values())
+
+        total = self._with_empty(self._reduceat(np.add, values), 0)
+        count = self._with_empty(
+            self._reduceat(np.add, valid.astype(np.intp)), 0
+        )
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._wrap(total / count)
+
+    def var(self, ddof: int = 0) -> xr.DataArray:
+        """Get the variance of the values spanned by each event.
+
+        The variance is obtained from the sums of the values and of their
+        squares, both shifted by the mean of the whole array to keep the
+        cancellation error small.
+
+        Args:
+            :attr:`ddof`: Delta degrees of freedom, as in :meth:`np.var`.
+
+        """
+        if self.prefix_sums is not None:
+            return self._wrap(self._looked_up('var', ddof))
+
+        if self._is_lazy():
+            return self._lazy_reduce('var', ddof)
+
+        values = self._values().astype(float)
+
+        with np.errstate(invalid='ignore'):
+            shift = (
+                np.nanmean(values, axis=0) if len(values) else 0
+            )
+
+        shifted, valid = _skipping_nan(values - shift)
+
+        total = self._with_empty(self._reduceat(np.add, shifted), 0)
+        total_squares = self._with_empty(
+            self._reduceat(np.add, shifted ** 2), 0
+        )
+        count = self._with_empty(
+            self._reduceat(np.add, valid.astype(np.intp)), 0
+        )
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = np.maximum(total_squares - total ** 2 / count, 0) / (
+                count - ddof
+            )
+
+        return self._wrap(np.where(count - ddof > 0, result, np.nan))
+
+    def std(self, ddof: int = 0) -> xr.DataArray:
+        """Get the standard deviation of the values spanned by each event.
+
+        Args:
+            :attr:`ddof`: Delta degrees of freedom, as in :meth:`np.std`.
+
+        """
+        return np.sqrt(self.var(ddof))  # type: ignore
+
+    def min(self) -> xr.DataArray:
+        """Get the minimum of the values spanned by each event."""
+        if self._is_lazy():
+            return self._lazy_reduce('min')
+
+        return self._wrap(
+            self._with_empty(self._reduceat(np.fmin, self._values()), np.nan)
+        )
+
+    def max(self) -> xr.DataArray:
+        """Get the maximum of the values spanned by each event."""
+        if self._is_lazy():
+            return self._lazy_reduce('max')
+
+        return self._wrap(
+            self._with_empty(self._reduceat(np.fmax, self._values()), np.nan)
+        )
+
+    def reduce(
+        self,
+        func: collections.Callable[..., np.ndarray],
+        **kwargs: typing.Any
+    ) -> xr.DataArray:
+        """Reduce the values spanned by each event with an arbitrary function.
+
+        This is the fallback for reductions that can't be segmented, so it
+        calls :attr:`func` once per event. If :attr:`array` is backed by dask,
+        its values are loaded into memory. The batches given by
+        :attr:`n_threads` only run in parallel if :attr:`func` releases the
+        GIL, as most NumPy functions do.
+
+        Args:
+            :attr:`func`: Function taking an array and an ``axis`` keyword
+                argument, like :meth:`np.median`.
+
+            :attr:`kwargs`: Additional keyword arguments for :attr:`func`.
+
+        """
+        values = self._values()
+
+        def reduce_events(events: np.ndarray) -> np.ndarray:
+            starts, ends = self.starts[events], self.ends[events]
+
+            return np.stack(
+                [
+                    func(values[start:(end + 1)], axis=0, **kwargs)
+                    for start, end in zip(starts, ends)
+                ]
+            )
+
+        if not len(self):
+            return self._wrap(np.empty((0,) + values.shape[1:]))
+
+        if not self._is_parallel():
+            return self._wrap(reduce_events(np.arange(len(self))))
+
+        return self._wrap(
+            self._in_batches(lambda events, low, high: reduce_events(events))
+        )
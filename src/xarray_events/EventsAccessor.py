@@ -6,8 +6,10 @@ wrapper around xarray extending its functionality to better support events data.
 """
 from __future__ import annotations
 import collections.abc as collections
-import math
 import numbers
+import operator
+import os
+import pathlib
 
 import numpy as np
 import pandas as pd
@@ -15,6 +17,17 @@ import typing
 import warnings
 import xarray as xr
 
+from xarray_events.DurationIndex import DurationIndex
+from xarray_events.EventCatalog import EventCatalog
+from xarray_events.EventGroupBy import EventGroupBy
+from xarray_events.EventsPlan import EventsPlan
+from xarray_events.EventsStore import EventsStore
+from xarray_events.PositionIndex import PositionIndex
+from xarray_events.PrefixSums import PrefixSumsCache
+from xarray_events.serialization import events_as_variables
+
+_T = typing.TypeVar('_T')
+
 
 @xr.register_dataset_accessor('events')
 class EventsAccessor:
@@ -29,11 +42,18 @@ class EventsAccessor:
         :attr:`_ds`: The :obj:`Dataset` to be accessed whose class-level
         functionality is to be extended.
 
+        :attr:`_position_indexes`: The :class:`PositionIndex` of each
+        :obj:`Dataset` dimension or coordinate that has needed one, reused for
+        as long as its variable stays the same.
+
     """
 
     def __init__(self, ds: xr.Dataset) -> None:
         """Init for :class:`EventsAccessor` given a :obj:`Dataset`."""
         self._ds = ds
+        self._position_indexes: typing.Dict[
+            typing.Hashable, PositionIndex
+        ] = dict()
 
     @property
     def df(self) -> pd.DataFrame:
@@ -42,12 +62,17 @@ class EventsAccessor:
         Note: Getting it when it doesn't exist raises an exception. Setting it
         when it *apparently* already exists raises a warning.
 
+        It's kept in the :class:`EventsStore` of the :obj:`Dataset`, so setting
+        it doesn't affect the :obj:`Dataset` objects this one was derived from.
+
         """
-        try:
-            return self._ds.attrs['_events']
-        except KeyError:
+        events = self._store.df
+
+        if events is None:
             raise TypeError('Events not yet loaded.')
 
+        return events
+
     @df.setter
     def df(self, events: pd.DataFrame) -> None:
         if '_events' in self._ds.attrs:
@@ -56,7 +81,30 @@ class EventsAccessor:
                 "attribute of the Dataset."
             )
 
-        self._ds.attrs['_events'] = events
+        self._set_store(self._store.replace(df=events))
+
+    @property
+    def _store(self) -> EventsStore:
+        """Get the :class:`EventsStore` in the attributes of :attr:`_ds`."""
+        store = self._ds.attrs.get('_events')
+
+        if isinstance(store, EventsStore):
+            return store
+
+        # The events and the mapping may also be plain attributes, as they
+        # were before the store existed.
+        return EventsStore(store, self._ds.attrs.get('_ds_df_mapping'))
+
+    def _set_store(self, store: EventsStore) -> None:
+        """Put a new :class:`EventsStore` in the attributes of :attr:`_ds`."""
+        # The attributes are rebound rather than modified, since xarray may
+        # share them with the Dataset that :attr:`_ds` was derived from (e.g.
+        # by :meth:`xr.Dataset.sel`), whose events must stay as they are.
+        attrs = {
+            k: v for k, v in self._ds.attrs.items() if k != '_ds_df_mapping'
+        }
+
+        self._ds.attrs = {**attrs, '_events': store}
 
     def _flatten_list_tuples_strings(
         self,
@@ -115,11 +163,13 @@ class EventsAccessor:
         as an argument to :meth:`load`.
 
         """
-        try:
-            return self._ds.attrs['_ds_df_mapping']  # type: ignore
-        except KeyError:
+        mapping = self._store.ds_df_mapping
+
+        if mapping is None:
             raise TypeError('Mapping not yet loaded.')
 
+        return mapping
+
     @ds_df_mapping.setter
     def ds_df_mapping(
         self,
@@ -132,7 +182,7 @@ class EventsAccessor:
     ) -> None:
         # Case where the mapping already seems to exist yet a new one is
         # trying to be loaded.
-        if '_ds_df_mapping' in self._ds.attrs:
+        if self._store.ds_df_mapping is not None:
             warnings.warn(
                 "Attempting to load the ds-df mapping despite _ds_df_mapping "
                 "being already an attribute of the Dataset.", UserWarning
@@ -158,7 +208,7 @@ class EventsAccessor:
                 f"Dataset dimensions or coordinates.")
 
         # At this point we're certain that the given mapping is valid.
-        self._ds.attrs['_ds_df_mapping'] = mapping
+        self._set_store(self._store.replace(ds_df_mapping=mapping))
 
     @property
     def duration_mapping(self) -> typing.Optional[
@@ -172,6 +222,14 @@ class EventsAccessor:
         :attr:`ds_df_mapping`.
 
         """
+        return self._store.derive('duration_mapping', self._duration_mapping)
+
+    def _duration_mapping(self) -> typing.Optional[
+        typing.Tuple[
+            typing.Hashable, typing.Tuple[typing.Any, ...]
+        ]
+    ]:
+        """Deduce :attr:`duration_mapping` from :attr:`ds_df_mapping`."""
         # Only the *one* tuple that maps to Dataset coordinates represents
         # properly a duration, at least for now. We then define a duration as a
         # reduced version of self.ds_df_mapping only containing that.
@@ -188,27 +246,423 @@ class EventsAccessor:
 
         return mappings_with_durations[0]
 
+    @property
+    def duration_index(self) -> DurationIndex:
+        """Manage the interval index over the duration of the events.
+
+        The :class:`DurationIndex` is built from the columns given by
+        :attr:`duration_mapping` the first time it's needed and then reused
+        until the events :obj:`DataFrame` or the mapping is replaced (e.g. by
+        :meth:`sel` or :meth:`fill_gaps`). Modifying the duration columns in
+        place isn't detected.
+
+        """
+        if self.duration_mapping is None:
+            raise TypeError('No duration mapping loaded.')
+
+        start, end = self.duration_mapping[1]
+
+        return self._store.derive(
+            'duration_index', lambda: DurationIndex.from_df(self.df, start, end)
+        )
+
     def _load_events_from_DataFrame(self, df: pd.DataFrame) -> None:
-        # If source is a DataFrame, assign it directly as an attribute of _ds.
-        self._ds = self._ds.assign_attrs(_events=df)
+        # If source is a DataFrame, store it directly in a shallow copy of _ds.
+        store = self._store.replace(df=df)
+
+        self._ds = self._ds.copy()
+        self._set_store(store)
+
+    def _get_pushdown(
+        self,
+        ds_df_mapping: typing.Optional[
+            typing.Mapping[typing.Hashable, typing.Any]
+        ],
+        columns: typing.Optional[typing.Iterable[typing.Hashable]],
+        filters: typing.Optional[typing.List[typing.Any]]
+    ) -> typing.Tuple[
+        typing.Optional[typing.List[typing.Hashable]],
+        typing.Optional[typing.List[typing.List[typing.Tuple]]]
+    ]:
+        """Get the columns and filters to read events from a columnar source.
+
+        The columns are those mapped by :attr:`ds_df_mapping` and
+        :attr:`columns`, or all of them if :attr:`columns` isn't given. The
+        filters, in disjunctive normal form (as in :mod:`pyarrow.parquet`),
+        are :attr:`filters` with an additional condition in each conjunction:
+        the duration must intersect the range of values of the :obj:`Dataset`
+        coordinate it maps to, if those are sortable.
+
+        """
+        mapping = ds_df_mapping or dict()
+
+        projection = None
+
+        if columns is not None:
+            projection = list(
+                dict.fromkeys(
+                    [
+                        *self._flatten_list_tuples_strings(mapping.values()),
+                        *columns
+                    ]
+                )
+            )
+
+        within_ds: typing.List[typing.Tuple] = list()
+
+        durations = [
+            (key, val) for key, val in mapping.items() if isinstance(val, tuple)
+        ]
+
+        if len(durations) == 1:
+            dim, (start, end) = durations[0]
+            values = self._ds[dim].values
+
+            if values.dtype.kind in 'iufmM' and len(values):
+                low, high = (
+                    pd.Timestamp(value) if values.dtype.kind == 'M'
+                    else pd.Timedelta(value) if values.dtype.kind == 'm'
+                    else value.item()
+                    for value in (values.min(), values.max())
+                )
+                within_ds = [(start, '<=', high), (end, '>=', low)]
+
+        if not filters:
+            return projection, [within_ds] if within_ds else None
+
+        # A flat list of conditions is a single conjunction.
+        if all(isinstance(condition, tuple) for condition in filters):
+            filters = [filters]
+
+        return projection, [
+            list(conjunction) + within_ds for conjunction in filters
+        ]
+
+    def _get_duration_parsers(
+        self,
+        ds_df_mapping: typing.Optional[
+            typing.Mapping[typing.Hashable, typing.Any]
+        ]
+    ) -> typing.Dict[
+        typing.Hashable, collections.Callable[[pd.Series], pd.Series]
+    ]:
+        """Get how to parse the duration columns read from text.
+
+        Text files hold dates and times as strings (or, in JSON, dates as
+        milliseconds since the epoch), so the duration columns that map to a
+        :obj:`Dataset` coordinate of dates or times are parsed like it, in
+        order to compare them with its values.
+
+        """
+        durations = [
+            (key, val)
+            for key, val in (ds_df_mapping or dict()).items()
+            if isinstance(val, tuple)
+        ]
+
+        if len(durations) != 1:
+            return dict()
+
+        dim, (start, end) = durations[0]
+        kind = self._ds[dim].dtype.kind
+
+        if kind not in 'mM':
+            return dict()
+
+        parse = self._parse_dates if kind == 'M' else pd.to_timedelta
+
+        return {start: parse, end: parse}
+
+    @staticmethod
+    def _parse_dates(col: pd.Series) -> pd.Series:
+        """Parse dates like those of a :obj:`Dataset` coordinate."""
+        col = pd.to_datetime(col)
+
+        # Coordinates hold dates without a time zone, taken to be in UTC.
+        if col.dt.tz is not None:
+            col = col.dt.tz_convert(None)
+
+        return col
+
+    @staticmethod
+    def _get_filters_mask(
+        columns: typing.Any,
+        filters: typing.List[typing.List[typing.Tuple]],
+        comparisons: typing.Mapping[
+            str, collections.Callable[[typing.Any, typing.Any], typing.Any]
+        ],
+        and_: collections.Callable[[typing.Any, typing.Any], typing.Any],
+        or_: collections.Callable[[typing.Any, typing.Any], typing.Any]
+    ) -> typing.Any:
+        """Evaluate filters in disjunctive normal form over some columns.
+
+        Args:
+            :attr:`columns`: Anything whose items are the columns (e.g. a
+                :obj:`DataFrame` or a :obj:`pyarrow.Table`).
+            :attr:`filters`: The filters, as returned by :meth:`_get_pushdown`.
+            :attr:`comparisons`: The function implementing each operator of
+                the filters on a column.
+            :attr:`and_`: Function to combine masks by conjunction.
+            :attr:`or_`: Function to combine masks by disjunction.
+
+        """
+        mask = None
+
+        for conjunction in filters:
+            conjunction_mask = None
+
+            for col, op, value in conjunction:
+                condition = comparisons[op](columns[col], value)
+
+                conjunction_mask = (
+                    condition if conjunction_mask is None
+                    else and_(conjunction_mask, condition)
+                )
+
+            mask = (
+                conjunction_mask if mask is None
+                else or_(mask, conjunction_mask)
+            )
+
+        return mask
+
+    def _load_events_from_chunks(
+        self,
+        chunks: typing.Iterable[pd.DataFrame],
+        projection: typing.Optional[typing.List[typing.Hashable]],
+        filters: typing.Optional[typing.List[typing.List[typing.Tuple]]],
+        parsers: typing.Mapping[
+            typing.Hashable, collections.Callable[[pd.Series], pd.Series]
+        ]
+    ) -> None:
+        # Each chunk is filtered and projected as soon as it's parsed, so only
+        # the events to load are ever kept, and put together once at the end.
+        kept = list()
+
+        for chunk in chunks:
+            for col, parse in parsers.items():
+                if col in chunk:
+                    chunk[col] = parse(chunk[col])
+
+            if filters:
+                chunk = chunk[
+                    self._get_filters_mask(
+                        chunk,
+                        filters,
+                        {
+                            '==': operator.eq,
+                            '=': operator.eq,
+                            '!=': operator.ne,
+                            '<': operator.lt,
+                            '>': operator.gt,
+                            '<=': operator.le,
+                            '>=': operator.ge,
+                            'in': lambda col, values: col.isin(values),
+                            'not in': lambda col, values: ~col.isin(values)
+                        },
+                        operator.and_,
+                        operator.or_
+                    )
+                ]
+
+            kept.append(chunk if projection is None else chunk[projection])
+
+        if not kept:
+            self._load_events_from_DataFrame(pd.DataFrame(columns=projection))
+            return
+
+        # Categories are inferred chunk by chunk, so they must be united for
+        # the columns to stay categorical after concatenating them.
+        for col in kept[0]:
+            if isinstance(kept[0][col].dtype, pd.CategoricalDtype):
+                categories = pd.api.types.union_categoricals(
+                    [chunk[col] for chunk in kept],
+                    sort_categories=True
+                ).categories
+
+                kept = [
+                    chunk.astype({col: pd.CategoricalDtype(categories)})
+                    for chunk in kept
+                ]
+
+        self._load_events_from_DataFrame(pd.concat(kept, ignore_index=True))
+
+    def _load_events_from_CSV(
+        self,
+        path: typing.Union[str, os.PathLike],
+        projection: typing.Optional[typing.List[typing.Hashable]],
+        filters: typing.Optional[typing.List[typing.List[typing.Tuple]]],
+        parsers: typing.Mapping[
+            typing.Hashable, collections.Callable[[pd.Series], pd.Series]
+        ],
+        dtype: typing.Optional[typing.Mapping[typing.Hashable, typing.Any]],
+        chunksize: int
+    ) -> None:
+        # Besides the projected columns, those that are filtered by must be
+        # parsed as well.
+        usecols = None
+
+        if projection is not None:
+            usecols = list(
+                dict.fromkeys(
+                    projection + [
+                        col
+                        for conjunction in filters or []
+                        for col, _, _ in conjunction
+                    ]
+                )
+            )
+
+        chunks = pd.read_csv(
+            path, usecols=usecols, dtype=dtype, chunksize=chunksize
+        )
+
+        try:
+            self._load_events_from_chunks(
+                chunks, projection, filters, parsers
+            )
+        finally:
+            chunks.close()
+
+    def _load_events_from_JSON_lines(
+        self,
+        path: typing.Union[str, os.PathLike],
+        projection: typing.Optional[typing.List[typing.Hashable]],
+        filters: typing.Optional[typing.List[typing.List[typing.Tuple]]],
+        parsers: typing.Mapping[
+            typing.Hashable, collections.Callable[[pd.Series], pd.Series]
+        ],
+        dtype: typing.Optional[typing.Mapping[typing.Hashable, typing.Any]],
+        chunksize: int
+    ) -> None:
+        # Numbers are only read as dates in the columns given to the parser.
+        dates = [
+            col for col, parse in parsers.items() if parse is self._parse_dates
+        ]
+
+        chunks = pd.read_json(
+            path, lines=True, chunksize=chunksize, convert_dates=dates or True
+        )
+
+        try:
+            # Not every type (e.g. category) can be given to the parser, so
+            # each chunk is cast right after being parsed.
+            self._load_events_from_chunks(
+                (
+                    chunk if dtype is None else chunk.astype(dtype)
+                    for chunk in chunks
+                ),
+                projection,
+                filters,
+                parsers
+            )
+        finally:
+            chunks.close()
+
+    def _load_events_from_Parquet(
+        self,
+        path: typing.Union[str, os.PathLike],
+        projection: typing.Optional[typing.List[typing.Hashable]],
+        filters: typing.Optional[typing.List[typing.List[typing.Tuple]]]
+    ) -> None:
+        # Only the projected columns are read and the filters are pushed down
+        # to skip whole files and row groups based on their statistics.
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError(
+                'Loading Parquet requires pyarrow to be installed.'
+            )
+
+        table = pyarrow.parquet.read_table(
+            path,
+            columns=projection,
+            filters=filters,
+            use_pandas_metadata=True
+        )
+
+        self._load_events_from_DataFrame(table.to_pandas())
+
+    def _load_events_from_catalog(
+        self,
+        catalog: EventCatalog,
+        projection: typing.Optional[typing.List[typing.Hashable]],
+        filters: typing.Optional[typing.List[typing.List[typing.Tuple]]]
+    ) -> None:
+        # Only the pages of the catalog holding the events to load, and those
+        # of the columns filtered by, are ever read.
+        self._load_events_from_DataFrame(
+            catalog.read(catalog.select(filters), projection)
+        )
+
+    def _load_events_from_Table(
+        self,
+        table: typing.Any,
+        projection: typing.Optional[typing.List[typing.Hashable]],
+        filters: typing.Optional[typing.List[typing.List[typing.Tuple]]]
+    ) -> None:
+        # The table is already in memory, but filtering and projecting it
+        # before converting it saves converting what would be thrown away.
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if filters:
+            table = table.filter(
+                self._get_filters_mask(
+                    table,
+                    filters,
+                    {
+                        '==': pc.equal,
+                        '=': pc.equal,
+                        '!=': pc.not_equal,
+                        '<': pc.less,
+                        '>': pc.greater,
+                        '<=': pc.less_equal,
+                        '>=': pc.greater_equal,
+                        'in': lambda col, values: pc.is_in(
+                            col, value_set=pa.array(list(values))
+                        ),
+                        'not in': lambda col, values: pc.invert(
+                            pc.is_in(col, value_set=pa.array(list(values)))
+                        )
+                    },
+                    pc.and_,
+                    pc.or_
+                )
+            )
+
+        if projection is not None:
+            # Keep the columns that hold the index of a pandas DataFrame.
+            index_columns = [
+                col
+                for col in (table.schema.pandas_metadata or dict()).get(
+                    'index_columns', []
+                )
+                if isinstance(col, str)
+            ]
+            table = table.select(
+                list(dict.fromkeys(projection + index_columns))
+            )
+
+        self._load_events_from_DataFrame(table.to_pandas())
 
     def _is_column_mask(
         self, val: collections.Collection[typing.Hashable], col: pd.Series
     ) -> bool:
         # Checks whether a Collection is a boolean mask of a Dataframe column.
-        return len(val) == len(col) and all(type(x) == bool for x in val)
+        return len(val) == len(col) and np.asarray(val).dtype == bool
 
-    def _filter_events(
+    def _get_events_mask(
         self,
         key: typing.Hashable,
         value: typing.Union[
             collections.Callable[[pd.Series], pd.Series],
             collections.Collection[typing.Hashable]
         ]
-    ) -> None:
-        # We need to disable the warnings that will be thrown due to calling the
-        # setter df since they aren't meaningful in this case.
-        warnings.filterwarnings('ignore')
+    ) -> typing.Optional[np.ndarray]:
+        # Gets the mask of the events satisfying a constraint, or None if the
+        # constraint doesn't filter them.
+        col = self.df[key]
 
         # Case where the specified value is a "single value", which is anything
         # that's neither a Collection nor a Callable.
@@ -221,28 +675,86 @@ class EventsAccessor:
             ) and
             not isinstance(value, collections.Callable)  # type: ignore
         ):
-            self.df = self._ds._events[self._ds._events[key] == value]
+            return (col == value).to_numpy()
 
         # Case where the specified value is a Collection but not a boolean mask.
         # Notice that a boolean mask is a special kind of Collection!
-        elif (
+        if (
             isinstance(value, collections.Collection) and not
-            self._is_column_mask(value, self._ds._events[key])
+            self._is_column_mask(value, col)
         ):
-            self.df = self._ds._events[self._ds._events[key].isin(value)]
+            return col.isin(value).to_numpy()
 
         # Case where the specified value is a boolean mask or a Callable that
         # when applied can be converted into one.
-        else:
-            if isinstance(value, collections.Callable):  # type: ignore
-                value_transformed = value(self._ds._events[key])  # type: ignore
+        if isinstance(value, collections.Callable):  # type: ignore
+            result = value(col)  # type: ignore
+
+            if not self._is_column_mask(result, col):
+                return None
+
+            return np.asarray(result, dtype=bool)
+
+        return np.asarray(value, dtype=bool)
+
+    def _filter_events(
+        self,
+        constraints: typing.Mapping[
+            typing.Hashable,
+            typing.Union[
+                collections.Callable[[pd.Series], pd.Series],
+                collections.Collection[typing.Hashable]
+            ]
+        ],
+        mask: typing.Optional[np.ndarray] = None
+    ) -> None:
+        # All the constraints are combined into a single mask (along with the
+        # one given, if any), so the events DataFrame is filtered (and copied)
+        # once no matter how many there are.
+        for key, value in constraints.items():
+            constraint_mask = self._get_events_mask(key, value)
+
+            if constraint_mask is not None:
+                mask = (
+                    constraint_mask if mask is None else mask & constraint_mask
+                )
+
+        if mask is None or mask.all():
+            return
 
-                if self._is_column_mask(
-                    value_transformed, self._ds._events[key]
-                ):
-                    self.df = self._ds._events[value_transformed.values]
+        # The warning of the setter df isn't meaningful in this case.
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            self.df = self.df[mask]
 
-        warnings.filterwarnings('always')  # Reactivate warnings.
+    def _get_query_mask(
+        self,
+        expr: str,
+        local_dict: typing.Optional[typing.Mapping[str, typing.Any]]
+    ) -> np.ndarray:
+        # Gets the mask of the events satisfying an expression, which is only
+        # evaluated once for the same events unless it refers to variables.
+        store = self._store
+        mask = store.query_masks.get(expr) if local_dict is None else None
+
+        if mask is None:
+            result = self.df.eval(expr, local_dict=local_dict)
+
+            if (
+                not isinstance(result, pd.Series) or
+                not pd.api.types.is_bool_dtype(result)
+            ):
+                raise ValueError(
+                    f"Invalid query. {expr!r} isn't a condition on the events."
+                )
+
+            mask = result.to_numpy()
+            mask.setflags(write=False)
+
+            if local_dict is None:
+                store.query_masks[expr] = mask
+
+        return mask
 
     def _get_ds_from_df(
         self, df_col: typing.Optional[typing.Hashable]
@@ -255,9 +767,16 @@ class EventsAccessor:
 
         This method is needed because the values in self.ds_df_mapping can be
         either str or tuple, so appropriate checks need to be performed since
-        it's not trivial to get this correspondance directly.
+        it's not trivial to get this correspondance directly. The reverse
+        mapping is built once per mapping, so each call is a single lookup.
 
         """
+        return self._store.derive(
+            'reverse_mapping', self._reverse_mapping
+        ).get(df_col)
+
+    def _reverse_mapping(self) -> typing.Dict[typing.Hashable, typing.Hashable]:
+        """Map every value in :attr:`ds_df_mapping` back to its key."""
         mapping = list(self.ds_df_mapping.items()).copy()
 
         for key, val in mapping:
@@ -267,93 +786,290 @@ class EventsAccessor:
                     mapping.append((key, x))
                 mapping.remove((key, val))
 
+        reverse: typing.Dict[typing.Hashable, typing.Hashable] = dict()
+
+        # The first entry matching a column wins.
         for key, val in mapping:
+            reverse.setdefault(val, key)
 
-            if (
-                (df_col == val) or
-                (isinstance(val, tuple) and df_col in [val[0], val[1]])
-            ):
-                return key
+            if isinstance(val, tuple):
+                reverse.setdefault(val[0], key)
+                reverse.setdefault(val[1], key)
 
-        return None
+        return reverse
 
-    def _slice_ds_by_duration(
-        self, start: typing.Hashable, end: typing.Hashable
-    ) -> typing.List[typing.Hashable]:
-        """Silce a :obj:`Dataset` by the duration values.
+    def _get_position_index(self, name: typing.Hashable) -> PositionIndex:
+        """Get the :class:`PositionIndex` of a :obj:`Dataset` coordinate.
 
-        This method will slice a Dataset dimension or coordinate by the duration
-        values, which can be of any type and need not be sortable.
+        The index is built the first time it's needed and then reused until
+        the variable of the coordinate is replaced.
 
         """
-        values = list(self._ds[self.duration_mapping[0]].values)  # type: ignore
+        variable = self._ds.variables[name]
+        index = self._position_indexes.get(name)
 
-        return values[values.index(start):(values.index(end) + 1)]
+        if index is None or index.source is not variable:
+            index = self._position_indexes[name] = PositionIndex(
+                variable.values, variable
+            )
 
-    def _slice_ds_indexes_by_duration(
-        self, start: typing.Hashable, end: typing.Hashable
-    ) -> typing.Iterable[slice]:
-        """Silce a :obj:`Dataset` by the duration values.
+        return index
 
-        This method will slice a Dataset dimension or coordinate by the duration
-        values, which can be of any type and need not be sortable.
+    def _derive_along(
+        self,
+        name: typing.Hashable,
+        dim: typing.Hashable,
+        build: collections.Callable[[], _T]
+    ) -> _T:
+        """Get something derived from the events and a coordinate.
+
+        It's cached in the :class:`EventsStore` like the rest of what's derived
+        from the events, but it's built again if the variable of the coordinate
+        is replaced (e.g. by selecting from the :obj:`Dataset`).
 
         """
-        values = list(self._ds[self.duration_mapping[0]].values)  # type: ignore
+        variable = self._ds.variables[dim]
+        cached = self._store.derived.get((name, dim))
 
-        return list(
-            range(values.index(start), (values.index(end) + 1))  # type: ignore
-        )
+        if cached is None or cached[0] is not variable:
+            cached = self._store.derived[(name, dim)] = (variable, build())
+
+        return typing.cast(_T, cached[1])
+
+    def _duration_positions(self) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """Get the positions where every event starts and ends.
+
+        The duration values of all events are mapped in one call to positions
+        along the :obj:`Dataset` dimension or coordinate that they refer to.
+        Both arrays are aligned with the rows of the events :obj:`DataFrame`.
+
+        """
+        dim = self.duration_mapping[0]  # type: ignore
+
+        def build() -> typing.Tuple[np.ndarray, np.ndarray]:
+            positions = self._get_position_index(dim)
+
+            return (
+                positions.get_positions(self.duration_index.starts),
+                positions.get_positions(self.duration_index.ends)
+            )
+
+        return self._derive_along('duration_positions', dim, build)
 
     def df_contains_overlapping_events(self) -> bool:
         """Decide whether the events in the DataFrame overlap."""
         if not self.duration_mapping:
             raise TypeError('No duration mapping given.')
 
-        row_iterator = (
-            self.df.sort_values(self.duration_mapping[1][0]).itertuples()
+        return self._store.derive(
+            'contains_overlaps', self.duration_index.contains_overlaps
         )
 
-        for item in row_iterator:
+    def overlapping_pairs(self) -> np.ndarray:
+        """Get every pair of overlapping events.
 
-            # Check whether the difference between the start of the next event
-            # and the end of the current one is less than 1, in which case they
-            # overlap.
-            next_event = next(row_iterator, math.inf)
+        Two events overlap when the start of the one that starts last minus the
+        end of the other one is less than 1, just like in
+        :meth:`df_contains_overlapping_events`.
 
-            start = self.duration_mapping[1][0]
-            end = self.duration_mapping[1][1]
+        Returns:
+            An array of shape (number of pairs, 2) where each row holds the
+            index labels of two overlapping events, ordered as they appear in
+            the events :obj:`DataFrame`.
 
-            if getattr(next_event, start) - getattr(item, end) < 1:
-                return True
+        Raises:
+            TypeError: when no duration mapping has been loaded.
 
-        return False
+        """
+        if not self.duration_mapping:
+            raise TypeError('No duration mapping given.')
+
+        return self.df.index.to_numpy()[self.duration_index.overlapping_pairs()]
+
+    def overlap_groups(self) -> typing.List[np.ndarray]:
+        """Get the groups of events that overlap with each other.
+
+        Events belong to the same group when they're linked by a chain of
+        overlapping events. Events that don't overlap any other one are left
+        out.
+
+        Returns:
+            A list with an array of index labels of the events per group,
+            sorted by their start.
+
+        Raises:
+            TypeError: when no duration mapping has been loaded.
+
+        """
+        if not self.duration_mapping:
+            raise TypeError('No duration mapping given.')
+
+        index = self.duration_index
+        labels = self.df.index.to_numpy()[index.order]
+
+        group_of = index.overlap_groups()[index.order]
+        group_bounds = np.flatnonzero(np.diff(group_of)) + 1
+
+        return [
+            group
+            for group in np.split(labels, group_bounds)
+            if len(group) > 1
+        ]
+
+    def events_at(self, value: typing.Hashable) -> pd.DataFrame:
+        """Get the events whose duration covers :attr:`value`.
+
+        The lookup is a binary search on :attr:`duration_index`, so it doesn't
+        walk the events :obj:`DataFrame`.
+
+        Args:
+            :attr:`value`: A value of the :obj:`Dataset` coordinate or dimension
+                that the duration columns map to.
+
+        Returns:
+            The rows of the events :obj:`DataFrame` covering :attr:`value`.
+
+        """
+        return self.df.iloc[self.duration_index.stab(value)]
+
+    def _coverage(self) -> np.ndarray:
+        """Count the events that cover each position of the duration coordinate.
+
+        Every event adds 1 where it starts and subtracts 1 right after it ends
+        on a difference array, so a single cumulative sum yields the number of
+        events covering each position. This takes O(positions + events) time
+        regardless of how long the events are.
+
+        """
+        dim = self.duration_mapping[0]  # type: ignore
+
+        def build() -> np.ndarray:
+            size = len(self._get_position_index(dim))
+
+            starts, ends = self._duration_positions()
+
+            # Events that end before they start don't cover anything.
+            valid = starts <= ends
+
+            changes = (
+                np.bincount(starts[valid], minlength=size + 1) -
+                np.bincount(ends[valid] + 1, minlength=size + 1)
+            )
+
+            coverage = np.cumsum(changes[:-1])
+            coverage.setflags(write=False)
+
+            return coverage
+
+        return self._derive_along('coverage', dim, build)
 
     def df_contains_gaps(self) -> bool:
         """Decide whether the events DataFrame contains gaps.
 
-        This method will check whether the range spanned by the duration of all
-        events is the same as the Dataset coordinate values range, in which case
-        we can conclude that the events cover the whole coordinate and therefore
-        contain no gaps.
+        This method will check whether every value of the Dataset coordinate is
+        covered by the duration of some event, in which case we can conclude
+        that the events cover the whole coordinate and therefore contain no
+        gaps.
+
+        """
+        if self.duration_mapping is None:
+            raise TypeError('No duration mapping loaded.')
+
+        return bool(np.any(self._coverage() == 0))
+
+    def coverage_fraction(self) -> float:
+        """Get the fraction of the duration coordinate covered by the events.
+
+        Returns:
+            A number between 0 and 1, where 1 means that the events contain no
+            gaps.
+
+        Raises:
+            TypeError: when no duration mapping has been loaded.
+
+        """
+        if self.duration_mapping is None:
+            raise TypeError('No duration mapping loaded.')
+
+        coverage = self._coverage()
+
+        return float(np.mean(coverage > 0)) if len(coverage) else 1.0
+
+    def active_events(self) -> xr.DataArray:
+        """Count the events that are active at each value of the coordinate.
+
+        Returns:
+            A :obj:`DataArray` along the :obj:`Dataset` dimension or coordinate
+            given by :attr:`duration_mapping` holding the number of events
+            whose duration covers each one of its values. Gaps show up as 0 and
+            overlapping events as values greater than 1.
+
+        Raises:
+            TypeError: when no duration mapping has been loaded.
 
         """
         if self.duration_mapping is None:
             raise TypeError('No duration mapping loaded.')
 
-        ds_values_range = set(
-            self._ds[self.duration_mapping[0]].to_series()
+        coordinate = self._ds[self.duration_mapping[0]]
+
+        return xr.DataArray(
+            self._coverage().copy(),
+            coords=coordinate.coords,
+            dims=coordinate.dims,
+            name='active_events'
         )
-        df_values_range: typing.Set[typing.Hashable] = set()
 
-        for item in self.df.itertuples():
+    def membership(self) -> typing.Any:
+        """Get which positions of the coordinate each event covers.
+
+        This method builds a sparse matrix with a row per event and a column
+        per position of the :obj:`Dataset` dimension or coordinate given by
+        :attr:`duration_mapping`, where an entry is 1 if the event covers the
+        position. Unlike the :obj:`DataArray` created by
+        :meth:`expand_to_match_ds`, it represents overlapping events faithfully,
+        and any per-event aggregate becomes a product with it. For instance,
+        ``ds.events.membership() @ ds.ball_trajectory.values`` sums the values
+        covered by each event.
+
+        Requires :mod:`scipy`.
 
-            start = getattr(item, self.duration_mapping[1][0])
-            end = getattr(item, self.duration_mapping[1][1])
+        Returns:
+            A :obj:`scipy.sparse.csr_matrix` of type int8 whose rows follow the
+            rows of the events :obj:`DataFrame`.
+
+        Raises:
+            TypeError: when no duration mapping has been loaded.
+            ImportError: when :mod:`scipy` isn't installed.
+
+        """
+        if self.duration_mapping is None:
+            raise TypeError('No duration mapping loaded.')
+
+        try:
+            import scipy.sparse
+        except ImportError:
+            raise ImportError('membership requires scipy to be installed.')
+
+        dim = self.duration_mapping[0]
+        size = len(self._get_position_index(dim))
+
+        starts, ends = self._duration_positions()
+        lengths = np.maximum(ends - starts + 1, 0)
+
+        # Each row holds the consecutive positions start, ..., end, so the
+        # column indices are a single arange shifted by row.
+        indptr = np.zeros(len(lengths) + 1, dtype=np.intp)
+        np.cumsum(lengths, out=indptr[1:])
 
-            df_values_range |= set(self._slice_ds_by_duration(start, end))
+        indices = (
+            np.arange(indptr[-1]) - np.repeat(indptr[:-1] - starts, lengths)
+        )
 
-        return ds_values_range != df_values_range
+        return scipy.sparse.csr_matrix(
+            (np.ones(indptr[-1], dtype=np.int8), indices, indptr),
+            shape=(len(lengths), size)
+        )
 
     def fill_gaps(
         self,
@@ -388,87 +1104,159 @@ class EventsAccessor:
         if self.duration_mapping is None:
             raise TypeError('No duration mapping loaded.')
 
-        # Get the Dataset coordinate values that the "duration" attributes
-        # match to as a Series. We want to be able to tell whether each element
-        # on this set corresponds to (or is covered by) some event.
-        ds_values_range = pd.Series(self._ds[self.duration_mapping[0]].values)
+        start, end = self.duration_mapping[1]
 
-        df_values_range = list()
+        # A gap is a maximal run of positions of the Dataset coordinate that
+        # aren't covered by any event. Padding the mask with False on both
+        # sides makes every run begin at a +1 and finish right before a -1.
+        uncovered = np.concatenate(([False], self._coverage() == 0, [False]))
+        edges = np.diff(uncovered.astype(np.int8))
 
-        for item in self.df.itertuples():
+        gap_starts = np.flatnonzero(edges == 1)
+        gap_ends = np.flatnonzero(edges == -1) - 1
 
-            start = getattr(item, self.duration_mapping[1][0])
-            end = getattr(item, self.duration_mapping[1][1])
+        if not len(gap_starts):
+            return self._ds
 
-            # Get all values spanned by the duration attributes of the events.
-            df_values_range.extend(self._slice_ds_by_duration(start, end))
+        values = self._get_position_index(self.duration_mapping[0]).values
 
-        gaps: typing.List[typing.Any] = list()
-        gap: typing.List[typing.Hashable] = list()
-
-        # Construct a Series in which each index is a value from ds_values_range
-        # and each value is a boolean that represents whether there exists a
-        # corresponding value in df_values_range, effectively indicating whether
-        # that value is a gap.
-        gap_series = (
-            pd.Series(sorted(df_values_range))
-            .reset_index()
-            .set_index(0)
-            .reindex(ds_values_range)
-            ['index']
-            .map(lambda x: np.isnan(x))
+        # Create a new event for each gap, all of them at once. Their endpoints
+        # correspond to the "duration" DataFrame attributes.
+        gaps = pd.DataFrame(
+            {
+                start: values[gap_starts],
+                end: values[gap_ends],
+                event_type_col_name: event_type_col_value,
+                **extra_col_val_pairs
+            }
         )
 
-        for ds_val, is_gap in gap_series.iteritems():
+        # We need to disable the warnings that will be thrown due to calling the
+        # setter df since they aren't meaningful in this case.
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            self.df = pd.concat([self.df, gaps], ignore_index=True)
 
-            if not is_gap:  # If the current ds_val does not represent a gap.
-                if gap:
-                    gaps.append(gap)
-                gap = list()
-                continue
+        return self._ds  # Gaps are now filled in the internal DataFrame.
 
-            gap.append(ds_val)  # Append all ds_val from the current gap.
+    def append(self, new_events: pd.DataFrame) -> xr.Dataset:
+        """Add new events to the events :obj:`DataFrame`.
 
-        else:
-            if gap:  # Append final gap.
-                gaps.append(gap)
+        Unlike calling :meth:`load` again, this method only validates and
+        indexes the new events, so adding a few of them to many is cheap.
 
-            # Reduce the gaps to simply the endpoints of every group.
-            # The endpoints correspond to the "duration" Dataframe attributes.
-            gaps = [(val[0], val[-1]) for val in gaps if val]
+        Every column mapped by :attr:`ds_df_mapping` must be given, and its
+        values must be values of the :obj:`Dataset` dimension or coordinate it
+        maps to.
 
-        # We need to disable the warnings that will be thrown due to calling the
-        # setter df since they aren't meaningful in this case.
-        warnings.filterwarnings('ignore')
+        If the events are sorted by the start of their duration, the new ones
+        are merged into them so that they stay sorted. Otherwise, they're
+        added at the end. Either way, the :class:`DurationIndex` is updated
+        instead of being built again.
 
-        for gap in gaps:
+        Args:
+            :attr:`new_events`: A :obj:`DataFrame` with the events to add. If
+                the labels of the events are integers, those of the new events
+                are ignored and the new events are labeled after the largest
+                one instead.
 
-            self.df.index.name = event_type_col_name
+        Returns:
+            The :obj:`Dataset` with the new events in its events
+            :obj:`DataFrame`.
 
-            self.df = self.df.append(  # Why does this not happen in-place?!
-                pd.Series(
-                    {
-                        self.duration_mapping[1][0]: gap[0],
-                        self.duration_mapping[1][1]: gap[1],
-                        event_type_col_name: event_type_col_value,
-                        **extra_col_val_pairs
-                    }
-                ), ignore_index=True
+        Raises:
+            TypeError: when no events have been loaded.
+            ValueError: when a mapped column is missing, when its values
+                aren't values of the :obj:`Dataset` dimension or coordinate it
+                maps to, or when the labels of the new events already exist.
+
+        """
+        df = self.df
+
+        if not len(new_events):
+            return self._ds
+
+        mapping = self._store.ds_df_mapping or dict()
+
+        mapped_cols = self._flatten_list_tuples_strings(mapping.values())
+        missing_cols = set(mapped_cols) - set(new_events)
+
+        if missing_cols:
+            raise ValueError(
+                f"Invalid events. None of {missing_cols} are columns of the "
+                f"new events."
             )
 
-            # Reset the index of the events DataFrame after having appended a
-            # row for a new event.
-            self.df = self.df.reset_index(drop=True)
+        # Looking the values of the mapped columns up validates them.
+        for col in mapped_cols:
+            name = self._get_ds_from_df(col)
 
-        warnings.filterwarnings('always')  # Reactivate warnings.
+            if self._ds.variables[name].ndim == 1:
+                self._get_position_index(name).get_positions(
+                    new_events[col].to_numpy()
+                )
 
-        return self._ds  # Gaps are now filled in the internal DataFrame.
+        new_events = new_events.copy()
+
+        if pd.api.types.is_integer_dtype(df.index):
+            first_label = df.index.max() + 1 if len(df) else 0
+            new_events.index = pd.RangeIndex(
+                first_label, first_label + len(new_events), name=df.index.name
+            )
+
+        elif df.index.isin(new_events.index).any():
+            raise ValueError(
+                "Invalid events. Some of their labels already exist."
+            )
+
+        positions = np.full(len(new_events), len(df))
+        # Events loaded without a mapping have no durations to keep sorted.
+        duration_mapping = (
+            self.duration_mapping if self._store.ds_df_mapping is not None
+            else None
+        )
+        start, end = duration_mapping[1] if duration_mapping else (None, None)
+
+        if start is not None and df[start].is_monotonic_increasing:
+            new_events = new_events.sort_values(start, kind='mergesort')
+
+            # Inserting after the events starting at the same value keeps the
+            # merge stable.
+            positions = np.searchsorted(
+                df[start].to_numpy(), new_events[start].to_numpy(), side='right'
+            )
+
+        events = pd.concat([df, new_events])
+        events = events.iloc[
+            np.insert(
+                np.arange(len(df)),
+                positions,
+                np.arange(len(df), len(events))
+            )
+        ]
+
+        index = self._store.derived.get('duration_index')
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            self.df = events
+
+        if index is not None and index.is_built_from(df, start, end):
+            self._store.derived['duration_index'] = index.insert(
+                positions,
+                new_events[start].to_numpy(),
+                new_events[end].to_numpy(),
+                events
+            )
+
+        return self._ds
 
     def expand_to_match_ds(
         self,
         dimension_matching_col: typing.Hashable,
         fill_method: typing.Optional[typing.Hashable] = None,
-        fill_value_col: typing.Hashable = 'event_index'
+        fill_value_col: typing.Hashable = 'event_index',
+        codes: bool = False
     ) -> xr.DataArray:
         """Expand a :obj:`DataFrame` column to match the shape of the :obj:`Dataset`.
 
@@ -506,9 +1294,19 @@ class EventsAccessor:
                 -   nearest: Use nearest values to fill gap.
             :attr:`fill_value_col`: Events :obj:`DataFrame` column whose values
                 fill the output array.
+            :attr:`codes`: Whether to fill the output array with integer codes
+                instead of the values of :attr:`fill_value_col`. Each code is
+                the position of the value in a lookup table, and -1 means that
+                there's no event. This array is much smaller than one filled
+                with values (and NaN), and faster to group or compare.
 
         Returns:
-            A :obj:`DataArray` created as specified above.
+            A :obj:`DataArray` created as specified above. If :attr:`codes` is
+            True, its values are of type int32 and the lookup table is the
+            attribute named :attr:`fill_value_col`, so that the value of code
+            ``c`` is ``array.attrs[fill_value_col][c]``.
+            If the :obj:`Dataset` is backed by dask, the array is chunked like
+            it so that it can be combined lazily with its data variables.
 
         Raises:
             KeyError: when either :attr:`dimension_matching_col` or
@@ -518,6 +1316,20 @@ class EventsAccessor:
             See :doc:`../../tutorials/sports_data/expand_to_match_ds`.
 
         """
+        return self._chunked_like_ds(
+            self._expand_to_match_ds(
+                dimension_matching_col, fill_method, fill_value_col, codes
+            )
+        )
+
+    def _expand_to_match_ds(
+        self,
+        dimension_matching_col: typing.Hashable,
+        fill_method: typing.Optional[typing.Hashable],
+        fill_value_col: typing.Hashable,
+        codes: bool
+    ) -> xr.DataArray:
+        """Expand a column as :meth:`expand_to_match_ds` does, in memory."""
         # Besides the index name, we also add event_index as a dummy to the list
         # of cols to handle the case where this method is called by another
         # method and therefore neither reset_index nor rename have been called
@@ -533,19 +1345,57 @@ class EventsAccessor:
                 f"are columns of the events DataFrame."
             )
 
-        return xr.DataArray(
-            self.df
-            .sort_values(dimension_matching_col)
-            .reset_index()
-            .rename(columns={'index': fill_value_col}, errors='ignore')
-            .set_index(dimension_matching_col, drop=False)
-            [fill_value_col]
-            .reindex(
-                self._ds[self._get_ds_from_df(dimension_matching_col)],
-                method=fill_method
+        # The sorted values only depend on the events, so they're built once
+        # for every call to groupby_events on the same events.
+        values = self._store.derive(
+            ('sorted_values', dimension_matching_col, fill_value_col),
+            lambda: (
+                self.df
+                .sort_values(dimension_matching_col)
+                .reset_index()
+                .rename(columns={'index': fill_value_col}, errors='ignore')
+                .set_index(dimension_matching_col, drop=False)
+                [fill_value_col]
             )
         )
 
+        coordinate = self._ds[self._get_ds_from_df(dimension_matching_col)]
+
+        if codes:
+            # Looking the coordinate up in the index directly yields the codes,
+            # with -1 wherever no value matches.
+            return xr.DataArray(
+                values.index.get_indexer(
+                    coordinate.to_index(), method=fill_method
+                ).astype(np.int32),
+                coords=coordinate.coords,
+                dims=coordinate.dims,
+                name=fill_value_col,
+                attrs={fill_value_col: values.to_numpy(copy=True)}
+            )
+
+        return xr.DataArray(values.reindex(coordinate, method=fill_method))
+
+    def _chunked_like_ds(self, array: xr.DataArray) -> xr.DataArray:
+        """Chunk :attr:`array` like the dask-backed variables of the Dataset.
+
+        The expanded arrays are as long as the dimensions they match, so they
+        get split the same way as the data they're meant to be combined with.
+        If no variable is backed by dask, :attr:`array` is returned as is.
+
+        """
+        chunks: typing.Dict[typing.Hashable, typing.Tuple[int, ...]] = dict()
+
+        for variable in self._ds.variables.values():
+            if variable.chunks is not None:
+                for dim, dim_chunks in zip(variable.dims, variable.chunks):
+                    if dim in array.dims:
+                        chunks.setdefault(dim, dim_chunks)
+
+        # xarray annotates chunks as numbers.Number, which mypy doesn't
+        # consider int to be.
+        return array.chunk(chunks) if chunks else array  # type: ignore
+
     def groupby_events(
         self,
         array_to_group: typing.Hashable,
@@ -581,7 +1431,8 @@ class EventsAccessor:
 
         Returns:
             A :obj:`DataArrayGroupBy` object, which is internally just like
-            :obj:`GroupBy` from :mod:`pandas`.
+            :obj:`GroupBy` from :mod:`pandas`. If :attr:`array_to_group` is
+            backed by dask, its reductions are lazy.
 
         Raises:
             KeyError: when :attr:`dimension_matching_col` is unrecognizable.
@@ -616,10 +1467,11 @@ class EventsAccessor:
             self._ds
             [array_to_group]
             .groupby(
-                self.expand_to_match_ds(
+                self._expand_to_match_ds(
                     dimension_matching_col,  # type: ignore
                     fill_method,
-                    self.df.index.name or 'event_index'
+                    self.df.index.name or 'event_index',
+                    False
                 )
             )
         )
@@ -629,22 +1481,138 @@ class EventsAccessor:
         # or they cover more data than they should. This is how groupby works by
         # default. To get around this, we modify its attribute _group_indices to
         # include all coordinate values thereby accounting for repetitions.
+        # Since the positions covered by an event are contiguous, a slice
+        # describes them without listing every single one.
         if self.df_contains_overlapping_events() or self.df_contains_gaps():
 
-            for event in self.df.itertuples():
+            def build() -> typing.Tuple[slice, ...]:
+                starts, ends = self._duration_positions()
 
-                start = getattr(event, self.duration_mapping[1][0])
-                end = getattr(event, self.duration_mapping[1][1])
+                return tuple(map(slice, starts.tolist(), (ends + 1).tolist()))
 
-                groups._group_indices[
-                    getattr(event, 'Index')
-                ] = self._slice_ds_indexes_by_duration(start, end)
+            # The positions refer to the whole array, whereas groupby drops the
+            # values that fall on no group (those that are NaN after expanding),
+            # so the groups need to index the whole array again.
+            groups._obj = self._ds[array_to_group]
+
+            # The events are the groups, in order, even if their labels aren't
+            # their positions (e.g. after a selection) or some of them are
+            # hidden by others after expanding.
+            groups._group_indices = list(
+                self._derive_along(
+                    'group_slices',
+                    self.duration_mapping[0],
+                    build
+                )
+            )
+            groups._unique_coord = xr.IndexVariable(
+                groups._unique_coord.dims, self.df.index
+            )
 
         return groups
 
+    def event_groupby(
+        self, array_to_group: typing.Hashable, n_threads: int = 1
+    ) -> EventGroupBy:
+        """Group a data variable by the duration of the events.
+
+        This method creates an :class:`EventGroupBy` that reduces
+        :attr:`array_to_group` over the values spanned by the duration of each
+        event, computing the reductions for all events at once. Contrary to
+        :meth:`groupby_events`, overlapping events and gaps need no special
+        treatment.
+
+        Call this method strictly after having called :meth:`load` with a
+        :obj:`ds_df_mapping` argument that specifies a duration.
+
+        Args:
+            :attr:`array_to_group`: :obj:`Dataset` data variable or coordinate
+                to group.
+            :attr:`n_threads`: Number of threads that the reductions are split
+                across, each one reducing a batch of events.
+
+        Returns:
+            An :class:`EventGroupBy` object on which reductions like
+            :meth:`EventGroupBy.mean` can be called.
+
+        Raises:
+            TypeError: when no duration mapping has been loaded.
+            KeyError: when :attr:`array_to_group` is unrecognizable.
+
+        """
+        if self.duration_mapping is None:
+            raise TypeError('No duration mapping loaded.')
+
+        array = self._ds[array_to_group]
+        dim, = self._ds[self.duration_mapping[0]].dims
+
+        prefix_sums = None
+        cache = self._ds.attrs.get('_prefix_sums')
+
+        if isinstance(cache, PrefixSumsCache):
+            prefix_sums = cache.get_or_build(array_to_group, array, dim)
+
+        return EventGroupBy(
+            array,
+            dim,
+            *self._duration_positions(),
+            self.df.index,
+            prefix_sums,
+            n_threads
+        )
+
+    def cache_prefix_sums(self, *data_vars: typing.Hashable) -> xr.Dataset:
+        """Cache the cumulative sums of some data variables.
+
+        This method stores the cumulative sums (and sums of squares) of each
+        one of :attr:`data_vars` along the dimension given by
+        :attr:`duration_mapping`. From then on, the counts, sums, means and
+        variances computed by :meth:`event_groupby` for any events take two
+        lookups each.
+
+        The cache is kept as the attribute :attr:`_prefix_sums` of the
+        :obj:`Dataset`, so every :obj:`Dataset` derived from it (e.g. by
+        :meth:`sel`) shares it. Where the values of a data variable have been
+        replaced, its sums are accumulated again for each call without
+        replacing the cached ones (call this method again to cache them
+        instead), but writing into them in place isn't detected: call
+        :meth:`clear_prefix_sums` after doing so.
+
+        Args:
+            :attr:`data_vars`: Names of the data variables to cache.
+
+        Returns:
+            The :obj:`Dataset` with the cache as an attribute.
+
+        Raises:
+            TypeError: when no duration mapping has been loaded.
+            KeyError: when some of :attr:`data_vars` is unrecognizable.
+
+        """
+        if self.duration_mapping is None:
+            raise TypeError('No duration mapping loaded.')
+
+        dim, = self._ds[self.duration_mapping[0]].dims
+
+        cache = self._ds.attrs.get('_prefix_sums')
+
+        if not isinstance(cache, PrefixSumsCache):
+            cache = self._ds.attrs['_prefix_sums'] = PrefixSumsCache()
+
+        for name in data_vars:
+            cache.build(name, self._ds[name], dim)
+
+        return self._ds
+
+    def clear_prefix_sums(self) -> xr.Dataset:
+        """Drop the cache created by :meth:`cache_prefix_sums`."""
+        self._ds.attrs.pop('_prefix_sums', None)
+
+        return self._ds
+
     def load(
         self,
-        source: pd.DataFrame,
+        source: typing.Union[pd.DataFrame, str, os.PathLike, typing.Any],
         ds_df_mapping: typing.Optional[
             typing.Mapping[
                 typing.Hashable,
@@ -653,13 +1621,21 @@ class EventsAccessor:
                     typing.Hashable
                 ]
             ]
-        ] = None
+        ] = None,
+        columns: typing.Optional[typing.Iterable[typing.Hashable]] = None,
+        filters: typing.Optional[typing.List[typing.Any]] = None,
+        dtype: typing.Optional[
+            typing.Mapping[typing.Hashable, typing.Any]
+        ] = None,
+        chunksize: int = 100_000
     ) -> xr.Dataset:
         """Set the events :obj:`DataFrame` as an attribute of the :obj:`Dataset`.
 
         This is the first method that should be called on a :obj:`Dataset` when
         using this API. The internal attribute it creates in the :obj:`Dataset`
-        is :attr:`_events`.
+        is :attr:`_events`, an :class:`EventsStore` holding the events and
+        :attr:`ds_df_mapping`. It's shared by every :obj:`Dataset` derived from
+        this one, even by deep copies, so the events are never copied.
 
         Optionally, :attr:`ds_df_mapping` can be specified. This dictionary
         consists of key-value pairs that establish a correspondance between an
@@ -670,20 +1646,55 @@ class EventsAccessor:
         *property* :meth:`df`. Assuming you have a :obj:`Dataset` called
         ``ds``, you may use it via ``ds.events.df``.
 
+        The events can also be loaded from a file or a directory, given its
+        path, or from a :obj:`pyarrow.Table`. In that case, only the events
+        whose duration intersects the range of the :obj:`Dataset` coordinate it
+        maps to are loaded. The file may be:
+
+        -   CSV (``.csv``) or JSON lines (``.jsonl``, ``.ndjson`` or
+            ``.json``), possibly compressed (e.g. ``.csv.gz``). It's parsed in
+            chunks of :attr:`chunksize` rows, each one filtered as soon as it's
+            parsed, so that only the events to load are ever kept in memory.
+        -   Parquet, given the path to a file or a directory of them. Reading
+            it skips the files and row groups that hold no events to load.
+        -   An :class:`EventCatalog`, given the path to its directory or the
+            catalog itself. Its columns are memory-mapped, so only the pages
+            holding the events to load are read.
+
         Args:
             :attr:`source`: A :obj:`DataFrame` specifying where the events are
-                to be loaded from.
+                to be loaded from, or the path to a file, an
+                :class:`EventCatalog` or a :obj:`pyarrow.Table` holding them.
 
             :attr:`ds_df_mapping`: An optional dictionary where the keys are
                 columns from the events :obj:`DataFrame` and the values are
                 dimensions or coordinates from the :obj:`Dataset` thereby
                 specifying a *mapping* between them.
 
+            :attr:`columns`: Only for files, catalogs and tables, the
+                columns to load besides those in :attr:`ds_df_mapping` (e.g.
+                those that :meth:`sel` will filter by). By default, all of
+                them.
+
+            :attr:`filters`: Only for files, catalogs and tables, the
+                conditions that the events to load must satisfy, in the
+                disjunctive normal form of :func:`pyarrow.parquet.read_table`
+                (e.g. ``[('match_id', '==', 12)]``).
+
+            :attr:`dtype`: Only for CSV and JSON lines, the type of each column,
+                as in :func:`pd.read_csv`. Giving them (e.g. ``'category'``
+                for strings) avoids inferring them and keeping strings as
+                objects.
+
+            :attr:`chunksize`: Only for CSV and JSON lines, the number of rows
+                parsed at once.
+
         Returns:
             The modified :obj:`Dataset` now including events as an attribute.
 
         Raises:
             ValueError: on an invalid mapping.
+            ImportError: when loading Parquet without pyarrow installed.
 
         Example:
             See :doc:`../../tutorials/sports_data/loading`.
@@ -693,6 +1704,50 @@ class EventsAccessor:
         if isinstance(source, pd.DataFrame):
             self._load_events_from_DataFrame(source)
 
+        elif isinstance(source, EventCatalog) or (
+            isinstance(source, (str, os.PathLike)) and
+            EventCatalog.is_catalog(source)
+        ):
+            self._load_events_from_catalog(
+                source if isinstance(source, EventCatalog)
+                else EventCatalog(source),
+                *self._get_pushdown(ds_df_mapping, columns, filters)
+            )
+
+        elif isinstance(source, (str, os.PathLike)):
+            pushdown = self._get_pushdown(ds_df_mapping, columns, filters)
+
+            suffixes = [
+                suffix.lower() for suffix in pathlib.Path(source).suffixes
+            ]
+
+            # Compressed text files are decompressed as they're parsed.
+            if suffixes and suffixes[-1] in ('.gz', '.bz2', '.zip', '.xz'):
+                suffixes.pop()
+
+            suffix = suffixes[-1] if suffixes else ''
+
+            parsers = self._get_duration_parsers(ds_df_mapping)
+
+            if suffix == '.csv':
+                self._load_events_from_CSV(
+                    source, *pushdown, parsers, dtype, chunksize
+                )
+
+            elif suffix in ('.jsonl', '.ndjson', '.json'):
+                self._load_events_from_JSON_lines(
+                    source, *pushdown, parsers, dtype, chunksize
+                )
+
+            else:
+                self._load_events_from_Parquet(source, *pushdown)
+
+        # Checking the module avoids importing pyarrow when it isn't used.
+        elif type(source).__module__.startswith('pyarrow'):
+            self._load_events_from_Table(
+                source, *self._get_pushdown(ds_df_mapping, columns, filters)
+            )
+
         if ds_df_mapping:
             self.ds_df_mapping = ds_df_mapping
 
@@ -706,6 +1761,7 @@ class EventsAccessor:
         method: typing.Optional[str] = None,
         tolerance: typing.Optional[numbers.Number] = None,
         drop: bool = False,
+        drop_out_of_view: bool = False,
         **indexers_kwargs: typing.Any
     ) -> xr.Dataset:
         """Perform a selection on :attr:`_ds` given specified constraints.
@@ -737,9 +1793,20 @@ class EventsAccessor:
         Tip: If intended to be chained, call after having called :meth:`load`
         to ensure that the events are properly loaded.
 
-        The arguments, return values and raised exceptions are the same as for
-        :mod:`xr.Dataset.sel`, in order to stay true to the wrapper nature of
-        this method. See the `official xarray documentation
+        If :attr:`drop_out_of_view` is True, the :obj:`Dataset` and the events
+        are kept in sync along the dimension of :attr:`duration_mapping`:
+
+        -   Selecting from the :obj:`Dataset` along it drops the events that
+            don't cover any of the values left.
+
+        -   After filtering the events, the :obj:`Dataset` is narrowed down to
+            the span from the first start to the last end of the events left,
+            which is a slice and therefore copies nothing.
+
+        Other than :attr:`drop_out_of_view`, the arguments, return values and
+        raised exceptions are the same as for :mod:`xr.Dataset.sel`, in order
+        to stay true to the wrapper nature of this method. See the `official
+        xarray documentation
         <http://xarray.pydata.org/en/stable/generated/xarray.Dataset.sel.html>`_
         for details.
 
@@ -753,9 +1820,120 @@ class EventsAccessor:
         # attributes.
         constraints = indexers_kwargs
 
+        constraints_sel, constraints_events = self._split_constraints(
+            constraints
+        )
+
+        if drop_out_of_view and self.duration_mapping is None:
+            raise TypeError('No duration mapping loaded.')
+
+        # Whether selecting from the Dataset may leave events out of view.
+        is_duration_selected = drop_out_of_view and self._is_duration_selected(
+            constraints_sel
+        )
+
+        # Call xr.Dataset.sel with the method args as well as all constraints
+        # that match Dataset dimensions or coordinates.
+        self._ds = self._ds.sel(
+            indexers={
+                k: v for k, v in constraints.items() if k in constraints_sel
+            },
+            method=method,  # type: ignore
+            tolerance=tolerance,  # type: ignore
+            drop=drop
+        )
+
+        # Filter the events DataFrame with the constraints that match columns,
+        # along with the events out of view, all at once.
+        self._filter_events(
+            {k: v for k, v in constraints.items() if k in constraints_events},
+            self._get_in_view_mask() if is_duration_selected else None
+        )
+
+        if drop_out_of_view and constraints_events:
+            self._narrow_to_events()
+
+        return self._ds
+
+    def lazy(self) -> EventsPlan:
+        """Start a plan of operations on the :obj:`Dataset` and its events.
+
+        The :class:`EventsPlan` records calls to :meth:`load`, :meth:`sel`,
+        :meth:`query`, :meth:`fill_gaps`, :meth:`groupby_events` and
+        :meth:`event_groupby`, and runs them at once when its
+        :meth:`EventsPlan.compute` is called, fusing the selections so that
+        the events are filtered once instead of once per call.
+
+        Example:
+            ``ds.events.lazy().load(df, mapping).sel(event_type='pass')
+            .sel(frame=slice(1, 100)).groupby_events('ball').compute()``
+
+        """
+        return EventsPlan(self._ds)
+
+    def query(
+        self,
+        expr: str,
+        local_dict: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        drop_out_of_view: bool = False
+    ) -> xr.Dataset:
+        """Select the events satisfying an expression.
+
+        The expression is a condition on the columns of the events
+        :obj:`DataFrame` (e.g. ``"event_type == 'pass' and end_frame -
+        start_frame > 50"``), evaluated by :meth:`pd.DataFrame.eval` in a
+        single vectorized pass, with numexpr if it's installed. Unlike the
+        Callable constraints of :meth:`sel`, it runs no arbitrary Python.
+
+        The events satisfying each expression are remembered for as long as
+        the events stay the same, so repeating a query (e.g. from a
+        dashboard) only filters them.
+
+        Args:
+            :attr:`expr`: The expression.
+
+            :attr:`local_dict`: Variables the expression refers to with
+                ``@`` (e.g. ``{'length': 50}`` for ``'end_frame - start_frame
+                > @length'``). Expressions with variables aren't remembered.
+
+            :attr:`drop_out_of_view`: Whether to narrow the :obj:`Dataset`
+                down to the span of the events selected, as in :meth:`sel`.
+
+        Returns:
+            The :obj:`Dataset` with only the events satisfying the expression.
+
+        Raises:
+            TypeError: when no events have been loaded, or when narrowing the
+                :obj:`Dataset` down without a duration mapping.
+            ValueError: when the expression isn't a condition.
+
+        """
+        if drop_out_of_view and self.duration_mapping is None:
+            raise TypeError('No duration mapping loaded.')
+
+        mask = self._get_query_mask(expr, local_dict)
+
+        # The events of the Dataset the query is made on must stay as they
+        # are.
+        self._ds = self._ds.copy()
+        self._filter_events(dict(), mask)
+
+        if drop_out_of_view:
+            self._narrow_to_events()
+
+        return self._ds
+
+    def _split_constraints(
+        self, constraints: typing.Mapping[str, typing.Any]
+    ) -> typing.Tuple[typing.List[str], typing.List[str]]:
+        """Split constraints into those for the :obj:`Dataset` and the events.
+
+        A constraint may be both. Those matching neither raise a KeyError.
+
+        """
         # Events attributes, which may not exist.
         events = list(
-            self.df.columns if '_events' in self._ds.attrs else []
+            self.df.columns if self._store.df is not None else []
         )
 
         # Dataset dimensions and coordinates.
@@ -783,23 +1961,119 @@ class EventsAccessor:
                 f"Unrecognizable constraints: {unknown_constraints}."
             )
 
-        # Call xr.Dataset.sel with the method args as well as all constraints
-        # that match Dataset dimensions or coordinates.
-        self._ds = self._ds.sel(
-            indexers={
-                k: v for k, v in constraints.items() if k in constraints_sel
-            },
-            method=method,  # type: ignore
-            tolerance=tolerance,  # type: ignore
-            drop=drop
-        )
+        return constraints_sel, constraints_events
+
+    def _is_duration_selected(
+        self, constraints_sel: typing.Iterable[typing.Hashable]
+    ) -> bool:
+        """Decide whether some constraints select along the duration."""
+        dim = self.duration_mapping[0]  # type: ignore
 
-        # Filter the events DataFrame with the constraints that match columns.
-        for k, v in {
-            k: v for k, v in constraints.items() if k in constraints_events
-        }.items():
-            self._filter_events(k, v)
+        return bool(({dim} | set(self._ds[dim].dims)) & set(constraints_sel))
 
-        # TODO: Here's a good place to drop "out-of-view" events.
+    def _get_in_view_mask(self) -> typing.Optional[np.ndarray]:
+        """Get the mask of the events that cover some value of the Dataset.
 
-        return self._ds
+        The candidates are found with :attr:`duration_index` and then kept if
+        any value of the coordinate of :attr:`duration_mapping` lies between
+        their start and end. If the coordinate isn't there or its values
+        can't be sorted, every event is kept and None is returned.
+
+        """
+        dim = self.duration_mapping[0]  # type: ignore
+
+        if dim not in self._ds.variables:
+            return None
+
+        values = self._ds.variables[dim].values.ravel()
+
+        if values.dtype.kind not in 'biufmM':
+            return None
+
+        values = np.sort(values)
+        index = self.duration_index
+
+        mask = np.zeros(len(index), dtype=bool)
+
+        if len(values):
+            candidates = index.overlapping(values[0], values[-1])
+
+            # An event covers some value when fewer values are before its
+            # start than up to its end.
+            mask[candidates] = (
+                np.searchsorted(values, index.starts[candidates], 'left') <
+                np.searchsorted(values, index.ends[candidates], 'right')
+            )
+
+        return mask
+
+    def _narrow_to_events(self) -> None:
+        """Narrow the :obj:`Dataset` down to the span of the events.
+
+        The span goes from the first value that any event covers to the last
+        one, along the dimension of the coordinate of :attr:`duration_mapping`.
+
+        """
+        dim, (start, end) = self.duration_mapping  # type: ignore
+
+        if dim not in self._ds.variables or self._ds[dim].ndim != 1:
+            return
+
+        along = self._ds[dim].dims[0]
+        positions = self._get_position_index(dim)
+
+        if not len(self.df):
+            span = slice(0, 0)
+
+        elif positions.is_monotonic:
+            # The events may start or end out of the Dataset.
+            span = slice(
+                np.searchsorted(positions.values, self.df[start].min(), 'left'),
+                np.searchsorted(positions.values, self.df[end].max(), 'right')
+            )
+
+        else:
+            starts, ends = self._duration_positions()
+            span = slice(starts.min(), ends.max() + 1)
+
+        self._ds = self._ds.isel({along: span})
+
+    def to_netcdf(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        """Write the :obj:`Dataset` to a netCDF file along with its events.
+
+        The events can't be written as an attribute, so each of their columns
+        is written as a variable along an ``event`` dimension instead (see
+        :func:`events_as_variables`), and :attr:`ds_df_mapping` is written as
+        an attribute. :func:`open_dataset` reads them back.
+
+        The arguments and return values are the same as for
+        :meth:`xr.Dataset.to_netcdf`.
+
+        Raises:
+            TypeError: when no events have been loaded.
+            ValueError: when the :obj:`Dataset` already has an ``event``
+                dimension or any of the variables of the events.
+
+        """
+        return events_as_variables(
+            self._ds, self.df, self._store.ds_df_mapping
+        ).to_netcdf(*args, **kwargs)
+
+    def to_zarr(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        """Write the :obj:`Dataset` to a Zarr store along with its events.
+
+        The events are written as for :meth:`to_netcdf`, and
+        :func:`open_zarr` reads them back.
+
+        The arguments and return values are the same as for
+        :meth:`xr.Dataset.to_zarr`.
+
+        Raises:
+            TypeError: when no events have been loaded.
+            ValueError: when the :obj:`Dataset` already has an ``event``
+                dimension or any of the variables of the events.
+
+        """
+        return events_as_variables(
+            self._ds, self.df, self._store.ds_df_mapping
+        ).to_zarr(*args, **kwargs)
@@ -0,0 +1,246 @@
+"""Definition of the :class:`EventsPlan` class.
+
+Define the :class:`EventsPlan` class, which records a chain of operations of
+:class:`EventsAccessor` to run them all at once, without building the
+intermediate :obj:`Dataset` and events :obj:`DataFrame` of each one.
+
+"""
+from __future__ import annotations
+import collections.abc as collections
+import functools
+import numbers
+import operator
+
+import numpy as np
+import typing
+import xarray as xr
+
+# The operations that end a plan, since they don't return a Dataset.
+_TERMINAL = ('groupby_events', 'event_groupby')
+
+
+class EventsPlan:
+    """A chain of operations on a :obj:`Dataset` and its events, run lazily.
+
+    Every method but :meth:`compute` records an operation and returns a new
+    plan, so they can be chained like those of :class:`EventsAccessor` (e.g.
+    ``ds.events.lazy().load(df, mapping).sel(...).sel(...).compute()``).
+    Nothing runs until :meth:`compute` is called, which then:
+
+    -   Fuses consecutive calls to :meth:`sel` and :meth:`query`. Each
+        selection from the :obj:`Dataset` is made in turn, which copies
+        nothing, but the constraints on the events are all evaluated on the
+        same events and combined into a single mask, so the events
+        :obj:`DataFrame` is filtered (and copied) once.
+
+    -   Selects from the :obj:`Dataset` before filtering the events, and both
+        before :meth:`groupby_events` expands the events to match it.
+
+    Only the constraints that decide on each event by itself (single values,
+    Collections of values and expressions) are fused. A Callable or a boolean
+    mask is meant for the events left by the previous operations, so the
+    selections pending before it are applied first. So are they before the
+    :obj:`Dataset` is narrowed down to the events, as asked by
+    :attr:`drop_out_of_view`. Either way, the result is the same as running
+    the operations one by one.
+
+    Attributes:
+        :attr:`steps`: The operations recorded, as tuples of their name, the
+        positional arguments and the keyword arguments.
+
+    """
+
+    def __init__(
+        self,
+        ds: xr.Dataset,
+        steps: typing.Tuple[
+            typing.Tuple[str, typing.Tuple, typing.Dict[str, typing.Any]],
+            ...
+        ] = ()
+    ) -> None:
+        """Init for :class:`EventsPlan` given the :obj:`Dataset` to start."""
+        self._ds = ds
+        self.steps = steps
+
+    def __repr__(self) -> str:
+        """Represent the plan."""
+        return (
+            f"{type(self).__name__}: " +
+            ' -> '.join(['ds'] + [name for name, _, _ in self.steps])
+        )
+
+    def _then(
+        self, name: str, *args: typing.Any, **kwargs: typing.Any
+    ) -> EventsPlan:
+        """Get a new plan with one more operation."""
+        if self.steps and self.steps[-1][0] in _TERMINAL:
+            raise TypeError(
+                f"Can't {name} after {self.steps[-1][0]}, which ends the plan."
+            )
+
+        return EventsPlan(self._ds, self.steps + ((name, args, kwargs),))
+
+    def load(self, *args: typing.Any, **kwargs: typing.Any) -> EventsPlan:
+        """Record :meth:`EventsAccessor.load`."""
+        return self._then('load', *args, **kwargs)
+
+    def sel(
+        self,
+        indexers: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        method: typing.Optional[str] = None,
+        tolerance: typing.Optional[numbers.Number] = None,
+        drop: bool = False,
+        drop_out_of_view: bool = False,
+        **indexers_kwargs: typing.Any
+    ) -> EventsPlan:
+        """Record :meth:`EventsAccessor.sel`."""
+        return self._then(
+            'sel',
+            {**indexers_kwargs, **(indexers or {})},
+            method=method,
+            tolerance=tolerance,
+            drop=drop,
+            drop_out_of_view=drop_out_of_view
+        )
+
+    def query(
+        self,
+        expr: str,
+        local_dict: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        drop_out_of_view: bool = False
+    ) -> EventsPlan:
+        """Record :meth:`EventsAccessor.query`."""
+        return self._then(
+            'query', expr, local_dict, drop_out_of_view=drop_out_of_view
+        )
+
+    def fill_gaps(self, *args: typing.Any, **kwargs: typing.Any) -> EventsPlan:
+        """Record :meth:`EventsAccessor.fill_gaps`."""
+        return self._then('fill_gaps', *args, **kwargs)
+
+    def groupby_events(
+        self, *args: typing.Any, **kwargs: typing.Any
+    ) -> EventsPlan:
+        """Record :meth:`EventsAccessor.groupby_events`, which ends the plan."""
+        return self._then('groupby_events', *args, **kwargs)
+
+    def event_groupby(
+        self, *args: typing.Any, **kwargs: typing.Any
+    ) -> EventsPlan:
+        """Record :meth:`EventsAccessor.event_groupby`, which ends the plan."""
+        return self._then('event_groupby', *args, **kwargs)
+
+    def compute(self) -> typing.Any:
+        """Run the operations recorded.
+
+        Returns:
+            What the last operation returns: usually a :obj:`Dataset`, or
+            the groups if the plan ends with :meth:`groupby_events` or
+            :meth:`event_groupby`.
+
+        """
+        ds = self._ds
+        selections: typing.List[typing.Tuple] = list()
+
+        for name, args, kwargs in self.steps:
+            if name in ('sel', 'query'):
+                selections.append((name, args, kwargs))
+                continue
+
+            ds = self._select(ds, selections)
+            selections = list()
+
+            # Operating on a shallow copy leaves the Dataset (and accessor)
+            # of the previous step as they were.
+            ds = getattr(ds.copy().events, name)(*args, **kwargs)
+
+        return self._select(ds, selections)
+
+    @staticmethod
+    def _select(
+        ds: xr.Dataset, selections: typing.List[typing.Tuple]
+    ) -> xr.Dataset:
+        """Run consecutive selections at once."""
+        if not selections:
+            return ds
+
+        accessor = ds.copy().events
+
+        masks: typing.List[np.ndarray] = list()
+
+        def apply_masks() -> None:
+            # Filters the events with the masks pending, all at once.
+            accessor._filter_events(
+                dict(),
+                functools.reduce(operator.and_, masks) if masks else None
+            )
+            masks.clear()
+
+        for name, args, kwargs in selections:
+            drop_out_of_view = kwargs['drop_out_of_view']
+
+            if drop_out_of_view and accessor.duration_mapping is None:
+                raise TypeError('No duration mapping loaded.')
+
+            if name == 'query':
+                masks.append(accessor._get_query_mask(*args))
+
+                if drop_out_of_view:
+                    apply_masks()
+                    accessor._narrow_to_events()
+
+                continue
+
+            constraints = args[0]
+            constraints_sel, constraints_events = accessor._split_constraints(
+                constraints
+            )
+
+            # Callables and boolean masks refer to the events left so far.
+            if any(_is_positional(constraints[k]) for k in constraints_events):
+                apply_masks()
+
+            is_duration_selected = (
+                drop_out_of_view and
+                accessor._is_duration_selected(constraints_sel)
+            )
+
+            accessor._ds = accessor._ds.sel(
+                indexers={k: constraints[k] for k in constraints_sel},
+                method=kwargs['method'],
+                tolerance=kwargs['tolerance'],
+                drop=kwargs['drop']
+            )
+
+            for key in constraints_events:
+                mask = accessor._get_events_mask(key, constraints[key])
+
+                if mask is not None:
+                    masks.append(mask)
+
+            # The events in view are those of the Dataset selected so far.
+            if is_duration_selected:
+                mask = accessor._get_in_view_mask()
+
+                if mask is not None:
+                    masks.append(mask)
+
+            if drop_out_of_view and constraints_events:
+                apply_masks()
+                accessor._narrow_to_events()
+
+        apply_masks()
+
+        return typing.cast(xr.Dataset, accessor._ds)
+
+
+def _is_positional(value: typing.Any) -> bool:
+    """Decide whether a constraint depends on the events it's evaluated on."""
+    if isinstance(value, collections.Callable):  # type: ignore
+        return True
+
+    return (
+        isinstance(value, collections.Collection) and
+        not isinstance(value, typing.Hashable) and
+        np.asarray(value).dtype == bool
+    )
@@ -0,0 +1,171 @@
+"""Definition of the :class:`EventsStore` class.
+
+Define the :class:`EventsStore` class, which holds the events :obj:`DataFrame`
+and the ds-df mapping of a :obj:`Dataset` so that every :obj:`Dataset` derived
+from it shares them instead of copying them.
+
+"""
+from __future__ import annotations
+import collections.abc as collections
+
+import numpy as np
+import pandas as pd
+import typing
+
+_T = typing.TypeVar('_T')
+
+
+class EventsStore:
+    """The events and the ds-df mapping of a :obj:`Dataset`.
+
+    This store lives in the attributes of the :obj:`Dataset` as
+    :attr:`_events`, so it's shared by every :obj:`Dataset` derived from it
+    (e.g. by :meth:`xr.Dataset.sel` or :meth:`xr.Dataset.copy`). Copying it,
+    even deeply, returns the same store, so the events :obj:`DataFrame` is
+    never copied along with the :obj:`Dataset`.
+
+    A store is never modified, other than by filling its caches: setting the
+    events or the mapping of a :obj:`Dataset` puts a new store in its
+    attributes, with the next :attr:`version` and empty caches, leaving the
+    one shared with other :obj:`Dataset` objects as it was. Modifying the
+    events :obj:`DataFrame` in place, however, affects all of them and isn't
+    noticed by the caches.
+
+    The events may also be read lazily, the first time they're needed, by a
+    function given instead of the events (e.g. by :func:`open_dataset`).
+
+    Attributes:
+        :attr:`df`: The events :obj:`DataFrame`, or None if not yet loaded.
+
+        :attr:`ds_df_mapping`: The mapping from :obj:`Dataset` to
+        :obj:`DataFrame`, or None if not yet loaded.
+
+        :attr:`version`: The number of times the events or the mapping have
+        been replaced since they were first loaded.
+
+        :attr:`query_masks`: The masks of the events satisfying each
+        expression given to :meth:`EventsAccessor.query`, by expression.
+
+        :attr:`derived`: What :class:`EventsAccessor` derives from the events
+        and the mapping (e.g. the :class:`DurationIndex`), by name.
+
+    """
+
+    def __init__(
+        self,
+        df: typing.Optional[pd.DataFrame] = None,
+        ds_df_mapping: typing.Optional[
+            typing.Mapping[
+                typing.Hashable,
+                typing.Union[
+                    typing.Tuple[typing.Hashable, typing.Hashable],
+                    typing.Hashable
+                ]
+            ]
+        ] = None,
+        read_df: typing.Optional[
+            collections.Callable[[], pd.DataFrame]
+        ] = None,
+        version: int = 0
+    ) -> None:
+        """Init for :class:`EventsStore` given the events and the mapping.
+
+        Args:
+            :attr:`df`: See :attr:`df`.
+            :attr:`ds_df_mapping`: See :attr:`ds_df_mapping`.
+            :attr:`read_df`: Function that reads the events, called the first
+                time :attr:`df` is needed if it isn't given.
+            :attr:`version`: See :attr:`version`.
+
+        """
+        self._df = df
+        self._read_df = read_df
+        self.ds_df_mapping = ds_df_mapping
+        self.version = version
+        self.query_masks: typing.Dict[str, np.ndarray] = dict()
+        self.derived: typing.Dict[typing.Hashable, typing.Any] = dict()
+
+    @property
+    def df(self) -> typing.Optional[pd.DataFrame]:
+        """Get the events :obj:`DataFrame`, reading it if needed."""
+        if self._df is None and self._read_df is not None:
+            self._df = self._read_df()
+            self._read_df = None
+
+        return self._df
+
+    def derive(
+        self, name: typing.Hashable, build: collections.Callable[[], _T]
+    ) -> _T:
+        """Get something derived from the store, building it the first time.
+
+        Args:
+            :attr:`name`: The name it's cached by in :attr:`derived`.
+            :attr:`build`: Function that builds it from the events and the
+                mapping. Nothing is cached if it raises an exception.
+
+        """
+        if name not in self.derived:
+            self.derived[name] = build()
+
+        return typing.cast(_T, self.derived[name])
+
+    def __copy__(self) -> EventsStore:
+        """Share the store instead of copying it."""
+        return self
+
+    def __deepcopy__(self, memo: typing.Dict) -> EventsStore:
+        """Share the store instead of copying it."""
+        return self
+
+    def __eq__(self, other: object) -> bool:
+        """Decide whether two stores hold the same events and mapping."""
+        if not isinstance(other, EventsStore):
+            return NotImplemented
+
+        if self is other:
+            return True
+
+        if (self.df is None) != (other.df is None):
+            return False
+
+        return (
+            (self.df is None or self.df.equals(other.df)) and
+            self.ds_df_mapping == other.ds_df_mapping
+        )
+
+    # Stores are compared by their contents, which can't be hashed.
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        """Represent the store."""
+        if self._df is None:
+            n_events = 'unread' if self._read_df is not None else 'no'
+        else:
+            n_events = str(len(self._df))
+
+        return (
+            f"{type(self).__name__} v{self.version} with {n_events} events and "
+            f"mapping {self.ds_df_mapping!r}"
+        )
+
+    def replace(self, **changes: typing.Any) -> EventsStore:
+        """Get a new store with some of the attributes of this one replaced.
+
+        The new store is of the next :attr:`version` and its caches are empty.
+
+        """
+        if 'df' in changes:
+            return EventsStore(
+                changes['df'],
+                changes.get('ds_df_mapping', self.ds_df_mapping),
+                version=self.version + 1
+            )
+
+        # Unread events stay unread until either store needs them.
+        return EventsStore(
+            self._df,
+            changes.get('ds_df_mapping', self.ds_df_mapping),
+            self._read_df if self._df is None else None,
+            self.version + 1
+        )
@@ -0,0 +1,369 @@
+"""Definition of the :class:`LiveEvents` class.
+
+Define the :class:`LiveEvents` class, which keeps a rolling window of a
+:obj:`Dataset` that grows along the dimension of the events, along with the
+events within it.
+
+"""
+from __future__ import annotations
+import bisect
+
+import numpy as np
+import pandas as pd
+import typing
+import xarray as xr
+
+
+class LiveEvents:
+    """Rolling window over a :obj:`Dataset` and its events, for live data.
+
+    The values along the duration dimension (e.g. frames) arrive through
+    :meth:`push` and the events through :meth:`add_events`. Only the last
+    :attr:`window` values are kept: older ones are evicted along with every
+    event that starts before the window, so memory stays constant no matter how
+    long the stream runs.
+
+    The values live in buffers twice as long as the window. New values are
+    written after the current ones and, once a buffer is full, the window is
+    moved back to its beginning, which costs one copy every :attr:`window`
+    values or more.
+
+    Whether the events leave gaps or overlap is kept up to date as values and
+    events come and go, touching only the values and events that change.
+    Everything else is answered by :attr:`dataset`, a :obj:`Dataset` holding
+    the current window with its events loaded, on which the methods of
+    :class:`EventsAccessor` (e.g. :meth:`EventsAccessor.sel` or
+    :meth:`EventsAccessor.groupby_events`) can be called.
+
+    Attributes:
+        :attr:`window`: Number of values of the duration dimension kept.
+
+        :attr:`dim`: The duration dimension, given by :attr:`ds_df_mapping`.
+
+        :attr:`ds_df_mapping`: Mapping from the :obj:`Dataset` to the events
+        :obj:`DataFrame`, as given to :meth:`EventsAccessor.load`. It must
+        include a duration over a dimension coordinate whose values increase.
+
+    """
+
+    def __init__(
+        self,
+        ds: xr.Dataset,
+        ds_df_mapping: typing.Mapping[
+            typing.Hashable,
+            typing.Union[
+                typing.Tuple[typing.Hashable, typing.Hashable], typing.Hashable
+            ]
+        ],
+        window: int
+    ) -> None:
+        """Init for :class:`LiveEvents` given the first values of the stream.
+
+        Args:
+            :attr:`ds`: The :obj:`Dataset` whose values along :attr:`dim` are
+                the first ones of the stream. Every variable that depends on
+                :attr:`dim` is kept in a buffer, the rest are kept as they
+                are.
+            :attr:`ds_df_mapping`: See :attr:`ds_df_mapping`.
+            :attr:`window`: See :attr:`window`.
+
+        Raises:
+            ValueError: when :attr:`ds_df_mapping` includes no duration.
+
+        """
+        durations = [
+            (key, value)
+            for key, value in ds_df_mapping.items() if isinstance(value, tuple)
+        ]
+
+        if len(durations) != 1:
+            raise ValueError('Exactly one duration mapping must be given.')
+
+        self.window = window
+        self.ds_df_mapping = ds_df_mapping
+        self.dim, (self._start, self._end) = durations[0]
+
+        self._template = ds.isel({self.dim: slice(0, 0)})
+
+        capacity = 2 * window
+
+        self._buffers = {
+            name: np.empty(
+                (capacity,) + tuple(
+                    size for d, size in zip(variable.dims, variable.shape)
+                    if d != self.dim
+                ),
+                dtype=variable.dtype
+            )
+            for name, variable in ds.variables.items()
+            if self.dim in variable.dims
+        }
+
+        # Number of events covering each value.
+        self._coverage = np.zeros(capacity, dtype=np.intp)
+
+        self._begin = 0
+        self._stop = 0
+
+        self._n_uncovered = 0
+        self._n_overlapping_pairs = 0
+
+        # Endpoints of the events in the window, sorted on their own.
+        self._sorted_starts: typing.List[typing.Any] = list()
+        self._sorted_ends: typing.List[typing.Any] = list()
+
+        dim_dtype = ds[self.dim].dtype
+
+        self._df = pd.DataFrame(
+            {
+                self._start: np.empty(0, dtype=dim_dtype),
+                self._end: np.empty(0, dtype=dim_dtype)
+            }
+        )
+
+        self._dataset: typing.Optional[xr.Dataset] = None
+
+        self.push(ds.isel({self.dim: slice(-window, None)}))
+
+    def __len__(self) -> int:
+        """Get the number of values of the duration dimension in the window."""
+        return self._stop - self._begin
+
+    def __repr__(self) -> str:
+        """Represent the window."""
+        return (
+            f"{type(self).__name__} over {len(self)}/{self.window} values of "
+            f"{self.dim!r} with {len(self._df)} events."
+        )
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """Get the events within the window, sorted by their start."""
+        return self._df
+
+    @property
+    def _values(self) -> np.ndarray:
+        """Get the values of the duration dimension in the window."""
+        return self._buffers[self.dim][self._begin:self._stop]
+
+    @property
+    def dataset(self) -> xr.Dataset:
+        """Get the window as a :obj:`Dataset` with its events loaded.
+
+        Its variables share memory with the buffers, so they're only valid
+        until the next call to :meth:`push`. Copy it to keep it for longer.
+        The same :obj:`Dataset` is returned until then, so the indexes that
+        :class:`EventsAccessor` builds on it are reused.
+
+        """
+        if self._dataset is None:
+            variables = {
+                name: (
+                    variable.dims,
+                    np.moveaxis(
+                        self._buffers[name][self._begin:self._stop],
+                        0,
+                        variable.dims.index(self.dim)
+                    ),
+                    variable.attrs
+                )
+                if name in self._buffers else variable
+                for name, variable in self._template.variables.items()
+            }
+
+            self._dataset = (
+                xr.Dataset(
+                    data_vars={
+                        name: variables[name]
+                        for name in self._template.data_vars
+                    },
+                    coords={
+                        name: variables[name] for name in self._template.coords
+                    },
+                    attrs={
+                        k: v for k, v in self._template.attrs.items()
+                        if k not in ('_events', '_ds_df_mapping')
+                    }
+                )
+                .events.load(self._df, self.ds_df_mapping)
+            )
+
+        return self._dataset
+
+    def _positions(self, values: typing.Any) -> np.ndarray:
+        """Get the positions in the buffers of values in the window."""
+        return self._begin + np.searchsorted(self._values, values)
+
+    def _cover(self, start: typing.Any, end: typing.Any, step: int) -> None:
+        """Add (or remove) an event to the coverage of the values."""
+        if end < start:
+            return
+
+        low, high = self._positions([start, end])
+        low = max(low, self._begin)
+
+        coverage = self._coverage[low:(high + 1)]
+
+        if step > 0:
+            self._n_uncovered -= int(np.count_nonzero(coverage == 0))
+        coverage += step
+        if step < 0:
+            self._n_uncovered += int(np.count_nonzero(coverage == 0))
+
+    def _count_overlapping(self, start: typing.Any, end: typing.Any) -> int:
+        """Count the events in the window that overlap an event."""
+        # Same as the overlap of DurationIndex: one event overlaps another when
+        # its start minus the end of the other is less than 1.
+        return (
+            bisect.bisect_left(self._sorted_starts, end + 1) -
+            bisect.bisect_right(self._sorted_ends, start - 1)
+        )
+
+    def _track(self, start: typing.Any, end: typing.Any) -> None:
+        """Account for a new event in the window."""
+        self._n_overlapping_pairs += self._count_overlapping(start, end)
+
+        bisect.insort(self._sorted_starts, start)
+        bisect.insort(self._sorted_ends, end)
+
+        self._cover(start, end, 1)
+
+    def _untrack(self, start: typing.Any, end: typing.Any) -> None:
+        """Account for an event leaving the window."""
+        del self._sorted_starts[bisect.bisect_left(self._sorted_starts, start)]
+        del self._sorted_ends[bisect.bisect_left(self._sorted_ends, end)]
+
+        self._n_overlapping_pairs -= self._count_overlapping(start, end)
+
+        self._cover(start, end, -1)
+
+    def push(self, frames: xr.Dataset) -> None:
+        """Add values to the end of the duration dimension.
+
+        The values that fall out of the window are evicted, along with the
+        events that start before the window.
+
+        Args:
+            :attr:`frames`: A :obj:`Dataset` with the same variables as the
+                one given on init, holding no more than :attr:`window` new
+                values of :attr:`dim`.
+
+        Raises:
+            ValueError: when there are too many new values or they don't come
+                after those in the window.
+
+        """
+        new_values = frames[self.dim].values
+        n_new = len(new_values)
+
+        if n_new > self.window:
+            raise ValueError(
+                f"Can't push more than {self.window} values at once."
+            )
+
+        if not n_new:
+            return
+
+        if (
+            np.any(new_values[1:] <= new_values[:-1]) or
+            (len(self) and new_values[0] <= self._values[-1])
+        ):
+            raise ValueError(f"The values of {self.dim!r} must increase.")
+
+        self._dataset = None
+
+        n_dropped = max(len(self) + n_new - self.window, 0)
+
+        # Evict the events that start before the new window, while the values
+        # they cover are still in the buffers.
+        first_value = (
+            self._values[n_dropped] if n_dropped < len(self)
+            else new_values[n_dropped - len(self)]
+        )
+
+        n_evicted = int(
+            np.searchsorted(
+                self._df[self._start].to_numpy(), first_value, side='left'
+            )
+        )
+
+        for start, end in zip(
+            self._df[self._start].iloc[:n_evicted],
+            self._df[self._end].iloc[:n_evicted]
+        ):
+            self._untrack(start, end)
+
+        self._df = self._df.iloc[n_evicted:]
+
+        self._n_uncovered -= int(
+            np.count_nonzero(
+                self._coverage[self._begin:(self._begin + n_dropped)] == 0
+            )
+        )
+        self._begin += n_dropped
+
+        # Move the window back to the beginning of the buffers when the new
+        # values don't fit after it.
+        if self._stop + n_new > len(self._coverage):
+            n_kept = len(self)
+
+            for buffer in (*self._buffers.values(), self._coverage):
+                buffer[:n_kept] = buffer[self._begin:self._stop]
+
+            self._begin, self._stop = 0, n_kept
+
+        stop = self._stop + n_new
+
+        for name, buffer in self._buffers.items():
+            variable = frames.variables[name]
+            buffer[self._stop:stop] = np.moveaxis(
+                variable.values, variable.dims.index(self.dim), 0
+            )
+
+        self._coverage[self._stop:stop] = 0
+        self._n_uncovered += n_new
+        self._stop = stop
+
+    def add_events(self, new_events: pd.DataFrame) -> None:
+        """Add events within the window.
+
+        The events are validated and merged as :meth:`EventsAccessor.append`
+        does, which also labels them after the largest label in the window.
+
+        Args:
+            :attr:`new_events`: A :obj:`DataFrame` with the events to add, whose
+                duration must fall within the window.
+
+        Raises:
+            ValueError: when the events don't match :attr:`ds_df_mapping`.
+
+        """
+        # Appending to the events of the Dataset in place keeps it, and its
+        # indexes, valid.
+        self._df = self.dataset.events.append(new_events).events.df
+
+        for start, end in zip(new_events[self._start], new_events[self._end]):
+            self._track(start, end)
+
+    def df_contains_gaps(self) -> bool:
+        """Decide whether the events leave any value of the window uncovered."""
+        return self._n_uncovered > 0
+
+    def df_contains_overlapping_events(self) -> bool:
+        """Decide whether any two events in the window overlap."""
+        return self._n_overlapping_pairs > 0
+
+    def sel(self, *args: typing.Any, **kwargs: typing.Any) -> xr.Dataset:
+        """Select from the window, as :meth:`EventsAccessor.sel` does."""
+        return typing.cast(
+            xr.Dataset, self.dataset.copy().events.sel(*args, **kwargs)
+        )
+
+    def groupby_events(
+        self, *args: typing.Any, **kwargs: typing.Any
+    ) -> xr.core.groupby.DataArrayGroupBy:
+        """Group the window, as :meth:`EventsAccessor.groupby_events` does."""
+        return typing.cast(
+            xr.core.groupby.DataArrayGroupBy,
+            self.dataset.events.groupby_events(*args, **kwargs)
+        )
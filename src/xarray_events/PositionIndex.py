@@ -0,0 +1,126 @@
+"""Definition of the :class:`PositionIndex` class.
+
+Define the :class:`PositionIndex` class, which maps values of a :obj:`Dataset`
+dimension or coordinate to their integer positions along it.
+
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import typing
+
+
+class PositionIndex:
+    """Map values of a :obj:`Dataset` coordinate to their positions.
+
+    This index is built once from the values of a coordinate and maps any
+    number of them to integer positions in a single vectorized call. If the
+    values are sorted in increasing order, the lookup is a binary search.
+    Otherwise (e.g. the values aren't sortable at all) it's a hash map lookup.
+
+    Whenever a value appears more than once, its first position is the one
+    that's used, just like :meth:`list.index` would do.
+
+    Attributes:
+        :attr:`values`: The values of the coordinate.
+
+        :attr:`source`: The object the index was built from, used to decide
+        whether the index is still valid.
+
+    """
+
+    def __init__(
+        self, values: typing.Any, source: typing.Optional[typing.Any] = None
+    ) -> None:
+        """Init for :class:`PositionIndex` given the values of a coordinate."""
+        self.values = np.asarray(values)
+        self.source = source
+
+        self._is_monotonic = self._is_sortable_and_sorted(self.values)
+
+        # The hash map is only built when it's actually needed, which for
+        # sorted values happens when the targets aren't comparable to them.
+        self._uniques: typing.Optional[pd.Index] = None
+        self._first_positions = np.empty(0, dtype=np.intp)
+
+    @staticmethod
+    def _is_sortable_and_sorted(values: np.ndarray) -> bool:
+        # Object arrays may hold values that can't be compared to each other,
+        # so those always go through the hash map.
+        if values.dtype.kind not in 'biufmM' or values.ndim != 1:
+            return False
+
+        if len(values) < 2:
+            return True
+
+        return bool(np.all(values[1:] >= values[:-1]))
+
+    def __len__(self) -> int:
+        """Get the number of values of the coordinate."""
+        return len(self.values)
+
+    @property
+    def is_monotonic(self) -> bool:
+        """Decide whether the values are sorted in increasing order."""
+        return self._is_monotonic
+
+    def get_positions(self, targets: typing.Any) -> np.ndarray:
+        """Get the position of each one of :attr:`targets`.
+
+        Raises:
+            ValueError: when some target isn't a value of the coordinate.
+
+        """
+        if not isinstance(targets, np.ndarray):
+            targets = self._as_array(targets)
+
+        if self._is_monotonic and targets.dtype.kind in 'biufmM':
+            positions = np.searchsorted(self.values, targets, side='left')
+            found = positions < len(self.values)
+            found[found] = (
+                self.values[positions[found]] == targets[found]
+            )
+
+        else:
+            uniques = self._build_hash_map()
+
+            codes = uniques.get_indexer(targets.ravel()).reshape(targets.shape)
+            found = codes >= 0
+            positions = np.where(found, self._first_positions[codes], -1)
+
+        if not np.all(found):
+            missing = targets[~found].ravel()[:5]
+            raise ValueError(
+                f"{list(missing)} are not values of the coordinate."
+            )
+
+        return positions.astype(np.intp)
+
+    def _as_array(self, targets: typing.Iterable[typing.Any]) -> np.ndarray:
+        if self.values.dtype.kind != 'O':
+            return np.asarray(targets)
+
+        # Let numpy neither coerce mixed values into strings nor unpack tuples.
+        targets = list(targets)
+        array = np.empty(len(targets), dtype=object)
+
+        for i, target in enumerate(targets):
+            array[i] = target
+
+        return array
+
+    def _build_hash_map(self) -> pd.Index:
+        if self._uniques is None:
+            # Factorize the values so that each unique value knows its first
+            # position. Writing in reverse order means the first one wins.
+            codes, uniques = pd.factorize(self.values)
+
+            self._first_positions = np.empty(len(uniques), dtype=np.intp)
+            self._first_positions[codes[::-1]] = np.arange(
+                len(codes) - 1, -1, -1
+            )
+
+            self._uniques = pd.Index(uniques)
+
+        return self._uniques
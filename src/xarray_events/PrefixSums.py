@@ -0,0 +1,227 @@
+"""Definition of the :class:`PrefixSums` class.
+
+Define the :class:`PrefixSums` class, which holds the cumulative sums of a data
+variable along a dimension so that the sum, mean and variance of any stretch of
+it are two lookups away, and :class:`PrefixSumsCache`, where they're kept.
+
+"""
+from __future__ import annotations
+
+import numpy as np
+import typing
+import xarray as xr
+
+
+def _fingerprint(array: xr.DataArray) -> typing.Optional[typing.Tuple]:
+    """Identify the memory holding the values of an in-memory array."""
+    data = array.variable._data
+
+    if not isinstance(data, np.ndarray):
+        return None
+
+    return (
+        data.__array_interface__['data'][0],
+        data.shape,
+        data.strides,
+        data.dtype.str
+    )
+
+
+class PrefixSums:
+    """Cumulative sums of a data variable along a dimension.
+
+    The values are shifted by their mean before accumulating them, which keeps
+    the error of subtracting two large cumulative sums small. Missing values
+    (NaN) are skipped. Integer values are also accumulated as they are, so
+    that their sums are exact.
+
+    Attributes:
+        :attr:`dim`: The dimension along which the sums are accumulated.
+
+        :attr:`shift`: The mean of the values, subtracted from all of them.
+
+        :attr:`sums`: Cumulative sums of the shifted values, with a leading row
+        of zeros so that the sum of positions [start, end] is
+        ``sums[end + 1] - sums[start]``.
+
+        :attr:`squares`: Same as :attr:`sums` for the squared shifted values.
+
+        :attr:`counts`: Same as :attr:`sums` for the number of values that
+        aren't missing.
+
+        :attr:`integers`: Same as :attr:`sums` for the values as 64-bit
+        integers, if they're integers. Otherwise, None.
+
+    """
+
+    def __init__(self, array: xr.DataArray, dim: typing.Hashable) -> None:
+        """Init for :class:`PrefixSums` given the array to accumulate."""
+        self.dim = dim
+
+        # Keep the array alive so that its memory can't be reused by another
+        # one, which would fool the fingerprint.
+        self._array = array.variable
+        self._fingerprint = _fingerprint(array)
+
+        self._dtype = array.dtype
+
+        original = np.moveaxis(array.values, array.get_axis_num(dim), 0)
+        values = np.asarray(original, dtype=float)
+
+        valid = ~np.isnan(values)
+
+        with np.errstate(invalid='ignore'):
+            self.shift = (
+                np.nanmean(values, axis=0) if len(values)
+                else np.zeros(values.shape[1:])
+            )
+
+        shifted = np.where(valid, values - self.shift, 0)
+
+        self.sums = self._accumulate(shifted)
+        self.squares = self._accumulate(shifted ** 2)
+        self.counts = self._accumulate(valid.astype(np.intp))
+
+        self.integers: typing.Optional[np.ndarray] = None
+
+        if self._dtype.kind in 'iu':
+            self.integers = self._accumulate(
+                original.astype(np.dtype(self._dtype.kind + '8'))
+            )
+
+    @staticmethod
+    def _accumulate(values: np.ndarray) -> np.ndarray:
+        accumulated = np.zeros(
+            (len(values) + 1,) + values.shape[1:], dtype=values.dtype
+        )
+        np.cumsum(values, axis=0, out=accumulated[1:])
+
+        return accumulated
+
+    def matches(self, array: xr.DataArray, dim: typing.Hashable) -> bool:
+        """Decide whether the sums were accumulated from :attr:`array`.
+
+        Note: Writing into the values of the array in place isn't detected.
+
+        """
+        fingerprint = _fingerprint(array)
+
+        return (
+            fingerprint is not None and
+            fingerprint == self._fingerprint and
+            dim == self.dim
+        )
+
+    def _between(
+        self, accumulated: np.ndarray, starts: np.ndarray, ends: np.ndarray
+    ) -> np.ndarray:
+        return accumulated[ends + 1] - accumulated[starts]
+
+    def count(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Count the non-missing values of each stretch [start, end]."""
+        return self._between(self.counts, starts, ends)
+
+    def sum(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Sum the values of each stretch [start, end]."""
+        if self.integers is not None:
+            return self._between(self.integers, starts, ends).astype(
+                self._dtype
+            )
+
+        return (
+            self._between(self.sums, starts, ends) +
+            self.count(starts, ends) * self.shift
+        )
+
+    def mean(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Average the values of each stretch [start, end]."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (
+                self._between(self.sums, starts, ends) /
+                self.count(starts, ends) + self.shift
+            )
+
+    def var(
+        self, starts: np.ndarray, ends: np.ndarray, ddof: int = 0
+    ) -> np.ndarray:
+        """Get the variance of the values of each stretch [start, end]."""
+        count = self.count(starts, ends)
+        total = self._between(self.sums, starts, ends)
+        total_squares = self._between(self.squares, starts, ends)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = np.maximum(total_squares - total ** 2 / count, 0) / (
+                count - ddof
+            )
+
+        return np.where(count - ddof > 0, result, np.nan)
+
+
+class PrefixSumsCache(dict):
+    """The :class:`PrefixSums` of the data variables of a :obj:`Dataset`.
+
+    This cache lives in the attributes of the :obj:`Dataset`, so it's shared by
+    every :obj:`Dataset` derived from it (e.g. by :meth:`EventsAccessor.sel`).
+    Copying it, even deeply, returns the same cache: each entry knows which
+    values it was accumulated from, so there's no risk of mixing them up.
+
+    """
+
+    def __copy__(self) -> PrefixSumsCache:
+        """Share the cache instead of copying it."""
+        return self
+
+    def __deepcopy__(self, memo: typing.Dict) -> PrefixSumsCache:
+        """Share the cache instead of copying it."""
+        return self
+
+    def get_or_build(
+        self, name: typing.Hashable, array: xr.DataArray, dim: typing.Hashable
+    ) -> typing.Optional[PrefixSums]:
+        """Get the sums of the data variable :attr:`name` if it's cached.
+
+        If the values of the data variable have changed since the sums were
+        accumulated (e.g. in a :obj:`Dataset` derived from the one they were
+        accumulated from), accumulate them again without caching them, so that
+        the cached ones are still there for the original values.
+
+        """
+        if name not in self:
+            return None
+
+        prefix_sums: typing.Optional[PrefixSums] = self[name]
+
+        if prefix_sums is not None and prefix_sums.matches(array, dim):
+            return prefix_sums
+
+        if _fingerprint(array) is None:
+            return None
+
+        if prefix_sums is None:
+            return self.build(name, array, dim)
+
+        return PrefixSums(array, dim)
+
+    def build(
+        self, name: typing.Hashable, array: xr.DataArray, dim: typing.Hashable
+    ) -> typing.Optional[PrefixSums]:
+        """Cache the sums of the data variable :attr:`name`.
+
+        The sums are only accumulated if they aren't cached yet for the same
+        values. Until the values are in memory, :attr:`name` is only marked to
+        be cached.
+
+        """
+        prefix_sums: typing.Optional[PrefixSums] = self.get(name)
+
+        if prefix_sums is not None and prefix_sums.matches(array, dim):
+            return prefix_sums
+
+        if _fingerprint(array) is None:
+            self.setdefault(name, None)
+
+            return None
+
+        prefix_sums = self[name] = PrefixSums(array, dim)
+
+        return prefix_sums
@@ -1 +1,8 @@
 from xarray_events.EventsAccessor import EventsAccessor
+from xarray_events.EventGroupBy import EventGroupBy
+from xarray_events.EventsPlan import EventsPlan
+from xarray_events.EventCatalog import EventCatalog
+from xarray_events.batch import batch
+from xarray_events.LiveEvents import LiveEvents
+from xarray_events.serialization import open_dataset
+from xarray_events.serialization import open_zarr
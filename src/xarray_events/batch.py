@@ -0,0 +1,240 @@
+"""Definition of the :func:`batch` function.
+
+Define the :func:`batch` function, which runs the same pipeline of events over
+many :obj:`Dataset` objects on a pool of processes.
+
+"""
+from __future__ import annotations
+import collections.abc
+import concurrent.futures
+import multiprocessing
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+import typing
+import xarray as xr
+
+# What forked workers inherit from the process that runs batch, by call.
+_inherited: typing.Dict[int, typing.Tuple[typing.Any, ...]] = dict()
+
+
+def _run_pipeline(
+    pipeline: collections.abc.Callable[[xr.Dataset], typing.Any],
+    dataset: typing.Union[xr.Dataset, str, os.PathLike],
+    open_dataset: collections.abc.Callable[..., xr.Dataset]
+) -> typing.Any:
+    """Run :attr:`pipeline` over a :obj:`Dataset` or the one at a path."""
+    if isinstance(dataset, xr.Dataset):
+        return pipeline(dataset)
+
+    # The result is sent back to the parent process once the file is closed,
+    # so it must not depend on it.
+    with open_dataset(dataset) as opened:
+        result = pipeline(opened)
+
+        if isinstance(result, (xr.Dataset, xr.DataArray)):
+            result = result.load()
+
+    return result
+
+
+def _run_inherited(call: int, position: int) -> typing.Any:
+    """Run the pipeline of a call over a :obj:`Dataset` it was given."""
+    pipeline, datasets, open_dataset = _inherited[call]
+
+    return _run_pipeline(pipeline, datasets[position], open_dataset)
+
+
+def _collect(
+    futures: typing.Mapping[int, concurrent.futures.Future],
+    results: typing.Dict[int, typing.Any],
+    errors: typing.Dict[int, BaseException],
+    retry: bool = True
+) -> typing.List[int]:
+    """Wait for the pipeline to run over each :obj:`Dataset`, by position.
+
+    The results go to :attr:`results` and the exceptions to :attr:`errors`,
+    except for those of a broken pool if :attr:`retry`, since they don't tell
+    which worker died.
+
+    Returns:
+        The positions to run again, in order.
+
+    """
+    unfinished = list()
+
+    for position, future in futures.items():
+        try:
+            results[position] = future.result()
+        except BrokenProcessPool as error:
+            if retry:
+                unfinished.append(position)
+            else:
+                errors[position] = error
+        except Exception as error:
+            errors[position] = error
+
+    return unfinished
+
+
+def _concat(
+    keys: typing.List[typing.Hashable],
+    results: typing.List[typing.Any],
+    dim: typing.Hashable
+) -> typing.Any:
+    """Put the results of the pipeline together along :attr:`dim`."""
+    if not results:
+        return None
+
+    def all_of(types: typing.Tuple[type, ...]) -> bool:
+        return all(isinstance(result, types) for result in results)
+
+    if all_of((xr.Dataset, xr.DataArray)):
+        return xr.concat(results, dim=pd.Index(keys, name=dim))
+
+    if all_of((pd.DataFrame, pd.Series)):
+        return pd.concat(results, keys=keys, names=[dim])
+
+    return dict(zip(keys, results))
+
+
+def batch(
+    datasets: typing.Union[
+        typing.Mapping[
+            typing.Hashable, typing.Union[xr.Dataset, str, os.PathLike]
+        ],
+        typing.Sequence[typing.Union[xr.Dataset, str, os.PathLike]]
+    ],
+    pipeline: collections.abc.Callable[[xr.Dataset], typing.Any],
+    n_workers: typing.Optional[int] = None,
+    dim: typing.Hashable = 'dataset',
+    open_dataset: collections.abc.Callable[..., xr.Dataset] = xr.open_dataset
+) -> typing.Tuple[typing.Any, typing.Dict[typing.Hashable, BaseException]]:
+    """Run the same pipeline over many :obj:`Dataset` objects in parallel.
+
+    This function calls :attr:`pipeline` (e.g. a function that calls
+    :meth:`EventsAccessor.load`, :meth:`EventsAccessor.sel` and some reduction
+    of :meth:`EventsAccessor.event_groupby`) once per :obj:`Dataset` on a pool
+    of :attr:`n_workers` processes.
+
+    The :obj:`Dataset` objects can be given as paths, in which case each
+    worker opens its own with :attr:`open_dataset` and nothing but the path is
+    sent to it. Otherwise, where processes are forked, the workers inherit
+    the :obj:`Dataset` objects (and :attr:`pipeline`) from the calling process
+    instead of receiving a copy of their arrays. Elsewhere, they're pickled.
+
+    A failure of :attr:`pipeline` over one :obj:`Dataset` doesn't abort the
+    others: it's reported along with the results. That includes a worker
+    dying, which breaks the whole pool: the :obj:`Dataset` objects that
+    weren't done are run again, each in a process of its own, so that only
+    the one whose worker died fails.
+
+    Args:
+        :attr:`datasets`: The :obj:`Dataset` objects or paths to them, either
+            in a mapping whose keys identify them or in a sequence, in which
+            case they're identified by their position.
+        :attr:`pipeline`: Function taking a :obj:`Dataset` and returning its
+            result, which must be picklable.
+        :attr:`n_workers`: Number of processes. By default, as many as CPUs.
+        :attr:`dim`: Name of the dimension (or index level) along which the
+            results are concatenated.
+        :attr:`open_dataset`: Function to open the :obj:`Dataset` at a path.
+
+    Returns:
+        A tuple with the results and the failures. If every result is a
+        :obj:`Dataset` or :obj:`DataArray`, the results are concatenated along
+        a new dimension :attr:`dim` whose coordinates are the keys. If every
+        result is a :obj:`DataFrame` or :obj:`Series`, they're concatenated
+        along a new outer index level named :attr:`dim`. Otherwise, they're a
+        dictionary of results by key. The failures are a dictionary of the
+        exception raised by key, e.g. a :obj:`BrokenProcessPool` if a worker
+        died.
+
+    """
+    if isinstance(datasets, collections.abc.Mapping):
+        keys = list(datasets.keys())
+        sources = list(datasets.values())
+    else:
+        sources = list(datasets)
+        keys = list(range(len(sources)))
+
+    context = multiprocessing.get_context()
+    is_forked = context.get_start_method() == 'fork'
+
+    call = id(sources)
+
+    if is_forked:
+        _inherited[call] = (pipeline, sources, open_dataset)
+
+    def submit(
+        executor: concurrent.futures.Executor, position: int
+    ) -> concurrent.futures.Future:
+        try:
+            if is_forked:
+                return executor.submit(_run_inherited, call, position)
+
+            return executor.submit(
+                _run_pipeline, pipeline, sources[position], open_dataset
+            )
+        except BrokenProcessPool as error:
+            # A worker died before this one could even be submitted.
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            future.set_exception(error)
+
+            return future
+
+    results: typing.Dict[int, typing.Any] = dict()
+    errors: typing.Dict[int, BaseException] = dict()
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            n_workers, mp_context=context
+        ) as executor:
+            unfinished = _collect(
+                {
+                    position: submit(executor, position)
+                    for position in range(len(sources))
+                },
+                results,
+                errors
+            )
+
+        # Each one runs in a pool of its own, so a worker that dies only
+        # breaks its own pool.
+        n_isolated = n_workers or os.cpu_count() or 1
+
+        for low in range(0, len(unfinished), n_isolated):
+            positions = unfinished[low:low + n_isolated]
+            executors = [
+                concurrent.futures.ProcessPoolExecutor(1, mp_context=context)
+                for _ in positions
+            ]
+
+            try:
+                _collect(
+                    {
+                        position: submit(executor, position)
+                        for executor, position in zip(executors, positions)
+                    },
+                    results,
+                    errors,
+                    retry=False
+                )
+            finally:
+                for executor in executors:
+                    executor.shutdown()
+
+    finally:
+        _inherited.pop(call, None)
+
+    succeeded = sorted(results)
+
+    return (
+        _concat(
+            [keys[position] for position in succeeded],
+            [results[position] for position in succeeded],
+            dim
+        ),
+        {keys[position]: errors[position] for position in sorted(errors)}
+    )
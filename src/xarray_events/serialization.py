@@ -0,0 +1,205 @@
+"""Definition of the functions that write and read events along with data.
+
+Define :func:`events_as_variables`, which turns the events of a
+:obj:`Dataset` into variables along an ``event`` dimension so that they can be
+written to netCDF or Zarr with it, and :func:`open_dataset` and
+:func:`open_zarr`, which open such a :obj:`Dataset` with its events loaded.
+
+"""
+from __future__ import annotations
+import collections.abc as collections
+import functools
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import typing
+import xarray as xr
+
+from xarray_events.EventsStore import EventsStore
+
+# The dimension of the variables holding the events.
+EVENT_DIM = 'event'
+
+# The attribute describing how to read the events back from the variables.
+SCHEMA_ATTR = '_events_schema'
+
+
+def events_as_variables(
+    ds: xr.Dataset,
+    df: pd.DataFrame,
+    ds_df_mapping: typing.Optional[
+        typing.Mapping[
+            typing.Hashable,
+            typing.Union[
+                typing.Tuple[typing.Hashable, typing.Hashable],
+                typing.Hashable
+            ]
+        ]
+    ]
+) -> xr.Dataset:
+    """Get a :obj:`Dataset` with its events as variables.
+
+    Each column of the events :obj:`DataFrame` becomes a variable along
+    :data:`EVENT_DIM`, named after it with the dimension as a prefix (e.g.
+    ``event_start_frame``), and the labels of the events become its
+    coordinate. The columns and :attr:`ds_df_mapping` are described by a JSON
+    attribute, so the names in them must be valid JSON.
+
+    Raises:
+        ValueError: when the :obj:`Dataset` already has the dimension or any
+            of the variables.
+
+    """
+    columns = [
+        (
+            column,
+            f'{EVENT_DIM}_{column}',
+            pd.api.types.is_categorical_dtype(df[column])
+        )
+        for column in df.columns
+    ]
+
+    names = {EVENT_DIM} | {variable for _, variable, _ in columns}
+    clashing = names & (set(ds.variables) | set(ds.dims))
+
+    if clashing:
+        raise ValueError(
+            f"Can't write the events as variables. The Dataset already has "
+            f"{clashing}."
+        )
+
+    # JSON turns tuples into lists, so whether each value was a tuple (i.e.
+    # a duration) is written along with it.
+    schema = {
+        'columns': columns,
+        'index': df.index.name,
+        'ds_df_mapping': (
+            None if ds_df_mapping is None else [
+                (key, value, isinstance(value, tuple))
+                for key, value in ds_df_mapping.items()
+            ]
+        )
+    }
+
+    result: xr.Dataset = ds.assign(
+        {
+            variable: (EVENT_DIM, np.asarray(df[column]))
+            for column, variable, _ in columns
+        }
+    ).assign_coords({EVENT_DIM: df.index.to_numpy()})
+
+    # The events and the caches can't be written as attributes.
+    result.attrs = {
+        **{
+            k: v for k, v in ds.attrs.items()
+            if k not in ('_events', '_ds_df_mapping', '_prefix_sums')
+        },
+        SCHEMA_ATTR: json.dumps(schema)
+    }
+
+    return result
+
+
+def _read_events(
+    events: xr.Dataset, schema: typing.Mapping[str, typing.Any]
+) -> pd.DataFrame:
+    """Read the events :obj:`DataFrame` from the variables holding it."""
+    df = pd.DataFrame(
+        {
+            column: events[variable].values
+            for column, variable, _ in schema['columns']
+        },
+        index=pd.Index(events[EVENT_DIM].values, name=schema['index'])
+    )
+
+    return df.astype(
+        {
+            column: 'category'
+            for column, _, categorical in schema['columns'] if categorical
+        }
+    )
+
+
+def events_from_variables(ds: xr.Dataset) -> xr.Dataset:
+    """Load the events of a :obj:`Dataset` from its variables.
+
+    This is the inverse of :func:`events_as_variables`. The variables holding
+    the events are dropped and the events are only read the first time
+    they're needed. A :obj:`Dataset` with no such variables is returned as it
+    is.
+
+    """
+    if SCHEMA_ATTR not in ds.attrs:
+        return ds
+
+    schema = json.loads(ds.attrs[SCHEMA_ATTR])
+
+    events = ds.drop_vars(
+        [
+            name for name, variable in ds.variables.items()
+            if EVENT_DIM not in variable.dims
+        ]
+    )
+
+    mapping = schema['ds_df_mapping']
+
+    if mapping is not None:
+        mapping = {
+            key: tuple(value) if is_tuple else value
+            for key, value, is_tuple in mapping
+        }
+
+    result = ds.drop_dims(EVENT_DIM)
+
+    result.attrs = {
+        k: v for k, v in ds.attrs.items() if k != SCHEMA_ATTR
+    }
+    result.attrs['_events'] = EventsStore(
+        ds_df_mapping=mapping,
+        read_df=functools.partial(_read_events, events, schema)
+    )
+
+    return result
+
+
+def open_dataset(
+    filename_or_obj: typing.Any, **kwargs: typing.Any
+) -> xr.Dataset:
+    """Open a :obj:`Dataset` written by :meth:`EventsAccessor.to_netcdf`.
+
+    The :obj:`Dataset` is opened by :func:`xr.open_dataset`, so its variables
+    are read lazily. So are its events: they're read from the file the first
+    time they're needed, e.g. by :meth:`EventsAccessor.sel`.
+
+    Args:
+        :attr:`filename_or_obj`: The file, as for :func:`xr.open_dataset`.
+        :attr:`kwargs`: Further arguments for :func:`xr.open_dataset`.
+
+    Returns:
+        The :obj:`Dataset` with its events and :attr:`ds_df_mapping` loaded.
+
+    """
+    return events_from_variables(xr.open_dataset(filename_or_obj, **kwargs))
+
+
+def open_zarr(
+    store: typing.Union[str, os.PathLike, collections.MutableMapping],
+    **kwargs: typing.Any
+) -> xr.Dataset:
+    """Open a :obj:`Dataset` written by :meth:`EventsAccessor.to_zarr`.
+
+    The :obj:`Dataset` is opened by :func:`xr.open_zarr`, so its variables
+    are read lazily. So are its events: they're read from the store the first
+    time they're needed, e.g. by :meth:`EventsAccessor.sel`.
+
+    Args:
+        :attr:`store`: The store, as for :func:`xr.open_zarr`.
+        :attr:`kwargs`: Further arguments for :func:`xr.open_zarr`.
+
+    Returns:
+        The :obj:`Dataset` with its events and :attr:`ds_df_mapping` loaded.
+
+    """
+    return events_from_variables(xr.open_zarr(store, **kwargs))
@@ -0,0 +1,214 @@
+"""Unit tests for :meth:`append`.
+
+Usage: Assuming the current directory is the top one,
+
+    $ pytest -q tests -ra
+
+    will run all tests and provide a short summary that ignores passed ones and
+    any captured console output.
+
+    To run this specific test file, simply do
+
+    $ pytest -q tests/append_test.py -ra
+
+    instead.
+
+"""
+import numpy as np
+
+import pandas as pd
+
+import pytest
+
+import xarray as xr
+
+import xarray_events
+
+
+def test_append() -> None:
+    """Append events to events sorted by start.
+
+    Ensure that the new events are labeled after the existing ones, merged in
+    sorted order, and that the interval index is updated instead of rebuilt.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass'],
+            'start_frame': [1, 75, 175],
+            'end_frame': [74, 174, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds = ds.events.load(events, {'frame': ('start_frame', 'end_frame')})
+
+    # Build the interval index before appending.
+    assert not ds.events.df_contains_overlapping_events()
+
+    new_events = pd.DataFrame(
+        {
+            'event_type': ['shot', 'pass'],
+            'start_frame': [180, 75],
+            'end_frame': [181, 80]
+        },
+        index=[10, 11]
+    )
+
+    ds = ds.events.append(new_events)
+
+    pd.testing.assert_frame_equal(
+        ds.events.df,
+        pd.DataFrame(
+            {
+                'event_type': ['pass', 'goal', 'pass', 'pass', 'shot'],
+                'start_frame': [1, 75, 75, 175, 180],
+                'end_frame': [74, 174, 80, 250, 181]
+            },
+            index=[0, 1, 4, 2, 3]
+        )
+    )
+
+    index = ds.attrs['_events'].derived['duration_index']
+
+    assert index.is_built_from(ds.events.df, 'start_frame', 'end_frame')
+    assert ds.events.duration_index is index
+    assert ds.events.df_contains_overlapping_events()
+
+    np.testing.assert_array_equal(
+        ds.events.overlapping_pairs(), [[1, 4], [2, 3]]
+    )
+
+
+def test_append_unsorted() -> None:
+    """Append events to events that aren't sorted by start."""
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass'],
+            'start_frame': [1, 75, 175],
+            'end_frame': [74, 174, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds = ds.events.load(events, {'frame': ('start_frame', 'end_frame')})
+    ds.events.df.index = pd.Index(['a', 'b', 'c'], name='event_id')
+    ds.events.df.sort_values('event_type', inplace=True)
+
+    ds = ds.events.append(
+        pd.DataFrame(
+            {'event_type': ['shot'], 'start_frame': [10], 'end_frame': [12]},
+            index=pd.Index(['d'], name='event_id')
+        )
+    )
+
+    assert list(ds.events.df.index) == ['b', 'a', 'c', 'd']
+
+    with pytest.raises(ValueError):
+        ds.events.append(
+            pd.DataFrame(
+                {'event_type': ['shot'], 'start_frame': [5], 'end_frame': [6]},
+                index=pd.Index(['a'], name='event_id')
+            )
+        )
+
+
+def test_append_without_mapping() -> None:
+    """Append events to events loaded without a mapping."""
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass'],
+            'start_frame': [1, 75, 175],
+            'end_frame': [74, 174, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds = ds.events.load(events)
+
+    ds = ds.events.append(
+        pd.DataFrame(
+            {'event_type': ['shot'], 'start_frame': [10], 'end_frame': [12]},
+            index=[3]
+        )
+    )
+
+    assert list(ds.events.df.index) == [0, 1, 2, 3]
+    assert list(ds.events.df['event_type']) == ['pass', 'goal', 'pass', 'shot']
+
+
+def test_append_invalid() -> None:
+    """Append events that don't match the mapping.
+
+    When a mapped column is missing or its values aren't values of the Dataset
+    coordinate, ensure that a ValueError is raised and nothing is appended.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass'],
+            'start_frame': [1, 75, 175],
+            'end_frame': [74, 174, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds = ds.events.load(events, {'frame': ('start_frame', 'end_frame')})
+
+    with pytest.raises(ValueError):
+        ds.events.append(
+            pd.DataFrame({'event_type': ['shot'], 'start_frame': [10]})
+        )
+
+    with pytest.raises(ValueError):
+        ds.events.append(
+            pd.DataFrame(
+                {
+                    'event_type': ['shot'],
+                    'start_frame': [10],
+                    'end_frame': [251]
+                }
+            )
+        )
+
+    assert len(ds.events.df) == 3
@@ -0,0 +1,193 @@
+"""Unit tests for :func:`batch`.
+
+Usage: Assuming the current directory is the top one,
+
+    $ pytest -q tests -ra
+
+    will run all tests and provide a short summary that ignores passed ones and
+    any captured console output.
+
+    To run this specific test file, simply do
+
+    $ pytest -q tests/batch_test.py -ra
+
+    instead.
+
+"""
+import multiprocessing
+import os
+import pathlib
+import typing
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+import pandas as pd
+
+import pytest
+
+import xarray as xr
+from xarray.testing import assert_identical
+
+import xarray_events
+
+
+# The pipelines are given to the workers, so they must be picklable.
+def _pipeline(ds: xr.Dataset) -> xr.DataArray:
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass'],
+            'start_frame': [1, 75, 100],
+            'end_frame': [74, 99, 250]
+        }
+    )
+
+    result: xr.DataArray = (
+        ds
+        .events.load(events, {'frame': ('start_frame', 'end_frame')})
+        .events.sel(event_type='pass')
+        .events.event_groupby('ball_trajectory')
+        .mean()
+    )
+
+    return result
+
+
+def _dying_pipeline(ds: xr.Dataset) -> xr.DataArray:
+    if ds.attrs['match_id'] == 2:
+        os._exit(1)
+
+    return _pipeline(ds)
+
+
+def test_batch(tmp_path: pathlib.Path) -> None:
+    """Run a pipeline over Datasets in memory and on disk.
+
+    Ensure that the results are concatenated in order and that a failing
+    Dataset is reported without aborting the others.
+
+    """
+    pytest.importorskip('scipy')
+
+    matches = [
+        xr.Dataset(
+            data_vars={
+                'ball_trajectory': (
+                    ['frame', 'cartesian_coords'],
+                    np.exp(np.linspace((-6, -8), (3, 2), 250)) * match_id
+                )
+            },
+            coords={
+                'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']
+            },
+            attrs={'match_id': match_id, 'resolution_fps': 25}
+        )
+        for match_id in range(1, 4)
+    ]
+
+    path = tmp_path / 'match_3.nc'
+    matches[2].to_netcdf(path, engine='scipy')
+
+    datasets: typing.Dict[typing.Hashable, typing.Union[xr.Dataset, str]] = {
+        'match_1': matches[0],
+        'broken': matches[1].drop_vars('ball_trajectory'),
+        'match_3': str(path)
+    }
+
+    results, failures = xarray_events.batch(
+        datasets, _pipeline, n_workers=2, dim='match'
+    )
+
+    assert list(failures) == ['broken']
+    assert isinstance(failures['broken'], KeyError)
+
+    assert_identical(
+        results,
+        xr.concat(
+            [_pipeline(matches[0]), _pipeline(matches[2])],
+            dim=pd.Index(['match_1', 'match_3'], name='match')
+        )
+    )
+
+
+def test_batch_data_frames() -> None:
+    """Run a pipeline returning DataFrames over a sequence of Datasets."""
+    # Functions defined locally can only reach the workers when they're
+    # forked, since otherwise they must be pickled.
+    if multiprocessing.get_start_method() != 'fork':
+        pytest.skip('processes are not forked')
+
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass'],
+            'start_frame': [1, 75, 100],
+            'end_frame': [74, 99, 250]
+        }
+    )
+
+    matches = [
+        xr.Dataset(
+            data_vars={
+                'ball_trajectory': (
+                    ['frame', 'cartesian_coords'],
+                    np.exp(np.linspace((-6, -8), (3, 2), 250)) * match_id
+                )
+            },
+            coords={
+                'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']
+            },
+            attrs={'match_id': match_id, 'resolution_fps': 25}
+        )
+        for match_id in range(1, 3)
+    ]
+
+    def pipeline(ds: xr.Dataset) -> pd.DataFrame:
+        return ds.events.load(events).events.sel(event_type='goal').events.df
+
+    results, failures = xarray_events.batch(matches, pipeline)
+
+    assert failures == {}
+
+    pd.testing.assert_frame_equal(
+        results,
+        pd.concat([events.iloc[[1]]] * 2, keys=[0, 1], names=['dataset'])
+    )
+
+
+def test_batch_dead_worker() -> None:
+    """Run a pipeline whose worker dies over one of the Datasets.
+
+    Ensure that only that Dataset fails, even though the death of the worker
+    breaks the pool that the others were running on.
+
+    """
+    matches = [
+        xr.Dataset(
+            data_vars={
+                'ball_trajectory': (
+                    ['frame', 'cartesian_coords'],
+                    np.exp(np.linspace((-6, -8), (3, 2), 250)) * match_id
+                )
+            },
+            coords={
+                'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']
+            },
+            attrs={'match_id': match_id, 'resolution_fps': 25}
+        )
+        for match_id in range(1, 5)
+    ]
+
+    results, failures = xarray_events.batch(
+        matches, _dying_pipeline, n_workers=2
+    )
+
+    assert list(failures) == [1]
+    assert isinstance(failures[1], BrokenProcessPool)
+
+    assert_identical(
+        results,
+        xr.concat(
+            [_pipeline(matches[position]) for position in (0, 2, 3)],
+            dim=pd.Index([0, 2, 3], name='dataset')
+        )
+    )
@@ -0,0 +1,158 @@
+"""Unit tests for Datasets backed by dask.
+
+Usage: Assuming the current directory is the top one,
+
+    $ pytest -q tests -ra
+
+    will run all tests and provide a short summary that ignores passed ones and
+    any captured console output.
+
+    To run this specific test file, simply do
+
+    $ pytest -q tests/dask_test.py -ra
+
+    instead.
+
+"""
+import numpy as np
+
+import pandas as pd
+
+import pytest
+
+import xarray as xr
+from xarray.testing import assert_allclose
+from xarray.testing import assert_identical
+
+import xarray_events
+
+pytest.importorskip('dask')
+
+
+def test_event_groupby_dask() -> None:
+    """Reduce a data variable backed by dask.
+
+    When the events cross chunk boundaries, overlap, span nothing or only
+    missing values, ensure that the reductions are lazy and match those of the
+    values in memory.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass', 'pass', 'pass'],
+            'start_frame': [1, 75, 100, 240, 130],
+            'end_frame': [200, 250, 99, 245, 133]
+        }
+    )
+
+    ball_trajectory = np.exp(np.linspace((-6, -8), (3, 2), 250)).T
+    ball_trajectory[[0, 1], [3, 80]] = np.nan
+    ball_trajectory[0, 130:134] = np.nan
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (['cartesian_coords', 'frame'], ball_trajectory)
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    ds = ds.events.load(events, ds_df_mapping)
+
+    chunked = ds.chunk({'frame': 30, 'cartesian_coords': 1})  # type: ignore
+
+    groups = chunked.events.event_groupby('ball_trajectory')
+    expected = ds.events.event_groupby('ball_trajectory')
+
+    for reduction in ['sum', 'mean', 'min', 'max', 'count', 'std', 'var']:
+        result = getattr(groups, reduction)()
+        expected_result = getattr(expected, reduction)()
+
+        assert result.chunks is not None
+        assert result.dtype == expected_result.dtype
+        assert_allclose(result.compute(), expected_result)
+
+    assert_allclose(groups.var(ddof=1), expected.var(ddof=1))
+
+
+def test_expand_to_match_ds_dask() -> None:
+    """Expand a column to match a Dataset backed by dask.
+
+    Ensure that the result is chunked like the Dataset.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass', 'pass', 'pass'],
+            'start_frame': [1, 75, 100, 240, 130],
+            'end_frame': [200, 250, 99, 245, 133]
+        }
+    )
+
+    ball_trajectory = np.exp(np.linspace((-6, -8), (3, 2), 250)).T
+    ball_trajectory[[0, 1], [3, 80]] = np.nan
+    ball_trajectory[0, 130:134] = np.nan
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (['cartesian_coords', 'frame'], ball_trajectory)
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    ds = ds.events.load(events, ds_df_mapping)
+
+    chunked = ds.chunk({'frame': 30})  # type: ignore
+
+    result = chunked.events.expand_to_match_ds('start_frame', 'ffill')
+
+    assert result.chunks == ((30,) * 8 + (10,),)
+    assert_identical(
+        result.compute(), ds.events.expand_to_match_ds('start_frame', 'ffill')
+    )
+
+
+def test_groupby_events_dask() -> None:
+    """Group a data variable backed by dask.
+
+    Ensure that the reductions are lazy and match those of the values in
+    memory.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass', 'pass', 'pass'],
+            'start_frame': [1, 75, 100, 240, 130],
+            'end_frame': [200, 250, 99, 245, 133]
+        }
+    )
+
+    ball_trajectory = np.exp(np.linspace((-6, -8), (3, 2), 250)).T
+    ball_trajectory[[0, 1], [3, 80]] = np.nan
+    ball_trajectory[0, 130:134] = np.nan
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (['cartesian_coords', 'frame'], ball_trajectory)
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    ds = ds.events.load(events, ds_df_mapping)
+
+    chunked = ds.chunk({'frame': 30})  # type: ignore
+
+    result = chunked.events.groupby_events('ball_trajectory').mean()
+
+    assert result.chunks is not None
+    assert_allclose(
+        result.compute(), ds.events.groupby_events('ball_trajectory').mean()
+    )
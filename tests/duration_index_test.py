@@ -0,0 +1,139 @@
+"""Unit tests for :class:`DurationIndex`.
+
+Usage: Assuming the current directory is the top one,
+
+    $ pytest -q tests -ra
+
+    will run all tests and provide a short summary that ignores passed ones and
+    any captured console output.
+
+    To run this specific test file, simply do
+
+    $ pytest -q tests/duration_index_test.py -ra
+
+    instead.
+
+"""
+import numpy as np
+from numpy.testing import assert_array_equal
+
+import pandas as pd
+
+from xarray_events.DurationIndex import DurationIndex
+
+
+def test_stab() -> None:
+    """Find the events covering a single value."""
+    index = DurationIndex([50, 0, 10, 60], [70, 100, 20, 65])
+
+    assert_array_equal(index.stab(15), [1, 2])
+    assert_array_equal(index.stab(62), [0, 1, 3])
+    assert_array_equal(index.stab(101), [])
+    assert_array_equal(index.stab(-1), [])
+
+
+def test_overlapping() -> None:
+    """Find the events intersecting a range of values."""
+    index = DurationIndex([50, 0, 10, 60], [70, 100, 20, 65])
+
+    assert_array_equal(index.overlapping(21, 49), [1])
+    assert_array_equal(index.overlapping(66, 200), [0, 1])
+
+
+def test_count() -> None:
+    """Count the events covering many values at once."""
+    index = DurationIndex([50, 0, 10, 60], [70, 100, 20, 65])
+
+    assert_array_equal(
+        index.count(np.array([-5, 0, 15, 30, 62, 70, 100, 101])),
+        [0, 1, 2, 1, 3, 2, 1, 0]
+    )
+
+
+def test_is_built_from() -> None:
+    """Check that the index remembers the columns it was built from."""
+    events = pd.DataFrame({'start_frame': [1, 5], 'end_frame': [4, 9]})
+
+    index = DurationIndex.from_df(events, 'start_frame', 'end_frame')
+
+    assert index.is_built_from(events, 'start_frame', 'end_frame')
+    assert not index.is_built_from(events.copy(), 'start_frame', 'end_frame')
+    assert not index.is_built_from(events, 'end_frame', 'start_frame')
+
+
+def test_overlapping_pairs() -> None:
+    """Find every pair of overlapping events."""
+    index = DurationIndex([50, 0, 10, 60, 200], [70, 100, 20, 65, 210])
+
+    assert_array_equal(
+        index.overlapping_pairs(),
+        [[0, 1], [0, 3], [1, 2], [1, 3]]
+    )
+
+
+def test_overlapping_pairs_random() -> None:
+    """Compare the pairs of overlapping events with a brute-force search."""
+    rng = np.random.default_rng(0)
+
+    starts = rng.integers(0, 1000, 300)
+    ends = starts + rng.integers(0, 30, 300)
+
+    expected = [
+        [i, j]
+        for i in range(300)
+        for j in range(i + 1, 300)
+        if (
+            (starts[j] - ends[i] < 1) if starts[i] <= starts[j]
+            else (starts[i] - ends[j] < 1)
+        )
+    ]
+
+    assert_array_equal(
+        DurationIndex(starts, ends).overlapping_pairs(), expected
+    )
+
+
+def test_overlap_groups() -> None:
+    """Label the groups of overlapping events."""
+    index = DurationIndex([50, 0, 10, 101, 200], [70, 100, 20, 150, 210])
+
+    assert_array_equal(index.overlap_groups(), [0, 0, 0, 1, 2])
+
+
+def test_insert_random() -> None:
+    """Insert events and compare with an index built from scratch."""
+    rng = np.random.default_rng(7)
+
+    starts = np.sort(rng.integers(0, 200, 300))
+    ends = starts + rng.integers(-1, 30, 300)
+
+    index = DurationIndex(starts[:250], ends[:250])
+
+    # Insert the new events after those that start at the same value.
+    positions = np.searchsorted(starts[:250], starts[250:], side='right')
+    inserted = index.insert(positions, starts[250:], ends[250:])
+
+    expected = DurationIndex(
+        np.insert(starts[:250], positions, starts[250:]),
+        np.insert(ends[:250], positions, ends[250:])
+    )
+
+    for attribute in [
+        'starts', 'ends', 'order', 'sorted_starts', 'sorted_ends', 'max_ends',
+        '_ends_ascending'
+    ]:
+        assert_array_equal(
+            getattr(inserted, attribute), getattr(expected, attribute)
+        )
+
+    # Events appended at the end may start anywhere.
+    appended = index.insert(np.full(3, 250), [5, 300, 0], [10, 301, 400])
+
+    assert_array_equal(
+        appended.order,
+        DurationIndex(
+            np.append(starts[:250], [5, 300, 0]),
+            np.append(ends[:250], [10, 301, 400])
+        ).order
+    )
+    assert_array_equal(appended.stab(350), [252])
@@ -0,0 +1,122 @@
+"""Unit tests for the EventCatalog class.
+
+Usage: Assuming the current directory is the top one,
+
+    $ pytest -q tests -ra
+
+    will run all tests and provide a short summary that ignores passed ones and
+    any captured console output.
+
+    To run this specific test file, simply do
+
+    $ pytest -q tests/event_catalog_test.py -ra
+
+    instead.
+
+"""
+import pathlib
+
+import numpy as np
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from xarray_events.EventCatalog import EventCatalog
+
+
+def test_round_trip(tmp_path: pathlib.Path) -> None:
+    """Write events to a catalog and read them back.
+
+    Ensure that they're the same, with strings turned categorical, and that
+    the columns are memory-mapped.
+
+    """
+    rng = np.random.default_rng(0)
+
+    start = rng.integers(0, 1_000, 500)
+
+    events = pd.DataFrame(
+        {
+            'start': start,
+            'end': start + rng.integers(0, 50, 500),
+            'kickoff': pd.Timestamp('2020-01-01') + pd.to_timedelta(
+                start, unit='s'
+            ),
+            'event_type': rng.choice(
+                np.array(['pass', 'shot', 'goal', None], dtype=object), 500
+            ),
+            'speed': rng.random(500)
+        },
+        index=pd.Index(rng.permutation(500) + 10, name='event_id')
+    )
+
+    catalog = EventCatalog.write(events, tmp_path)
+
+    assert len(catalog) == len(events)
+    assert isinstance(catalog._column('speed')[0], np.memmap)
+
+    assert_frame_equal(
+        EventCatalog(tmp_path).read(),
+        events.astype({'event_type': 'category'})
+    )
+
+    assert_frame_equal(
+        catalog.read(np.array([3, 1]), ['speed']),
+        events.iloc[[3, 1]][['speed']]
+    )
+
+
+def test_select(tmp_path: pathlib.Path) -> None:
+    """Select events meeting some conditions.
+
+    Whether the conditions are on the column the events are sorted by or not,
+    ensure that the positions of those meeting them are found.
+
+    """
+    rng = np.random.default_rng(0)
+
+    start = rng.integers(0, 1_000, 500)
+
+    events = pd.DataFrame(
+        {
+            'start': start,
+            'end': start + rng.integers(0, 50, 500),
+            'kickoff': pd.Timestamp('2020-01-01') + pd.to_timedelta(
+                start, unit='s'
+            ),
+            'event_type': rng.choice(
+                np.array(['pass', 'shot', 'goal', None], dtype=object), 500
+            ),
+            'speed': rng.random(500)
+        },
+        index=pd.Index(rng.permutation(500) + 10, name='event_id')
+    )
+
+    filters = [
+        [
+            ('start', '>=', 200),
+            ('start', '<', 600),
+            ('event_type', 'in', ['pass', 'goal'])
+        ],
+        [('kickoff', '<=', pd.Timestamp('2020-01-01 00:00:10'))],
+        [('start', '==', events['start'].iloc[0]), ('speed', '>', 0.5)]
+    ]
+
+    for sort_by in [None, 'start']:
+        catalog = EventCatalog.write(events, tmp_path / str(sort_by), sort_by)
+        written = catalog.read()
+
+        expected = (
+            written['start'].between(200, 599) &
+            written['event_type'].isin(['pass', 'goal']) |
+            (written['kickoff'] <= pd.Timestamp('2020-01-01 00:00:10')) |
+            (written['start'] == events['start'].iloc[0]) &
+            (written['speed'] > 0.5)
+        )
+
+        np.testing.assert_array_equal(
+            catalog.select(filters), np.flatnonzero(expected)
+        )
+        np.testing.assert_array_equal(
+            catalog.select(), np.arange(len(events))
+        )
@@ -0,0 +1,332 @@
+"""Unit tests for meth:`event_groupby`.
+
+Usage: Assuming the current directory is the top one,
+
+    $ pytest -q tests -ra
+
+    will run all tests and provide a short summary that ignores passed ones and
+    any captured console output.
+
+    To run this specific test file, simply do
+
+    $ pytest -q tests/event_groupby_test.py -ra
+
+    instead.
+
+"""
+import numpy as np
+
+import pandas as pd
+
+import pytest
+
+import xarray as xr
+from xarray.testing import assert_allclose
+from xarray.testing import assert_identical
+
+import xarray_events
+
+
+def test_event_groupby_no_duration_mapping() -> None:
+    """Use without having specified a duration.
+
+    When the ds_df_mapping given to load contains no duration, ensure that a
+    TypeError is raised.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal'],
+            'start_frame': [1, 175],
+            'end_frame': [174, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    with pytest.raises(TypeError):
+        (
+            ds
+            .events.load(events, {'frame': 'start_frame'})
+            .events.event_groupby('ball_trajectory')
+        )
+
+
+def test_event_groupby_overlapping_events() -> None:
+    """Reduce overlapping events.
+
+    When the events overlap, ensure that the reductions match those of
+    groupby_events.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal'],
+            'start_frame': [1, 75],
+            'end_frame': [200, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    ds = ds.events.load(events, ds_df_mapping)
+
+    groups = ds.events.event_groupby('ball_trajectory')
+    expected = ds.events.groupby_events('ball_trajectory')
+
+    for reduction in ['sum', 'mean', 'min', 'max', 'count', 'std']:
+        assert_allclose(
+            getattr(groups, reduction)(),
+            getattr(expected, reduction)().astype(float)
+        )
+
+    result = xr.DataArray(
+        data=[
+            [0.46392810818556895, 0.12595967267321653],
+            [3.209238938587539, 1.0656072898406097]
+        ],
+        coords={'event_index': [0, 1], 'cartesian_coords': ['x', 'y']},
+        dims=['event_index', 'cartesian_coords'],
+        name='ball_trajectory'
+    )
+
+    assert_allclose(groups.mean(), result)
+
+
+def test_event_groupby_nested_events() -> None:
+    """Reduce events that are nested and leave gaps, skipping NaN."""
+    events = pd.DataFrame(
+        {
+            'event_type': ['possession', 'pass', 'shot', 'pass'],
+            'start_frame': [2, 4, 6, 12],
+            'end_frame': [9, 5, 6, 14]
+        },
+        index=pd.Index([7, 8, 9, 10], name='event_id')
+    )
+
+    values = np.arange(16, dtype=float)
+    values[5] = np.nan
+
+    ds = xr.Dataset(
+        data_vars={'speed': (['frame'], values)},
+        coords={'frame': np.arange(0, 16)}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    groups = (
+        ds
+        .events.load(events, ds_df_mapping)
+        .events.event_groupby('speed')
+    )
+
+    def expected(func: str) -> xr.DataArray:
+        return xr.DataArray(
+            [
+                getattr(np, func)(ds.speed.values[start:(end + 1)])
+                for start, end in zip(events.start_frame, events.end_frame)
+            ],
+            coords={'event_id': [7, 8, 9, 10]},
+            dims=['event_id'],
+            name='speed'
+        )
+
+    for reduction in ['sum', 'mean', 'min', 'max', 'std']:
+        assert_allclose(
+            getattr(groups, reduction)(), expected(f"nan{reduction}")
+        )
+
+    assert_identical(
+        groups.count(),
+        xr.DataArray(
+            [7, 1, 1, 3],
+            coords={'event_id': [7, 8, 9, 10]},
+            dims=['event_id'],
+            name='speed'
+        )
+    )
+
+    assert_allclose(groups.reduce(np.nanmedian), expected('nanmedian'))
+
+
+def test_event_groupby_dimension_order() -> None:
+    """Reduce an array whose duration dimension isn't the first one."""
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal'],
+            'start_frame': [0, 3],
+            'end_frame': [2, 4]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['cartesian_coords', 'frame'],
+                np.arange(10).reshape(2, 5)
+            )
+        },
+        coords={'frame': np.arange(0, 5), 'cartesian_coords': ['x', 'y']}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    result = xr.DataArray(
+        data=[[0, 5], [3, 8]],
+        coords={'event_index': [0, 1], 'cartesian_coords': ['x', 'y']},
+        dims=['event_index', 'cartesian_coords'],
+        name='ball_trajectory'
+    )
+
+    assert_identical(
+        ds
+        .events.load(events, ds_df_mapping)
+        .events.event_groupby('ball_trajectory')
+        .min(),
+        result
+    )
+
+
+def test_event_groupby_prefix_sums() -> None:
+    """Reduce events with cached prefix sums.
+
+    When the prefix sums of a data variable are cached, ensure that they're
+    shared after filtering the events, that they're accumulated again when
+    its values change and that the reductions stay the same, with the sums of
+    integers being exact.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass', 'pass'],
+            'start_frame': [1, 75, 100, 240],
+            'end_frame': [200, 250, 99, 245]
+        }
+    )
+
+    ball_trajectory = np.exp(np.linspace((-6, -8), (3, 2), 250))
+    ball_trajectory[[3, 80], [0, 1]] = np.nan
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (['frame', 'cartesian_coords'], ball_trajectory),
+            'distance': ('frame', np.arange(250) * 10 ** 14 + 7)
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    ds = ds.events.load(events, ds_df_mapping)
+
+    expected = ds.events.event_groupby('ball_trajectory')
+    expected_distance = ds.events.event_groupby('distance').sum()
+
+    ds.events.cache_prefix_sums('ball_trajectory', 'distance')
+    prefix_sums = ds.attrs['_prefix_sums']['ball_trajectory']
+
+    selection = ds.events.sel(event_type='pass')
+    groups = selection.events.event_groupby('ball_trajectory')
+
+    assert groups.prefix_sums is prefix_sums
+
+    for reduction in ['sum', 'mean', 'count', 'std', 'var']:
+        assert_allclose(
+            getattr(groups, reduction)(),
+            getattr(expected, reduction)().sel(event_index=[0, 2, 3])
+        )
+
+    distance = selection.events.event_groupby('distance').sum()
+
+    assert distance.dtype == ds.distance.dtype
+    np.testing.assert_array_equal(
+        distance, expected_distance.sel(event_index=[0, 2, 3])
+    )
+
+    # Replacing the values invalidates the cached sums, but only for them.
+    selection['ball_trajectory'] = selection.ball_trajectory * 2
+
+    groups = selection.events.event_groupby('ball_trajectory')
+
+    assert groups.prefix_sums is not prefix_sums
+    assert_allclose(
+        groups.sum(), expected.sum().sel(event_index=[0, 2, 3]) * 2
+    )
+
+    assert (
+        ds.copy().events.event_groupby('ball_trajectory').prefix_sums is
+        prefix_sums
+    )
+
+    selection.events.cache_prefix_sums('ball_trajectory')
+
+    assert (
+        selection.events.event_groupby('ball_trajectory').prefix_sums is
+        selection.attrs['_prefix_sums']['ball_trajectory']
+    )
+
+    selection.events.clear_prefix_sums()
+
+    assert selection.events.event_groupby('ball_trajectory').prefix_sums is None
+
+
+def test_event_groupby_n_threads() -> None:
+    """Reduce events in batches on several threads.
+
+    Ensure that the reductions match those computed on a single thread, even
+    when there are fewer events than threads.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['possession', 'pass', 'shot', 'pass', 'pass'],
+            'start_frame': [2, 4, 6, 12, 1],
+            'end_frame': [9, 5, 6, 14, 15]
+        },
+        index=pd.Index([7, 8, 9, 10, 11], name='event_id')
+    )
+
+    values = np.arange(32, dtype=float).reshape(16, 2)
+    values[5, 0] = np.nan
+
+    ds = xr.Dataset(
+        data_vars={'ball_trajectory': (['frame', 'cartesian_coords'], values)},
+        coords={'frame': np.arange(0, 16), 'cartesian_coords': ['x', 'y']}
+    )
+
+    ds = ds.events.load(events, {'frame': ('start_frame', 'end_frame')})
+
+    expected = ds.events.event_groupby('ball_trajectory')
+
+    for n_threads in [2, 3, 8]:
+        groups = ds.events.event_groupby('ball_trajectory', n_threads)
+
+        for reduction in ['sum', 'mean', 'min', 'max', 'count', 'var']:
+            assert_identical(
+                getattr(groups, reduction)(), getattr(expected, reduction)()
+            )
+
+        assert_identical(
+            groups.reduce(np.nanmedian), expected.reduce(np.nanmedian)
+        )
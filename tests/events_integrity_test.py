@@ -580,3 +580,336 @@ def test_there_are_overlapping_events_3() -> None:
         .events.load(events, ds_df_mapping)
         .events.df_contains_overlapping_events()
     )
+
+
+def test_there_are_overlapping_events_4() -> None:
+    """Check overlapping events that aren't the first two in start order."""
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass'],
+            'start_frame': [0, 20, 25],
+            'end_frame': [10, 30, 40]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 50))
+            )
+        },
+        coords={'frame': np.arange(0, 50), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    assert (
+        ds
+        .events.load(events, ds_df_mapping)
+        .events.df_contains_overlapping_events()
+    )
+
+
+def test_there_are_no_overlapping_events() -> None:
+    """Check that an events DataFrame doesn't contain overlapping events."""
+    events = pd.DataFrame(
+        {
+            'event_type': ['goal', 'pass', 'pass'],
+            'start_frame': [20, 0, 31],
+            'end_frame': [30, 10, 40]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 50))
+            )
+        },
+        coords={'frame': np.arange(0, 50), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    assert not (
+        ds
+        .events.load(events, ds_df_mapping)
+        .events.df_contains_overlapping_events()
+    )
+
+
+def test_events_at() -> None:
+    """Check that the events covering a coordinate value are found."""
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass'],
+            'start_frame': [0, 20, 25],
+            'end_frame': [10, 30, 40]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 50))
+            )
+        },
+        coords={'frame': np.arange(0, 50), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    ds = ds.events.load(events, ds_df_mapping)
+
+    assert_frame_equal(ds.events.events_at(27), events.iloc[[1, 2]])
+    assert_frame_equal(ds.events.events_at(10), events.iloc[[0]])
+    assert ds.events.events_at(15).empty
+
+
+def test_there_are_gaps_unsortable_coordinate() -> None:
+    """Check gaps on a coordinate whose values aren't sorted."""
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal'],
+            'start_frame': ['d', 'b'],
+            'end_frame': ['a', 'e']
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 5))
+            )
+        },
+        coords={
+            'frame': ['d', 'a', 'c', 'b', 'e'],
+            'cartesian_coords': ['x', 'y']
+        },
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    ds = ds.events.load(events, ds_df_mapping)
+
+    assert ds.events.df_contains_gaps()
+
+    ds.events.df = events.assign(start_frame=['d', 'c'])
+
+    assert not ds.events.df_contains_gaps()
+
+
+def test_overlapping_pairs() -> None:
+    """Check that the pairs of overlapping events are found."""
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass', 'pass'],
+            'start_frame': [25, 0, 20, 45],
+            'end_frame': [40, 10, 30, 49]
+        },
+        index=[10, 11, 12, 13]
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 50))
+            )
+        },
+        coords={'frame': np.arange(0, 50), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    ds = ds.events.load(events, ds_df_mapping)
+
+    np.testing.assert_array_equal(ds.events.overlapping_pairs(), [[10, 12]])
+
+    groups = ds.events.overlap_groups()
+
+    assert len(groups) == 1
+    np.testing.assert_array_equal(groups[0], [12, 10])
+
+
+def test_overlapping_pairs_no_duration_mapping() -> None:
+    """Check that an error is raised when there is no duration mapping."""
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal'],
+            'start_frame': [50, 175],
+            'end_frame': [300, 450]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 500))
+            )
+        },
+        coords={'frame': np.arange(0, 500), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': 'start_frame'}
+
+    with pytest.raises(TypeError):
+        (
+            ds
+            .events.load(events, ds_df_mapping)
+            .events.overlapping_pairs()
+        )
+
+
+def test_coverage_fraction() -> None:
+    """Check the fraction of the coordinate covered by the events."""
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal'],
+            'start_frame': [50, 100],
+            'end_frame': [149, 199]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 300))
+            )
+        },
+        coords={'frame': np.arange(0, 300), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    assert (
+        ds
+        .events.load(events, ds_df_mapping)
+        .events.coverage_fraction()
+    ) == 0.5
+
+
+def test_active_events() -> None:
+    """Check the number of events active at each coordinate value."""
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass'],
+            'start_frame': [0, 4, 6],
+            'end_frame': [4, 8, 6]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 6))
+            )
+        },
+        coords={
+            'frame': np.arange(0, 12, 2),
+            'cartesian_coords': ['x', 'y']
+        },
+        attrs={'match_id': 9, 'resolution_fps': 1}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    result = xr.DataArray(
+        data=[1, 1, 2, 2, 1, 0],
+        coords={'frame': np.arange(0, 12, 2)},
+        dims=['frame'],
+        name='active_events'
+    )
+
+    assert_identical(
+        ds
+        .events.load(events, ds_df_mapping)
+        .events.active_events(),
+        result
+    )
+
+
+def test_no_gaps_to_fill() -> None:
+    """Check that fill_gaps leaves the events as they are without gaps."""
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal'],
+            'start_frame': [0, 120],
+            'end_frame': [119, 299]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 300))
+            )
+        },
+        coords={'frame': np.arange(0, 300), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    assert (
+        ds
+        .events.load(events, ds_df_mapping)
+        .events.fill_gaps()
+        .events.df
+    ) is events
+
+
+def test_many_gaps_are_filled() -> None:
+    """Check fill_gaps with many gaps and overlapping events."""
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass'] * 4,
+            'start_frame': [10, 30, 35, 60],
+            'end_frame': [19, 40, 50, 60]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 100))
+            )
+        },
+        coords={'frame': np.arange(0, 100), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    events_no_gaps = pd.DataFrame(
+        {
+            'event_type': ['pass'] * 4 + ['default'] * 4,
+            'start_frame': [10, 30, 35, 60, 0, 20, 51, 61],
+            'end_frame': [19, 40, 50, 60, 9, 29, 59, 99]
+        }
+    )
+
+    ds = (
+        ds
+        .events.load(events, ds_df_mapping)
+        .events.fill_gaps()
+    )
+
+    assert_frame_equal(ds.events.df, events_no_gaps)
+    assert not ds.events.df_contains_gaps()
@@ -0,0 +1,186 @@
+"""Unit tests for the EventsPlan class.
+
+Usage: Assuming the current directory is the top one,
+
+    $ pytest -q tests -ra
+
+    will run all tests and provide a short summary that ignores passed ones and
+    any captured console output.
+
+    To run this specific test file, simply do
+
+    $ pytest -q tests/events_plan_test.py -ra
+
+    instead.
+
+"""
+import numpy as np
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+import pytest
+
+import xarray as xr
+from xarray.testing import assert_identical
+
+import xarray_events
+
+
+def test_compute() -> None:
+    """Run a chain of operations lazily.
+
+    Ensure that nothing runs until compute is called and that the result is
+    the same as running the operations eagerly, both when they end with a
+    Dataset and with groups.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass', 'pass', 'shot'],
+            'player': ['a', 'b', 'a', 'c', 'a'],
+            'start_frame': [1, 30, 60, 140, 200],
+            'end_frame': [29, 59, 119, 189, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    mapping = {'frame': ('start_frame', 'end_frame')}
+
+    plan = (
+        ds.events.lazy()
+        .load(events, mapping)
+        .sel(event_type=['pass', 'shot'], cartesian_coords='x')
+        .query('end_frame - start_frame > 40')
+        .sel(player='a', frame=slice(1, 199), drop_out_of_view=True)
+    )
+
+    assert '_events' not in ds.attrs
+    assert repr(plan) == 'EventsPlan: ds -> load -> sel -> query -> sel'
+
+    expected = (
+        ds.copy()
+        .events.load(events, mapping)
+        .events.sel(event_type=['pass', 'shot'], cartesian_coords='x')
+        .events.query('end_frame - start_frame > 40')
+        .events.sel(player='a', frame=slice(1, 199), drop_out_of_view=True)
+    )
+
+    result = plan.compute()
+
+    assert_identical(result, expected)
+    assert_frame_equal(result.events.df, events.iloc[[2]])
+
+    assert_identical(
+        plan.fill_gaps().groupby_events('ball_trajectory').compute().mean(),
+        expected.events.fill_gaps().events.groupby_events(
+            'ball_trajectory'
+        ).mean()
+    )
+
+    assert '_events' not in ds.attrs
+
+
+def test_positional_constraints() -> None:
+    """Select with boolean masks and Callables after other selections.
+
+    Ensure that they refer to the events left by the previous selections, and
+    that the result is the same as selecting eagerly.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass', 'goal', 'pass'],
+            'player': ['a', 'b', 'a', 'c', 'a'],
+            'start_frame': [1, 30, 60, 140, 200],
+            'end_frame': [29, 59, 119, 189, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    mapping = {'frame': ('start_frame', 'end_frame')}
+
+    result = (
+        ds.events.lazy()
+        .load(events, mapping)
+        .sel(event_type='pass')
+        .sel(player=[True, False, True])
+        .compute()
+    )
+
+    assert_frame_equal(result.events.df, events.iloc[[0, 4]])
+
+    plan = (
+        ds.events.lazy()
+        .load(events, mapping)
+        .sel(event_type='pass', frame=slice(1, 200), drop_out_of_view=True)
+        .sel(start_frame=lambda frame: frame == frame.max())
+        .sel(frame=slice(1, 100))
+    )
+
+    expected = (
+        ds.copy()
+        .events.load(events, mapping)
+        .events.sel(
+            event_type='pass', frame=slice(1, 200), drop_out_of_view=True
+        )
+        .events.sel(start_frame=lambda frame: frame == frame.max())
+        .events.sel(frame=slice(1, 100))
+    )
+
+    result = plan.compute()
+
+    assert_identical(result, expected)
+    assert_frame_equal(result.events.df, events.iloc[[4]])
+
+
+def test_terminal_step() -> None:
+    """Record an operation after one that ends the plan.
+
+    Ensure that a TypeError is raised.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass', 'pass', 'shot'],
+            'player': ['a', 'b', 'a', 'c', 'a'],
+            'start_frame': [1, 30, 60, 140, 200],
+            'end_frame': [29, 59, 119, 189, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    plan = ds.events.lazy().load(events).groupby_events('frame')
+
+    with pytest.raises(TypeError):
+        plan.sel(event_type='pass')
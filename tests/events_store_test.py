@@ -0,0 +1,216 @@
+"""Unit tests for the store of the events of a Dataset.
+
+Usage: Assuming the current directory is the top one,
+
+    $ pytest -q tests -ra
+
+    will run all tests and provide a short summary that ignores passed ones and
+    any captured console output.
+
+    To run this specific test file, simply do
+
+    $ pytest -q tests/events_store_test.py -ra
+
+    instead.
+
+"""
+import pickle
+
+import numpy as np
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+import xarray as xr
+from xarray.testing import assert_identical
+
+import xarray_events
+
+
+def test_copies_share_events() -> None:
+    """Copy a Dataset and change the events of the copy.
+
+    Ensure that copies, even deep ones, share the events DataFrame and that
+    setting the events of one doesn't affect the other.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass'],
+            'start_frame': [1, 100, 200],
+            'end_frame': [50, 150, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    ds = ds.events.load(events, ds_df_mapping)
+    events = ds.events.df
+
+    for copied in [ds.copy(deep=True), ds.isel(cartesian_coords=0)]:
+        assert copied.events.df is events
+        assert copied.events.ds_df_mapping is ds.events.ds_df_mapping
+
+    filled = ds.copy(deep=True).events.fill_gaps()
+    selected = ds.events.sel(event_type='pass')
+
+    assert len(filled.events.df) == 5
+    assert len(selected.events.df) == 2
+    assert ds.attrs['_events'].df is events
+
+    assert_identical(pickle.loads(pickle.dumps(ds)), ds)
+
+
+def test_derived_datasets_share_attributes() -> None:
+    """Change the events of a Dataset derived by xarray's sel and isel.
+
+    Ensure that the events of the Dataset they were derived from stay the same,
+    even though xarray may share the attributes between both.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal'],
+            'start_frame': [1, 20],
+            'end_frame': [9, 29]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 30))
+            )
+        },
+        coords={'frame': np.arange(1, 31), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds = ds.events.load(events, {'frame': ('start_frame', 'end_frame')})
+    events = ds.events.df
+
+    filled = ds.isel(frame=slice(0, 30)).events.fill_gaps()
+    appended = ds.sel(cartesian_coords=['x', 'y']).events.append(
+        pd.DataFrame(
+            {'event_type': ['shot'], 'start_frame': [10], 'end_frame': [19]}
+        )
+    )
+
+    assert len(filled.events.df) == 4
+    assert len(appended.events.df) == 3
+    assert ds.attrs['_events'].df is events
+    assert len(ds.events.df) == 2
+
+
+def test_plain_attributes() -> None:
+    """Use events and a mapping set as plain attributes.
+
+    Ensure that they're still read and that setting them moves them into the
+    store.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass'],
+            'start_frame': [1, 100, 200],
+            'end_frame': [50, 150, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    ds = ds.events.load(events, ds_df_mapping)
+
+    plain = ds.assign_attrs(
+        _events=ds.events.df, _ds_df_mapping=ds.events.ds_df_mapping
+    )
+
+    assert_frame_equal(plain.events.df, ds.events.df)
+    assert plain.events.ds_df_mapping == ds.events.ds_df_mapping
+
+    result = plain.events.sel(event_type='goal')
+
+    assert '_ds_df_mapping' not in result.attrs
+    assert result.events.ds_df_mapping == ds.events.ds_df_mapping
+    assert result.events.df['start_frame'].tolist() == [100]
+
+
+def test_derived_caches() -> None:
+    """Group a variable by the events twice and then replace the events.
+
+    Ensure that what's derived from the events is only built the first time,
+    and that setting the events or the mapping starts a new version of the
+    store with its caches empty.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass'],
+            'start_frame': [1, 100, 200],
+            'end_frame': [50, 150, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    ds = ds.events.load(events, ds_df_mapping)
+    store = ds.attrs['_events']
+
+    first = ds.events.groupby_events('ball_trajectory').mean()
+    derived = dict(store.derived)
+
+    assert {'duration_mapping', 'duration_index', 'reverse_mapping'} <= set(
+        derived
+    )
+
+    second = ds.events.groupby_events('ball_trajectory').mean()
+
+    assert_identical(first, second)
+    assert all(store.derived[name] is derived[name] for name in derived)
+
+    selected = ds.copy().events.sel(event_type='pass')
+
+    assert selected.attrs['_events'].version == store.version + 1
+    assert selected.attrs['_events'].derived == dict()
+    assert ds.attrs['_events'] is store
+
+    ds.attrs.pop('_events')
+    ds.attrs['_events'] = store.replace(ds_df_mapping=None)
+    ds.events.ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    assert ds.attrs['_events'].version == store.version + 2
+    assert ds.attrs['_events'].derived == dict()
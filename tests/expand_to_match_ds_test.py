@@ -425,3 +425,71 @@ def test_fill_value_col_invalid() -> None:
             .events.load(events, ds_df_mapping)
             .events.expand_to_match_ds('start_frame', 'ffill', 'event_id')
         )
+
+
+def test_codes() -> None:
+    """Use integer codes.
+
+    When codes are requested, ensure that the resulting DataArray holds the
+    position of each event in the lookup table and -1 where there's none.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass'],
+            'start_frame': [175, 1, 200],
+            'end_frame': [199, 174, 250]
+        },
+        index=pd.Index([30, 10, 20], name='event_id')
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    ds = ds.events.load(events, ds_df_mapping)
+
+    result = ds.events.expand_to_match_ds(
+        'start_frame', fill_value_col='event_id', codes=True
+    )
+
+    assert result.dtype == np.int32
+    assert_equal(
+        result,
+        xr.DataArray(
+            data=[0] + [-1] * 173 + [1] + [-1] * 24 + [2] + [-1] * 50,
+            coords={'frame': np.arange(1, 251)},
+            dims=['frame'],
+            name='event_id'
+        )
+    )
+    np.testing.assert_array_equal(result.attrs['event_id'], [10, 30, 20])
+
+    result = ds.events.expand_to_match_ds(
+        'start_frame', 'ffill', 'event_id', codes=True
+    )
+
+    assert_equal(
+        result,
+        xr.DataArray(
+            data=[0] * 174 + [1] * 25 + [2] * 51,
+            coords={'frame': np.arange(1, 251)},
+            dims=['frame'],
+            name='event_id'
+        )
+    )
+
+    # The codes point at the same values as the regular expansion.
+    assert_equal(
+        result.copy(data=result.attrs['event_id'][result.values]),
+        ds.events.expand_to_match_ds('start_frame', 'ffill', 'event_id')
+    )
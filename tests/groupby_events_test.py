@@ -384,3 +384,94 @@ def test_array_to_group_invalid() -> None:
             .events.groupby_events('ball_displacement', 'start_frame', 'ffill')
             .mean()
         )
+
+
+def test_groupby_events_gaps() -> None:
+    """Group by events that leave gaps between them.
+
+    When the events don't cover the whole Dataset coordinate, ensure that each
+    group contains exactly the values spanned by the duration of its event.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass'],
+            'start_frame': [10, 50, 60],
+            'end_frame': [30, 55, 99]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 100))
+            )
+        },
+        coords={'frame': np.arange(0, 100), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    groups = (
+        ds
+        .events.load(events, ds_df_mapping)
+        .events.groupby_events('ball_trajectory')
+    )
+
+    assert all(isinstance(group, slice) for group in groups._group_indices)
+
+    result = xr.concat(
+        [
+            ds.ball_trajectory.sel(frame=slice(start, end)).mean('frame')
+            for start, end in zip(events.start_frame, events.end_frame)
+        ],
+        dim='event_index'
+    )
+
+    np.testing.assert_allclose(groups.mean().values, result.values)
+
+
+def test_groupby_events_selected_overlapping_events() -> None:
+    """Group by overlapping events whose labels aren't their positions.
+
+    When some events have been filtered out, or one of them hides another one
+    after expanding, ensure that there's still one group per event, labeled
+    after it.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass', 'pass'],
+            'start_frame': [0, 10, 20, 40],
+            'end_frame': [9, 60, 30, 99]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={'speed': (['frame'], np.linspace(0, 1, 100))},
+        coords={'frame': np.arange(0, 100)}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    result = (
+        ds
+        .events.load(events, ds_df_mapping)
+        .events.sel(event_type='pass')
+        .events.groupby_events('speed')
+        .mean()
+    )
+
+    expected = xr.DataArray(
+        [
+            ds.speed.sel(frame=slice(start, end)).mean().item()
+            for start, end in [(0, 9), (20, 30), (40, 99)]
+        ],
+        coords={'event_index': [0, 2, 3]},
+        dims=['event_index'],
+        name='speed'
+    )
+
+    xr.testing.assert_allclose(result, expected)
@@ -0,0 +1,151 @@
+"""Unit tests for :class:`LiveEvents`.
+
+Usage: Assuming the current directory is the top one,
+
+    $ pytest -q tests -ra
+
+    will run all tests and provide a short summary that ignores passed ones and
+    any captured console output.
+
+    To run this specific test file, simply do
+
+    $ pytest -q tests/live_events_test.py -ra
+
+    instead.
+
+"""
+import numpy as np
+
+import pandas as pd
+
+import pytest
+
+import xarray as xr
+from xarray.testing import assert_allclose
+from xarray.testing import assert_identical
+
+import xarray_events
+
+
+def test_live_events() -> None:
+    """Stream values and events through a window.
+
+    Ensure that the window holds the last values along with the events that
+    start within it, that the gaps and overlaps tracked incrementally match
+    those of the window loaded from scratch and that memory stays constant.
+
+    """
+    stream = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['cartesian_coords', 'frame'],
+                np.exp(np.linspace((-6, -8), (3, 2), 500)).T
+            ),
+            'speed': (['frame'], np.linspace(0, 1, 500))
+        },
+        coords={'frame': np.arange(1, 501), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    live = xarray_events.LiveEvents(
+        stream.isel(frame=slice(0, 30)),
+        {'frame': ('start_frame', 'end_frame')},
+        window=100
+    )
+
+    rng = np.random.default_rng(3)
+
+    for stop in range(60, 501, 30):
+        live.push(stream.isel(frame=slice(stop - 30, stop)))
+
+        window = stream.isel(frame=slice(max(stop - 100, 0), stop))
+
+        starts = np.sort(rng.choice(np.arange(stop - 29, stop - 2), 3, False))
+
+        live.add_events(
+            pd.DataFrame(
+                {
+                    'event_type': ['pass', 'goal', 'pass'],
+                    'start_frame': starts,
+                    'end_frame': np.minimum(
+                        starts + rng.integers(0, 15, 3), stop
+                    )
+                }
+            )
+        )
+
+        assert_identical(
+            live.dataset.assign_attrs(_events=None, _ds_df_mapping=None),
+            window.assign_attrs(_events=None, _ds_df_mapping=None)
+        )
+
+        assert (live.df.start_frame >= window.frame.values[0]).all()
+
+        expected = window.events.load(
+            live.df.copy(), {'frame': ('start_frame', 'end_frame')}
+        )
+
+        assert live._n_uncovered == np.sum(expected.events._coverage() == 0)
+        assert live._n_overlapping_pairs == len(
+            expected.events.overlapping_pairs()
+        )
+
+    assert live._coverage.shape == (200,)
+    assert len(live) == 100
+
+    assert live.df_contains_gaps()
+    assert live.df_contains_overlapping_events()
+
+    result = live.sel(event_type='pass')
+
+    assert len(result.events.df) > 0
+    assert (result.events.df.event_type == 'pass').all()
+    assert_allclose(
+        live.groupby_events('speed').mean(),  # type: ignore
+        live.dataset.events.event_groupby('speed').mean()
+    )
+
+    # A single event covering the whole window after the others are evicted.
+    live.push(stream.isel(frame=slice(500, 500)))
+    live.push(
+        stream
+        .isel(frame=slice(0, 100))
+        .assign_coords(frame=np.arange(501, 601))
+    )
+    live.add_events(pd.DataFrame({'start_frame': [501], 'end_frame': [600]}))
+
+    assert len(live.df) == 1
+    assert not live.df_contains_gaps()
+    assert not live.df_contains_overlapping_events()
+
+
+def test_live_events_push_invalid() -> None:
+    """Push values that don't come after those in the window."""
+    stream = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['cartesian_coords', 'frame'],
+                np.exp(np.linspace((-6, -8), (3, 2), 500)).T
+            ),
+            'speed': (['frame'], np.linspace(0, 1, 500))
+        },
+        coords={'frame': np.arange(1, 501), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    live = xarray_events.LiveEvents(
+        stream.isel(frame=slice(0, 30)),
+        {'frame': ('start_frame', 'end_frame')},
+        window=100
+    )
+
+    with pytest.raises(ValueError):
+        live.push(stream.isel(frame=slice(10, 20)))
+
+    with pytest.raises(ValueError):
+        live.push(stream.isel(frame=slice(30, 231)))
+
+    with pytest.raises(ValueError):
+        live.add_events(
+            pd.DataFrame({'start_frame': [25], 'end_frame': [40]})
+        )
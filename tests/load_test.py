@@ -14,6 +14,9 @@ Usage: Assuming the current directory is the top one,
     instead.
 
 """
+import pathlib
+import typing
+
 import numpy as np
 
 import pandas as pd
@@ -26,6 +29,7 @@ from xarray.testing import assert_identical
 from xarray.testing import assert_equal
 
 import xarray_events
+from xarray_events.EventsStore import EventsStore
 
 
 def test_from_DataFrame() -> None:
@@ -57,7 +61,7 @@ def test_from_DataFrame() -> None:
     assert_frame_equal(
         ds
         .events.load(events)
-        .events._ds._events,
+        .events._ds._events.df,
         events
     )
 
@@ -116,9 +120,11 @@ def test_valid_mapping() -> None:
         attrs={'match_id': 7, 'resolution_fps': 25}
     )
 
-    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+    ds_df_mapping: typing.Mapping[typing.Hashable, typing.Any] = {
+        'frame': ('start_frame', 'end_frame')
+    }
 
-    result = ds.assign_attrs(_events=events, _ds_df_mapping=ds_df_mapping)
+    result = ds.assign_attrs(_events=EventsStore(events, ds_df_mapping))
 
     assert_identical(
         ds.events.load(events, ds_df_mapping),
@@ -150,9 +156,11 @@ def test_valid_mapping_2() -> None:
         attrs={'match_id': 7, 'resolution_fps': 25}
     )
 
-    ds_df_mapping = {'frame': 'start_frame'}
+    ds_df_mapping: typing.Mapping[typing.Hashable, typing.Any] = {
+        'frame': 'start_frame'
+    }
 
-    result = ds.assign_attrs(_events=events, _ds_df_mapping=ds_df_mapping)
+    result = ds.assign_attrs(_events=EventsStore(events, ds_df_mapping))
 
     assert_identical(
         ds.events.load(events, ds_df_mapping),
@@ -190,3 +198,251 @@ def test_wrong_ds() -> None:
 
     with pytest.raises(ValueError):
         ds.events.load(events, ds_df_mapping)
+
+
+def test_from_Parquet(tmp_path: pathlib.Path) -> None:
+    """Use the path to a Parquet file.
+
+    When load is called with a path, ensure that only the mapped and requested
+    columns are loaded, and only the events that satisfy the filters and
+    intersect the Dataset coordinate.
+
+    """
+    pytest.importorskip('pyarrow')
+
+    catalog = pd.DataFrame(
+        {
+            'match_id': [11, 12, 12, 12, 12, 13],
+            'event_type': ['pass', 'pass', 'goal', 'pass', 'shot', 'pass'],
+            'start_frame': [1, 1, 175, 260, 240, 1],
+            'end_frame': [174, 174, 250, 300, 262, 90],
+            'player': ['a', 'b', 'c', 'd', 'e', 'f']
+        }
+    )
+
+    path = tmp_path / 'events.parquet'
+    catalog.to_parquet(path, row_group_size=2)
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    expected = catalog.loc[
+        [1, 2, 4], ['start_frame', 'end_frame', 'event_type']
+    ]
+
+    for source in [path, str(path)]:
+        result = ds.events.load(
+            source,
+            ds_df_mapping,
+            columns=['event_type'],
+            filters=[('match_id', '==', 12)]
+        )
+
+        assert_frame_equal(
+            result.events.df.reset_index(drop=True),
+            expected.reset_index(drop=True)
+        )
+        assert result.events.ds_df_mapping == ds_df_mapping
+
+
+def test_from_Table() -> None:
+    """Use a pyarrow Table.
+
+    When load is called with a Table, ensure that it's projected and filtered
+    like Parquet is, keeping the index of the DataFrame it came from.
+
+    """
+    pa = pytest.importorskip('pyarrow')
+
+    catalog = pd.DataFrame(
+        {
+            'match_id': [11, 12, 12, 12, 12, 13],
+            'event_type': ['pass', 'pass', 'goal', 'pass', 'shot', 'pass'],
+            'start_frame': [1, 1, 175, 260, 240, 1],
+            'end_frame': [174, 174, 250, 300, 262, 90],
+            'player': ['a', 'b', 'c', 'd', 'e', 'f']
+        }
+    )
+
+    table = pa.Table.from_pandas(catalog.set_index('player'))
+
+    ds = xr.Dataset(
+        data_vars={'speed': (['frame'], np.linspace(0, 1, 250))},
+        coords={'frame': np.arange(1, 251)}
+    )
+
+    result = ds.events.load(
+        table,
+        {'frame': ('start_frame', 'end_frame')},
+        columns=['event_type'],
+        filters=[
+            [('match_id', '==', 12), ('event_type', 'in', ['goal', 'shot'])],
+            [('match_id', '>', 12)]
+        ]
+    )
+
+    assert_frame_equal(
+        result.events.df,
+        catalog
+        .set_index('player')
+        .loc[['c', 'e', 'f'], ['start_frame', 'end_frame', 'event_type']]
+    )
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.csv.gz', '.jsonl'])
+def test_from_text(tmp_path: pathlib.Path, suffix: str) -> None:
+    """Use the path to a CSV or JSON lines file.
+
+    When load is called with the path to a text file, ensure that it's parsed
+    in chunks with the given types, keeping only the requested columns and
+    the events that satisfy the filters and intersect the Dataset coordinate.
+
+    """
+    catalog = pd.DataFrame(
+        {
+            'match_id': [11, 12, 12, 12, 12, 13],
+            'event_type': ['pass', 'pass', 'goal', 'pass', 'shot', 'pass'],
+            'start_frame': [1, 1, 175, 260, 240, 1],
+            'end_frame': [174, 174, 250, 300, 262, 90],
+            'player': ['a', 'b', 'c', 'd', 'e', 'f']
+        }
+    )
+
+    path = tmp_path / f"events{suffix}"
+
+    if suffix == '.jsonl':
+        catalog.to_json(path, orient='records', lines=True)
+    else:
+        catalog.to_csv(path, index=False)
+
+    ds = xr.Dataset(
+        data_vars={'speed': (['frame'], np.linspace(0, 1, 250))},
+        coords={'frame': np.arange(1, 251)}
+    )
+
+    result = ds.events.load(
+        path,
+        {'frame': ('start_frame', 'end_frame')},
+        columns=['event_type'],
+        filters=[('match_id', '==', 12)],
+        dtype={'event_type': 'category', 'start_frame': 'int32'},
+        chunksize=2
+    )
+
+    expected = (
+        catalog
+        .loc[[1, 2, 4], ['start_frame', 'end_frame', 'event_type']]
+        .reset_index(drop=True)
+        .astype({'event_type': 'category', 'start_frame': 'int32'})
+    )
+
+    assert_frame_equal(result.events.df, expected)
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.jsonl'])
+def test_from_text_dates(tmp_path: pathlib.Path, suffix: str) -> None:
+    """Use the path to a text file with a duration made of dates.
+
+    When the Dataset coordinate the duration maps to holds dates, ensure that
+    the duration columns are parsed as dates, so that the events are filtered
+    by the range of the coordinate.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'shot'],
+            'start': pd.to_datetime(
+                ['2020-01-01 00:00:00', '2020-01-01 00:00:05',
+                 '2020-01-01 00:01:00']
+            ),
+            'end': pd.to_datetime(
+                ['2020-01-01 00:00:04', '2020-01-01 00:00:09',
+                 '2020-01-01 00:01:04']
+            )
+        }
+    )
+
+    path = tmp_path / f"events{suffix}"
+
+    if suffix == '.jsonl':
+        events.to_json(path, orient='records', lines=True)
+    else:
+        events.to_csv(path, index=False)
+
+    ds = xr.Dataset(
+        data_vars={'speed': (['time'], np.linspace(0, 1, 10))},
+        coords={
+            'time': pd.date_range('2020-01-01', periods=10, freq='s')
+        }
+    )
+
+    result = ds.events.load(
+        path, {'time': ('start', 'end')}, chunksize=2
+    )
+
+    assert_frame_equal(result.events.df, events.iloc[:2])
+
+
+def test_from_catalog(tmp_path: pathlib.Path) -> None:
+    """Use the path to an EventCatalog.
+
+    When load is called with the path to a catalog or the catalog itself,
+    ensure that it's projected and filtered like Parquet is, keeping the
+    index of the DataFrame it came from.
+
+    """
+    events = pd.DataFrame(
+        {
+            'match_id': [11, 12, 12, 12, 12, 13],
+            'event_type': ['pass', 'pass', 'goal', 'pass', 'shot', 'pass'],
+            'start_frame': [1, 1, 175, 260, 240, 1],
+            'end_frame': [174, 174, 250, 300, 262, 90],
+            'player': ['a', 'b', 'c', 'd', 'e', 'f']
+        }
+    ).set_index('player')
+
+    catalog = xarray_events.EventCatalog.write(
+        events, tmp_path / 'catalog', 'start_frame'
+    )
+
+    ds = xr.Dataset(
+        data_vars={'speed': (['frame'], np.linspace(0, 1, 250))},
+        coords={'frame': np.arange(1, 251)}
+    )
+
+    expected = (
+        events
+        .loc[['f', 'c', 'e'], ['start_frame', 'end_frame', 'event_type']]
+        .astype({'event_type': 'category'})
+    )
+
+    for source in [catalog, tmp_path / 'catalog']:
+        result = ds.events.load(
+            source,
+            {'frame': ('start_frame', 'end_frame')},
+            columns=['event_type'],
+            filters=[
+                [
+                    ('match_id', '==', 12),
+                    ('event_type', 'in', ['goal', 'shot'])
+                ],
+                [('match_id', '>', 12)]
+            ]
+        )
+
+        assert_frame_equal(
+            result.events.df,
+            expected.astype(
+                {'event_type': result.events.df['event_type'].dtype}
+            )
+        )
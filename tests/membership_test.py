@@ -0,0 +1,111 @@
+"""Unit tests for meth:`membership`.
+
+Usage: Assuming the current directory is the top one,
+
+    $ pytest -q tests -ra
+
+    will run all tests and provide a short summary that ignores passed ones and
+    any captured console output.
+
+    To run this specific test file, simply do
+
+    $ pytest -q tests/membership_test.py -ra
+
+    instead.
+
+"""
+import numpy as np
+
+import pandas as pd
+
+import pytest
+
+import xarray as xr
+
+import xarray_events
+
+pytest.importorskip('scipy')
+
+
+def test_membership_no_duration_mapping() -> None:
+    """Use without having specified a duration.
+
+    When the ds_df_mapping given to load contains no duration, ensure that a
+    TypeError is raised.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal'],
+            'start_frame': [1, 175],
+            'end_frame': [174, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    with pytest.raises(TypeError):
+        (
+            ds
+            .events.load(events, {'frame': 'start_frame'})
+            .events.membership()
+        )
+
+
+def test_membership_overlapping_events() -> None:
+    """Represent overlapping events and gaps.
+
+    When the events overlap and leave gaps, ensure that each row covers
+    exactly the positions spanned by the duration of its event.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['possession', 'pass', 'shot'],
+            'start_frame': [2, 6, 12],
+            'end_frame': [8, 6, 14]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 9))
+            )
+        },
+        coords={
+            'frame': np.arange(0, 18, 2),
+            'cartesian_coords': ['x', 'y']
+        },
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    ds = ds.events.load(events, ds_df_mapping)
+
+    membership = ds.events.membership()
+
+    np.testing.assert_array_equal(
+        membership.toarray(),
+        [
+            [0, 1, 1, 1, 1, 0, 0, 0, 0],
+            [0, 0, 0, 1, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0, 1, 1, 0]
+        ]
+    )
+
+    np.testing.assert_allclose(
+        membership @ ds.ball_trajectory.values,
+        ds.events.event_groupby('ball_trajectory').sum().values
+    )
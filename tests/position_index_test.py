@@ -0,0 +1,68 @@
+"""Unit tests for :class:`PositionIndex`.
+
+Usage: Assuming the current directory is the top one,
+
+    $ pytest -q tests -ra
+
+    will run all tests and provide a short summary that ignores passed ones and
+    any captured console output.
+
+    To run this specific test file, simply do
+
+    $ pytest -q tests/position_index_test.py -ra
+
+    instead.
+
+"""
+import numpy as np
+from numpy.testing import assert_array_equal
+
+import pytest
+
+from xarray_events.PositionIndex import PositionIndex
+
+
+def test_sorted_values() -> None:
+    """Map values of a sorted coordinate."""
+    index = PositionIndex(np.square(np.arange(0, 10)))
+
+    assert_array_equal(index.get_positions([0, 49, 81, 4]), [0, 7, 9, 2])
+
+
+def test_sorted_float_values() -> None:
+    """Map values of a sorted coordinate with floats."""
+    index = PositionIndex([0.0, 1.4, 4.9, 9.0, 16.2])
+
+    assert_array_equal(index.get_positions([4.9, 16.2]), [2, 4])
+
+
+def test_unsorted_values() -> None:
+    """Map values of a coordinate that isn't sorted."""
+    index = PositionIndex(np.array([5, 3, 9, 1]))
+
+    assert_array_equal(index.get_positions([1, 5, 9]), [3, 0, 2])
+
+
+def test_unsortable_values() -> None:
+    """Map values of a coordinate that can't be sorted."""
+    index = PositionIndex(np.array(['b', 2, ('x', 1), 'a'], dtype=object))
+
+    assert_array_equal(index.get_positions(['a', 2, 'b']), [3, 1, 0])
+
+
+def test_repeated_values() -> None:
+    """Map values that appear more than once to their first position."""
+    sorted_index = PositionIndex([1, 2, 2, 2, 3])
+    unsorted_index = PositionIndex(['x', 'y', 'x', 'z', 'y'])
+
+    assert_array_equal(sorted_index.get_positions([2, 3]), [1, 4])
+    assert_array_equal(unsorted_index.get_positions(['y', 'z']), [1, 3])
+
+
+def test_missing_values() -> None:
+    """Ensure that a ValueError is raised for values not in the coordinate."""
+    with pytest.raises(ValueError):
+        PositionIndex(np.arange(0, 12, 2)).get_positions([0, 5])
+
+    with pytest.raises(ValueError):
+        PositionIndex(['a', 'b']).get_positions(['c'])
@@ -0,0 +1,107 @@
+"""Unit tests for the query method.
+
+Usage: Assuming the current directory is the top one,
+
+    $ pytest -q tests -ra
+
+    will run all tests and provide a short summary that ignores passed ones and
+    any captured console output.
+
+    To run this specific test file, simply do
+
+    $ pytest -q tests/query_test.py -ra
+
+    instead.
+
+"""
+import numpy as np
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+import pytest
+
+import xarray as xr
+from xarray.testing import assert_equal
+
+import xarray_events
+
+
+def test_query() -> None:
+    """Select events with an expression.
+
+    Ensure that the events satisfying it are selected, that the events of the
+    original Dataset stay as they were and that the mask is remembered unless
+    the expression refers to variables.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass', 'shot'],
+            'start_frame': [1, 60, 100, 200],
+            'end_frame': [59, 99, 199, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds = ds.events.load(events, {'frame': ('start_frame', 'end_frame')})
+    events = ds.events.df
+
+    expr = "event_type == 'pass' and end_frame - start_frame > 60"
+
+    result = ds.copy().events.query(expr)
+
+    assert_frame_equal(result.events.df, events.iloc[[2]])
+    assert_frame_equal(ds.attrs['_events'].df, events)
+    assert list(ds.attrs['_events'].query_masks) == [expr]
+
+    result = ds.copy().events.query(
+        'end_frame - start_frame < @length',
+        local_dict={'length': 50},
+        drop_out_of_view=True
+    )
+
+    assert_frame_equal(result.events.df, events.iloc[[1]])
+    assert_equal(result, ds.sel(frame=slice(60, 99)))
+    assert list(ds.attrs['_events'].query_masks) == [expr]
+
+
+def test_query_not_a_condition() -> None:
+    """Use an expression that isn't a condition.
+
+    Ensure that a ValueError is raised.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass', 'shot'],
+            'start_frame': [1, 60, 100, 200],
+            'end_frame': [59, 99, 199, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds = ds.events.load(events, {'frame': ('start_frame', 'end_frame')})
+
+    with pytest.raises(ValueError):
+        ds.events.query('end_frame - start_frame')
@@ -207,7 +207,7 @@ def test_args_match_only_events() -> None:
     assert_frame_equal(
         ds
         .events.sel(selection)
-        .events._ds._events,
+        .events._ds._events.df,
         events[events['start_frame'] == 1]
     )
 
@@ -453,7 +453,7 @@ def test_constraint_is_Collection() -> None:
     assert_frame_equal(
         ds
         .events.sel(selection)
-        .events._ds._events,
+        .events._ds._events.df,
         events[events['start_frame'] == 1]
     )
 
@@ -499,7 +499,7 @@ def test_df_constraint_is_Callable() -> None:
         ds
         .events.load(events)
         .events.sel(selection)
-        .events._ds._events,
+        .events._ds._events.df,
         events[events['start_frame'] == 1]
     )
 
@@ -521,3 +521,96 @@ def test_ds_constraint_is_Callable() -> None:
 
     with pytest.raises(KeyError):
         ds.events.sel(selection)
+
+
+def test_many_df_constraints() -> None:
+    """Specify many constraints of different kinds for the events.
+
+    When the constraints are a single value, a Collection, a boolean mask and
+    a Callable, ensure that the events satisfying all of them are selected
+    and that the events of the original Dataset stay as they were.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass', 'pass', 'shot'],
+            'player': ['a', 'b', 'a', 'c', 'a'],
+            'start_frame': [1, 30, 60, 120, 200],
+            'end_frame': [29, 59, 119, 199, 250],
+            'accurate': [True, True, False, True, True]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    ).events.load(events)
+
+    selection = {
+        'event_type': ['pass', 'shot'],
+        'player': 'a',
+        'accurate': events['accurate'].to_numpy(),
+        'start_frame': lambda frame: frame < 150
+    }
+
+    assert_frame_equal(
+        ds.events.sel(selection).events.df,
+        events.iloc[[0]]
+    )
+
+    assert_frame_equal(ds.attrs['_events'].df, events)
+
+
+def test_drop_out_of_view() -> None:
+    """Keep the Dataset and the events in sync.
+
+    When drop_out_of_view is True, ensure that filtering the events narrows
+    the Dataset down to their span without copying it, and that selecting
+    from the Dataset drops the events that don't cover any value left.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': ['pass', 'goal', 'pass', 'shot'],
+            'start_frame': [1, 60, 100, 200],
+            'end_frame': [59, 99, 199, 250]
+        }
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    ).events.load(events, {'frame': ('start_frame', 'end_frame')})
+
+    # Each selection is made on a copy, since it rebinds the accessor.
+
+    result = ds.copy().events.sel(event_type='goal', drop_out_of_view=True)
+
+    assert_equal(result, ds.sel(frame=slice(60, 99)))
+    assert np.shares_memory(
+        result['ball_trajectory'].values, ds['ball_trajectory'].values
+    )
+
+    result = ds.copy().events.sel(
+        frame=slice(90, 150), event_type='pass', drop_out_of_view=True
+    )
+
+    assert_frame_equal(result.events.df, events.iloc[[2]])
+    assert_equal(result, ds.sel(frame=slice(100, 150)))
+
+    result = ds.copy().events.sel(frame=[30, 220], drop_out_of_view=True)
+
+    assert_frame_equal(result.events.df, events.iloc[[0, 3]])
+    assert_frame_equal(ds.attrs['_events'].df, events)
@@ -0,0 +1,138 @@
+"""Unit tests for writing and reading events along with a Dataset.
+
+Usage: Assuming the current directory is the top one,
+
+    $ pytest -q tests -ra
+
+    will run all tests and provide a short summary that ignores passed ones and
+    any captured console output.
+
+    To run this specific test file, simply do
+
+    $ pytest -q tests/serialization_test.py -ra
+
+    instead.
+
+"""
+import pathlib
+
+import numpy as np
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+import pytest
+
+import xarray as xr
+from xarray.testing import assert_equal
+from xarray.testing import assert_identical
+
+import xarray_events
+
+
+@pytest.mark.parametrize('extension', ['.nc', '.zarr'])
+def test_round_trip(tmp_path: pathlib.Path, extension: str) -> None:
+    """Write a Dataset with events and open it again.
+
+    Ensure that the Dataset, its events and its mapping are the same, and that
+    the events are only read when they're needed.
+
+    """
+    if extension == '.nc':
+        pytest.importorskip('scipy')
+    else:
+        pytest.importorskip('zarr')
+
+    events = pd.DataFrame(
+        {
+            'event_type': pd.Categorical(['pass', 'goal', 'pass']),
+            'start_frame': [1, 100, 200],
+            'end_frame': [50, 150, 250],
+            'player': ['a', 'b', 'c']
+        },
+        index=pd.Index([10, 20, 30], name='event_id')
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {
+        'frame': ('start_frame', 'end_frame'),
+        'cartesian_coords': ['player']
+    }
+
+    ds = ds.events.load(events, ds_df_mapping)
+    ds.events.cache_prefix_sums('ball_trajectory')
+
+    path = tmp_path / f'match{extension}'
+
+    if extension == '.nc':
+        ds.events.to_netcdf(path, engine='scipy')
+        opened = xarray_events.open_dataset(path, engine='scipy')
+    else:
+        ds.events.to_zarr(path)
+        opened = xarray_events.open_zarr(path)
+
+    with opened:
+        assert 'unread' in repr(opened.attrs['_events'])
+
+        assert opened.events.ds_df_mapping == ds.events.ds_df_mapping
+        assert isinstance(opened.events.ds_df_mapping['cartesian_coords'], list)
+        # netCDF3, the format written by scipy, has no 64-bit integers.
+        assert_frame_equal(
+            opened.events.df, ds.events.df, check_dtype=extension != '.nc'
+        )
+
+        assert_equal(opened, ds)
+        assert opened.attrs['match_id'] == ds.attrs['match_id']
+
+        assert_identical(
+            opened.events.sel(event_type='pass', cartesian_coords='x')
+            .events.groupby_events('ball_trajectory').mean(),
+            ds.events.sel(event_type='pass', cartesian_coords='x')
+            .events.groupby_events('ball_trajectory').mean()
+        )
+
+
+def test_clashing_names() -> None:
+    """Write a Dataset that already has an event dimension.
+
+    Ensure that a ValueError is raised.
+
+    """
+    events = pd.DataFrame(
+        {
+            'event_type': pd.Categorical(['pass', 'goal', 'pass']),
+            'start_frame': [1, 100, 200],
+            'end_frame': [50, 150, 250],
+            'player': ['a', 'b', 'c']
+        },
+        index=pd.Index([10, 20, 30], name='event_id')
+    )
+
+    ds = xr.Dataset(
+        data_vars={
+            'ball_trajectory': (
+                ['frame', 'cartesian_coords'],
+                np.exp(np.linspace((-6, -8), (3, 2), 250))
+            )
+        },
+        coords={'frame': np.arange(1, 251), 'cartesian_coords': ['x', 'y']},
+        attrs={'match_id': 12, 'resolution_fps': 25}
+    )
+
+    ds_df_mapping = {'frame': ('start_frame', 'end_frame')}
+
+    ds = ds.events.load(events, ds_df_mapping)
+    ds = ds.expand_dims('event')
+
+    with pytest.raises(ValueError):
+        ds.events.to_netcdf()